@@ -25,7 +25,21 @@ $PYTHON_CMD -m pip install -r requirements.txt
 # Run migrations
 $PYTHON_CMD manage.py migrate --noinput
 
+# Backfill/refresh the full-text search documents (signals keep them current after this)
+$PYTHON_CMD manage.py rebuild_search_index
+
+# Same for the precomputed related-projects table
+$PYTHON_CMD manage.py rebuild_related_projects
+
 # Collect static files
 $PYTHON_CMD manage.py collectstatic --noinput --clear
 
+# Fetch new Medium posts. On Vercel the public pages are served from the
+# export below, so no page view ever schedules a sync: posts published
+# since the last deploy appear with the next one.
+$PYTHON_CMD manage.py sync_medium --force
+
+# Pre-render public pages (only pages whose content changed are rebuilt)
+$PYTHON_CMD manage.py export_site
+
 echo "BUILD END"
@@ -1,16 +1,7 @@
 """
 Django settings for django_project project.
 
-GeneraMIDDLEWARE = [
-    'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # Add whitenoise middleware
-    'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
-]ango-admin startproject' using Django 4.2.3.
+Generated by 'django-admin startproject' using Django 4.2.3.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/topics/settings/
@@ -20,15 +11,18 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 from pathlib import Path
+import importlib.util
 import os
+import tempfile
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 import dj_database_url
 
-# Conditional cloudinary import to handle deployment issues
+# Conditional cloudinary import to handle deployment issues. Only the core
+# SDK is needed to configure it; the upload and admin API modules load when
+# first used (pages.models pulls in the uploader through CloudinaryField).
 try:
     import cloudinary
-    import cloudinary.uploader
-    import cloudinary.api
     CLOUDINARY_AVAILABLE = True
 except ImportError:
     CLOUDINARY_AVAILABLE = False
@@ -43,8 +37,13 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = config('SECRET_KEY', default='django-insecure-#k!c&5r=@sz&tr1egl*r1_%m$gab9u$sftiv4*s-bd8a&5s=@4')
 
+# Production profile: DEBUG off, persistent database connections and the
+# deployment self-checks in pages/checks.py (which fail `manage.py check`,
+# and so the build, on slow or unsafe settings). Set PRODUCTION=1 on servers.
+PRODUCTION = config('PRODUCTION', default=False, cast=bool)
+
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = config('DEBUG', default=True, cast=bool)
+DEBUG = config('DEBUG', default=not PRODUCTION, cast=bool)
 ALLOWED_HOSTS = ["*"]
 
 
@@ -64,12 +63,18 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    # 'whitenoise.middleware.WhiteNoiseMiddleware',  # Temporarily disabled
+    # Serves STATIC_ROOT (and its .br/.gz siblings) before any other work
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    # Outside the session middleware, so checking request.user for the
+    # staff-only Server-Timing header doesn't add Vary: Cookie
+    'pages.perf.PerformanceMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    # Staff-only ?_profile switch; needs request.user
+    'pages.profiling.ProfilerMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -77,7 +82,8 @@ ROOT_URLCONF = 'django_project.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates, plus render timing for pages.perf.PerformanceMiddleware
+        'BACKEND': 'pages.perf.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / "templates"],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -86,20 +92,101 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'pages.context_processors.content_cache',
             ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'django_project.wsgi.application'
+ASGI_APPLICATION = 'django_project.asgi.application'
+
+# Route the public pages to their async versions (pages/async_views.py).
+# Meant for the ASGI profile: gunicorn -c gunicorn_asgi.conf.py django_project.asgi:application
+ASYNC_VIEWS = config('ASYNC_VIEWS', default=False, cast=bool)
 
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Connections are kept for DB_CONN_MAX_AGE seconds (0 closes them after every
+# request) and pinged before reuse, so a dropped connection costs one retry
+# instead of an error. Behind PgBouncer in transaction mode (DB_POOLER=
+# transaction) a connection may move between server sessions, so server-side
+# cursors, which outlive a transaction, are turned off.
 DATABASES = {
-    'default': dj_database_url.parse(config('DATABASE_URL'))
+    'default': dj_database_url.parse(
+        config('DATABASE_URL'),
+        conn_max_age=config('DB_CONN_MAX_AGE', default=600 if PRODUCTION else 0, cast=int),
+        conn_health_checks=True,
+    )
 }
+DB_POOLER = config('DB_POOLER', default='')
+if DB_POOLER == 'transaction':
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+# Let async views run independent queries in parallel, each on its own
+# connection (pages/aio.py). Off for SQLite, which serializes them anyway.
+ASYNC_CONCURRENT_QUERIES = config(
+    'ASYNC_CONCURRENT_QUERIES',
+    default=DATABASES['default']['ENGINE'] != 'django.db.backends.sqlite3',
+    cast=bool,
+)
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# CACHE_BACKEND picks the store for pages, fragments and the content
+# generation counter:
+#   locmem - per process; fine for runserver and single-worker deployments
+#   file   - shared by all gunicorn workers on one host (CACHE_LOCATION)
+#   redis  - shared by every host (REDIS_URL, needs the ``redis`` package)
+#   dummy  - caches nothing; for measuring uncached work (bench_views)
+
+CACHE_BACKEND = config(
+    'CACHE_BACKEND', default='redis' if config('REDIS_URL', default='') else 'locmem'
+)
+
+if CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': config('CACHE_LOCATION', default=os.path.join(BASE_DIR, '.cache')),
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+elif CACHE_BACKEND == 'dummy':
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+elif CACHE_BACKEND == 'redis':
+    # Django imports the client on first cache access; fail at startup instead
+    if importlib.util.find_spec('redis') is None:
+        raise ImproperlyConfigured(
+            "CACHE_BACKEND is 'redis' (REDIS_URL is set) but the redis package is "
+            "not installed: pip install -r requirements.txt"
+        )
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': config('REDIS_URL', default='redis://127.0.0.1:6379/0'),
+            'KEY_PREFIX': 'biportfolio',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'biportfolio',
+            'OPTIONS': {'MAX_ENTRIES': 1000},
+        }
+    }
+
+# Keys are versioned by content, so these only bound how long unused
+# entries linger. With a per-process cache (locmem) an edit saved in one
+# process doesn't move the others' content generation: PAGE_CACHE_TIMEOUT
+# is also how long they keep serving cached pages and the in-memory
+# snapshot (pages.snapshot) from before it.
+PAGE_CACHE_TIMEOUT = config('PAGE_CACHE_TIMEOUT', default=600, cast=int)
+FRAGMENT_CACHE_TIMEOUT = config('FRAGMENT_CACHE_TIMEOUT', default=600, cast=int)
 
 
 # Password validation
@@ -140,8 +227,17 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 STATIC_ROOT = os.path.join(BASE_DIR,'staticroot','static')
 
-# WhiteNoise static files compression
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Pre-rendered public pages (manage.py export_site), served by Vercel's CDN
+SITE_EXPORT_DIR = os.path.join(BASE_DIR, 'staticroot', 'site')
+
+# WhiteNoise static files compression, plus WebP/AVIF variants of images
+STATICFILES_STORAGE = 'pages.storage.OptimizedStaticFilesStorage'
+# Encoded image variants, reused by later builds while the source is unchanged
+STATIC_IMAGE_CACHE_DIR = os.path.join(BASE_DIR, '.cache', 'static-images')
+# WhiteNoise indexes STATIC_ROOT once at startup (outside DEBUG) and picks the
+# Brotli or gzip file collectstatic wrote for the client's Accept-Encoding.
+# Hashed names are cached as immutable for ten years; this covers the rest.
+WHITENOISE_MAX_AGE = config('WHITENOISE_MAX_AGE', default=0 if DEBUG else 3600, cast=int)
 
 # Cloudinary Configuration
 if CLOUDINARY_AVAILABLE:
@@ -161,3 +257,50 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Medium RSS Feed Configuration
 MEDIUM_USERNAME = config('MEDIUM_USERNAME', default='@biplovgautam')
+
+# Background Medium sync: the homepage never waits on medium.com. A worker
+# thread refreshes the feed at most once per MEDIUM_SYNC_INTERVAL seconds and
+# a database lock keeps concurrent workers from syncing at the same time.
+MEDIUM_SYNC_ENABLED = config('MEDIUM_SYNC_ENABLED', default=True, cast=bool)
+MEDIUM_SYNC_INTERVAL = config('MEDIUM_SYNC_INTERVAL', default=3600, cast=int)
+MEDIUM_SYNC_LOCK_TIMEOUT = config('MEDIUM_SYNC_LOCK_TIMEOUT', default=300, cast=int)
+MEDIUM_FEED_MAX_BYTES = config('MEDIUM_FEED_MAX_BYTES', default=5 * 1024 * 1024, cast=int)
+
+# Contact form: each client IP gets a burst of CONTACT_THROTTLE_BURST messages,
+# refilled at CONTACT_THROTTLE_RATE per hour. Identical messages within
+# CONTACT_DEDUP_WINDOW seconds are stored once. Behind a proxy, point
+# CLIENT_IP_HEADER at the header it sets to the client address (vercel.json
+# uses HTTP_X_FORWARDED_FOR, which Vercel overwrites); otherwise every
+# visitor shares the proxy's bucket. Buckets live in the default cache, so
+# with several workers or serverless instances the throttle only holds with
+# a shared cache (CACHE_BACKEND=redis): locmem counts per process.
+CONTACT_THROTTLE_BURST = config('CONTACT_THROTTLE_BURST', default=3, cast=int)
+CONTACT_THROTTLE_RATE = config('CONTACT_THROTTLE_RATE', default=10, cast=int)
+CONTACT_DEDUP_WINDOW = config('CONTACT_DEDUP_WINDOW', default=24 * 3600, cast=int)
+CLIENT_IP_HEADER = config('CLIENT_IP_HEADER', default='REMOTE_ADDR')
+
+# Share of requests PerformanceMiddleware appends to PERF_LOG_PATH as JSON
+# lines (0 turns the log off); summarize it with `manage.py perf_report`.
+PERF_SAMPLE_RATE = config('PERF_SAMPLE_RATE', default=0.0, cast=float)
+PERF_LOG_PATH = config('PERF_LOG_PATH', default=os.path.join(BASE_DIR, '.cache', 'perf.jsonl'))
+
+# Where ProfilerMiddleware stores staff-requested profiles (listed at
+# /admin/profiles/) and how often its sampler reads the request's stack.
+# The temp directory is the one place serverless functions (Vercel) can
+# write; each instance lists only the profiles it stored itself.
+PROFILE_DIR = config('PROFILE_DIR', default=os.path.join(tempfile.gettempdir(), 'biportfolio-profiles'))
+PROFILE_SAMPLE_INTERVAL = config('PROFILE_SAMPLE_INTERVAL', default=0.001, cast=float)
+
+# New contact messages are emailed here by the background worker (off when empty)
+CONTACT_NOTIFY_EMAIL = config('CONTACT_NOTIFY_EMAIL', default='')
+EMAIL_BACKEND = config(
+    'EMAIL_BACKEND',
+    default='django.core.mail.backends.console.EmailBackend' if DEBUG
+    else 'django.core.mail.backends.smtp.EmailBackend',
+)
+EMAIL_HOST = config('EMAIL_HOST', default='localhost')
+EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
+EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='webmaster@localhost')
@@ -20,9 +20,12 @@ from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.conf.urls import handler404, handler500
 from django.conf import settings
 from django.conf.urls.static import static
+from pages.admin import profile_download, profile_list
 
 
 urlpatterns = [
+    path('admin/profiles/', admin.site.admin_view(profile_list), name='admin_profiles'),
+    path('admin/profiles/<str:name>', admin.site.admin_view(profile_download), name='admin_profile_download'),
     path('admin/', admin.site.urls),
     path('', include('pages.urls'))
 ]
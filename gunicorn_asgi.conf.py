@@ -0,0 +1,14 @@
+# ASGI serving profile: uvicorn workers under gunicorn, with the async views.
+#
+#   gunicorn -c gunicorn_asgi.conf.py django_project.asgi:application
+#
+# The WSGI deployment (vercel.json, or plain `gunicorn django_project.wsgi`)
+# is unaffected.
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'uvicorn.workers.UvicornWorker'
+keepalive = 5
+raw_env = ['ASYNC_VIEWS=1']
@@ -1,12 +1,42 @@
+from django.conf import settings
 from django.contrib import admin
+from django.core.exceptions import ValidationError
+from django.forms.models import BaseInlineFormSet
+from django.http import FileResponse, Http404
+from django.template.response import TemplateResponse
+from . import search
+from .profiling import list_profiles, profile_file_path
 from .models import (
     Profile, Skill, Project, ProjectImage, Education, Experience, 
-    Certification, Blog, Contact, SiteSettings
+    Certification, Blog, Contact, SiteSettings, SyncState, Tag
 )
 
 
+class IndexedSearchMixin:
+    """Answer the changelist search box from the full-text index"""
+    search_kind = None
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return super().get_search_results(request, queryset, search_term)
+        ids = search.matching_ids(self.search_kind, search_term)
+        return queryset.filter(pk__in=ids), False
+
+
+class ProjectImageFormSet(BaseInlineFormSet):
+    def clean(self):
+        super().clean()
+        primaries = [
+            form for form in self.forms
+            if form.cleaned_data.get('is_primary') and not form.cleaned_data.get('DELETE')
+        ]
+        if len(primaries) > 1:
+            raise ValidationError("Only one image per project can be marked as primary.")
+
+
 class ProjectImageInline(admin.TabularInline):
     model = ProjectImage
+    formset = ProjectImageFormSet
     extra = 1
     fields = ['image', 'caption', 'is_primary', 'order']
     ordering = ['order']
@@ -31,11 +61,12 @@ class SkillAdmin(admin.ModelAdmin):
 
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ['title', 'is_featured', 'date_created', 'order', 'get_image_count']
     list_filter = ['is_featured', 'date_created', 'technologies']
     list_editable = ['is_featured', 'order']
     search_fields = ['title', 'description']
+    search_kind = 'project'
     filter_horizontal = ['technologies']
     ordering = ['-is_featured', 'order', '-date_created']
     inlines = [ProjectImageInline]
@@ -66,10 +97,11 @@ class EducationAdmin(admin.ModelAdmin):
 
 
 @admin.register(Experience)
-class ExperienceAdmin(admin.ModelAdmin):
+class ExperienceAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ['title', 'organization', 'experience_type', 'start_date', 'end_date', 'is_current']
     list_filter = ['experience_type', 'is_current', 'start_date']
     search_fields = ['title', 'organization', 'description']
+    search_kind = 'experience'
     filter_horizontal = ['technologies_used']
     ordering = ['-start_date']
 
@@ -84,14 +116,23 @@ class CertificationAdmin(admin.ModelAdmin):
 
 
 @admin.register(Blog)
-class BlogAdmin(admin.ModelAdmin):
+class BlogAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ['title', 'published_date', 'is_featured', 'medium_post_id']
     list_filter = ['is_featured', 'published_date']
     list_editable = ['is_featured']
-    search_fields = ['title', 'description', 'tags']
+    search_fields = ['title', 'description', 'tags__name']
+    search_kind = 'blog'
+    filter_horizontal = ['tags']
     ordering = ['-published_date']
 
 
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ['name', 'slug']
+    search_fields = ['name', 'slug']
+    prepopulated_fields = {'slug': ['name']}
+
+
 @admin.register(Contact)
 class ContactAdmin(admin.ModelAdmin):
     list_display = ['name', 'email', 'subject', 'created_at', 'is_read']
@@ -115,6 +156,36 @@ class SiteSettingsAdmin(admin.ModelAdmin):
         return False
 
 
+@admin.register(SyncState)
+class SyncStateAdmin(admin.ModelAdmin):
+    list_display = ['name', 'last_finished_at', 'last_success', 'locked_until']
+    readonly_fields = [
+        'name', 'locked_until', 'last_started_at', 'last_finished_at',
+        'last_success', 'last_message'
+    ]
+
+    def has_add_permission(self, request):
+        return False
+
+
+def profile_list(request):
+    """Request profiles stored by ProfilerMiddleware"""
+    context = {
+        **admin.site.each_context(request),
+        'title': 'Request profiles',
+        'profiles': list_profiles(),
+        'profile_dir': settings.PROFILE_DIR,
+    }
+    return TemplateResponse(request, 'admin/profiles.html', context)
+
+
+def profile_download(request, name):
+    path = profile_file_path(name)
+    if path is None:
+        raise Http404('No such profile')
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=name)
+
+
 # Customize admin site header
 admin.site.site_header = "Biplove Portfolio Admin"
 admin.site.site_title = "Portfolio Admin"
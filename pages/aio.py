@@ -0,0 +1,39 @@
+"""
+Running independent blocks of sync ORM code from async views.
+
+Django's async ORM methods (``afirst``, ``async for`` and friends) all hop
+to the one thread that owns the request's database connection, so
+gathering them overlaps nothing. ``gather_sync`` instead gives every block
+its own worker thread, and with it its own connection, so independent
+queries really run at the same time. With ASYNC_CONCURRENT_QUERIES off
+(the SQLite default) the blocks run one after another on the request's
+connection, like the async ORM would.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+
+def _on_own_connection(func):
+    def run():
+        # Worker threads never see request_started/finished, so apply the
+        # CONN_MAX_AGE rules around each block instead.
+        close_old_connections()
+        try:
+            return func()
+        finally:
+            close_old_connections()
+
+    return run
+
+
+async def gather_sync(*funcs):
+    """Results of calling each of ``funcs``, in order"""
+    if not settings.ASYNC_CONCURRENT_QUERIES:
+        return [await sync_to_async(func)() for func in funcs]
+    return await asyncio.gather(*[
+        sync_to_async(_on_own_connection(func), thread_sensitive=False)()
+        for func in funcs
+    ])
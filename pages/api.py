@@ -0,0 +1,259 @@
+"""
+Read-only JSON API for the portfolio content, under ``/api/v1/``.
+
+List endpoints take ``?fields=a,b`` (top-level fields to include),
+``?limit=`` and ``?after=<cursor>`` (keyset pagination, see
+pages.pagination). Related rows are prefetched only for the fields asked
+for, so every endpoint costs a fixed number of queries whatever the page
+size. Encoded response bodies are cached per content generation and
+responses carry the same ETag/Last-Modified validators as the site pages.
+"""
+import hashlib
+import json
+from dataclasses import dataclass, field
+from operator import attrgetter
+
+from django.db.models import Prefetch
+from django.http import HttpResponse
+from django.urls import reverse
+from django.views.decorators.http import require_safe
+
+from .cache import per_generation
+from .conditional import conditional_page, site_validators
+from .models import Blog, Certification, Education, Experience, Profile, Project, ProjectImage, Skill
+from .pagination import InvalidCursor, KeysetPaginator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def dumps(payload):
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def json_response(body, status=200):
+    response = HttpResponse(body, content_type='application/json', status=status)
+    response['Access-Control-Allow-Origin'] = '*'
+    return response
+
+
+def error_response(message, status=400):
+    return json_response(dumps({'error': message}), status=status)
+
+
+# Dates are formatted here rather than by the encoder so the output is the
+# same with and without orjson.
+def _date(value):
+    return value.isoformat() if value else None
+
+
+def _image(value):
+    return value.build_url(secure=True) if value else None
+
+
+def _skill_summary(skill):
+    return {'id': skill.pk, 'name': skill.name, 'category': skill.category}
+
+
+def _field(name):
+    return attrgetter(name)
+
+
+def _date_field(name):
+    return lambda obj: _date(getattr(obj, name))
+
+
+def _skills(name):
+    return lambda obj: [_skill_summary(skill) for skill in getattr(obj, name).all()]
+
+
+SKILL_SUMMARY = Skill.objects.only('id', 'name', 'category', 'order')
+
+
+@dataclass(frozen=True)
+class Resource:
+    name: str
+    model: type
+    fields: dict  # field name -> getter
+    # field name -> what to prefetch when that field is selected
+    prefetch: dict = field(default_factory=dict)
+
+    def queryset(self, selected):
+        lookups = [self.prefetch[name] for name in selected if name in self.prefetch]
+        return self.model.objects.prefetch_related(*lookups)
+
+    def serialize(self, obj, selected):
+        return {name: self.fields[name](obj) for name in selected}
+
+
+PROFILE = Resource('profile', Profile, {
+    'name': _field('name'),
+    'title': _field('title'),
+    'description': _field('description'),
+    'email': _field('email'),
+    'phone': _field('phone'),
+    'location': _field('location'),
+    'github_url': _field('github_url'),
+    'linkedin_url': _field('linkedin_url'),
+    'twitter_url': _field('twitter_url'),
+    'resume_url': _field('resume_url'),
+    'profile_image': lambda profile: _image(profile.profile_image),
+})
+
+RESOURCES = {resource.name: resource for resource in [
+    Resource('skills', Skill, {
+        'id': _field('pk'),
+        'name': _field('name'),
+        'category': _field('category'),
+        'proficiency': _field('proficiency'),
+        'icon': _field('icon'),
+    }),
+    Resource('projects', Project, {
+        'id': _field('pk'),
+        'title': _field('title'),
+        'short_description': _field('short_description'),
+        'description': _field('description'),
+        'github_url': _field('github_url'),
+        'demo_url': _field('demo_url'),
+        'is_featured': _field('is_featured'),
+        'date_created': _date_field('date_created'),
+        'url': lambda project: reverse('project_detail', args=[project.pk]),
+        'technologies': _skills('technologies'),
+        'images': lambda project: [
+            {'url': _image(image.image), 'width': image.width, 'height': image.height,
+             'caption': image.caption, 'is_primary': image.is_primary}
+            for image in project.images.all()
+        ],
+    }, prefetch={
+        'technologies': Prefetch('technologies', queryset=SKILL_SUMMARY),
+        'images': Prefetch('images', queryset=ProjectImage.objects.order_by('order', 'pk')),
+    }),
+    Resource('experience', Experience, {
+        'id': _field('pk'),
+        'title': _field('title'),
+        'organization': _field('organization'),
+        'location': _field('location'),
+        'experience_type': _field('experience_type'),
+        'start_date': _date_field('start_date'),
+        'end_date': _date_field('end_date'),
+        'is_current': _field('is_current'),
+        'description': _field('description'),
+        'technologies': _skills('technologies_used'),
+    }, prefetch={
+        'technologies': Prefetch('technologies_used', queryset=SKILL_SUMMARY),
+    }),
+    Resource('education', Education, {
+        'id': _field('pk'),
+        'institution': _field('institution'),
+        'degree': _field('degree'),
+        'field_of_study': _field('field_of_study'),
+        'start_date': _date_field('start_date'),
+        'end_date': _date_field('end_date'),
+        'is_current': _field('is_current'),
+        'description': _field('description'),
+        'activities': _field('activities'),
+        'grade': _field('grade'),
+    }),
+    Resource('certifications', Certification, {
+        'id': _field('pk'),
+        'name': _field('name'),
+        'issuer': _field('issuer'),
+        'issue_date': _date_field('issue_date'),
+        'expiry_date': _date_field('expiry_date'),
+        'credential_id': _field('credential_id'),
+        'credential_url': _field('credential_url'),
+        'badge_image': lambda certification: _image(certification.badge_image),
+        'skills': _skills('skills'),
+    }, prefetch={
+        'skills': Prefetch('skills', queryset=SKILL_SUMMARY),
+    }),
+    Resource('blogs', Blog, {
+        'id': _field('pk'),
+        'title': _field('title'),
+        'description': _field('description'),
+        'url': _field('url'),
+        'published_date': _date_field('published_date'),
+        'image': lambda blog: _image(blog.image),
+        'is_featured': _field('is_featured'),
+        'tags': lambda blog: [{'name': tag.name, 'slug': tag.slug} for tag in blog.tags.all()],
+    }, prefetch={
+        'tags': 'tags',
+    }),
+]}
+
+
+def selected_fields(request, resource):
+    """Fields from ``?fields=``, in the resource's order; ValueError on unknown names"""
+    requested = request.GET.get('fields')
+    if not requested:
+        return list(resource.fields)
+    names = {name.strip() for name in requested.split(',') if name.strip()}
+    unknown = names - set(resource.fields)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    return [name for name in resource.fields if name in names]
+
+
+def list_payload(request, resource, selected):
+    try:
+        limit = min(max(int(request.GET.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+    except ValueError:
+        limit = DEFAULT_LIMIT
+    query_params = {'limit': limit}
+    if 'fields' in request.GET:
+        query_params['fields'] = ','.join(selected)
+
+    paginator = KeysetPaginator(
+        resource.queryset(selected), limit, f'api:{resource.name}', query_params=query_params,
+    )
+    page = paginator.page(request.GET.get('after') or None)
+    return {
+        'count': paginator.count,
+        'next': request.path + page.next_query if page.has_next() else None,
+        'previous': request.path + page.previous_query if page.has_previous() else None,
+        'results': [resource.serialize(obj, selected) for obj in page],
+    }
+
+
+@require_safe
+@conditional_page(site_validators)
+def api_root(request):
+    """Index of the endpoints"""
+    names = ['profile', *RESOURCES]
+    return json_response(dumps({name: reverse('api', args=[name]) for name in names}))
+
+
+@require_safe
+@conditional_page(site_validators)
+def api(request, name):
+    if name == 'profile':
+        resource = PROFILE
+    elif name in RESOURCES:
+        resource = RESOURCES[name]
+    else:
+        return error_response('Not found', status=404)
+    try:
+        selected = selected_fields(request, resource)
+    except ValueError as error:
+        return error_response(str(error))
+
+    def build():
+        if resource is PROFILE:
+            profile = Profile.objects.first()
+            return dumps(resource.serialize(profile, selected) if profile else None)
+        return dumps(list_payload(request, resource, selected))
+
+    try:
+        # The encoded body is cached per generation, keyed by the full URL
+        url_hash = hashlib.sha1(request.get_full_path().encode('utf-8')).hexdigest()
+        body = per_generation(f'api:{url_hash}', build)
+    except InvalidCursor:
+        return error_response('Invalid cursor')
+    return json_response(body)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PagesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pages'
+
+    def ready(self):
+        # perf hooks every database connection as it connects
+        from . import checks, perf, signals  # noqa: F401
@@ -0,0 +1,127 @@
+"""
+Async versions of the public pages, routed instead of their sync
+counterparts in pages.views when ASYNC_VIEWS is on (the ASGI profile).
+
+Each view fetches its independent parts (page rows, counts, related
+projects, snapshot sections) concurrently through ``gather_sync``, then
+renders. Templates still run as sync code: the auth and messages context
+processors read the session lazily.
+"""
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from django.shortcuts import render
+
+from .aio import gather_sync
+from .cache import cache_public_page
+from .conditional import (
+    blog_list_validators, conditional_page, project_detail_validators,
+    project_list_validators, site_validators,
+)
+from .forms import ContactForm
+from .models import Blog, Project, tag_slug
+from .pagination import KeysetPaginator
+from .snapshot import aget_snapshot
+from .tasks import schedule_medium_sync
+from .views import BLOGS_PER_PAGE, PROJECTS_PER_PAGE, tag_counts
+
+
+async def arender(request, template_name, context):
+    return await sync_to_async(render)(request, template_name, context)
+
+
+@conditional_page(site_validators)
+async def index(request):
+    """Homepage view with limited content and featured items"""
+    schedule_medium_sync()
+    snapshot = await aget_snapshot()
+    context = {
+        'profile': snapshot.profile,
+        'featured_projects': snapshot.featured_projects,
+        'skills_by_category': snapshot.skills_by_category,
+        'education': snapshot.education[:2],
+        'experience': snapshot.experience[:3],
+        'certifications': snapshot.certifications[:3],
+        'featured_blogs': snapshot.featured_blogs,
+        'form': ContactForm(),
+    }
+    return await arender(request, 'index.html', context)
+
+
+@conditional_page(site_validators)
+@cache_public_page
+async def about(request):
+    """About page with full profile information"""
+    snapshot = await aget_snapshot()
+    context = {
+        'profile': snapshot.profile,
+        'education': snapshot.education,
+        'experience': snapshot.experience,
+        'certifications': snapshot.certifications,
+        'skills_by_category': snapshot.skills_by_category,
+    }
+    return await arender(request, 'about.html', context)
+
+
+@conditional_page(project_list_validators)
+@cache_public_page
+async def projects(request):
+    """Projects page with all projects"""
+    paginator = KeysetPaginator(Project.objects.with_card_data(), PROJECTS_PER_PAGE, 'projects')
+    projects_page, total_projects = await gather_sync(
+        lambda: paginator.get_page(request.GET.get('after'), request.GET.get('page')),
+        lambda: paginator.count,
+    )
+    context = {
+        'projects': projects_page,
+        'total_projects': total_projects,
+    }
+    return await arender(request, 'projects.html', context)
+
+
+@conditional_page(blog_list_validators)
+@cache_public_page
+async def blogs(request):
+    """Blogs page with all blog posts"""
+    all_blogs = Blog.objects.prefetch_related('tags')
+    count_key = 'blogs'
+    active_tag = tag_slug(request.GET.get('tag', ''))
+    if active_tag:
+        all_blogs = all_blogs.filter(tags__slug=active_tag)
+        count_key = f'blogs:tag:{active_tag}'
+
+    paginator = KeysetPaginator(
+        all_blogs, BLOGS_PER_PAGE, count_key, {'tag': active_tag} if active_tag else None
+    )
+    blogs_page, total_blogs, counts = await gather_sync(
+        lambda: paginator.get_page(request.GET.get('after'), request.GET.get('page')),
+        lambda: paginator.count,
+        tag_counts,
+    )
+    context = {
+        'blogs': blogs_page,
+        'total_blogs': total_blogs,
+        'active_tag': active_tag,
+        'tag_counts': counts,
+    }
+    return await arender(request, 'blogs.html', context)
+
+
+@conditional_page(project_detail_validators)
+@cache_public_page
+async def project_detail(request, project_id):
+    """Individual project detail page"""
+    project, related_projects = await gather_sync(
+        lambda: Project.objects.with_card_data().with_images().filter(id=project_id).first(),
+        lambda: list(
+            Project.objects.filter(similar_to__project_id=project_id)
+            .order_by('similar_to__rank').with_card_data()[:3]
+        ),
+    )
+    if project is None:
+        raise Http404('No Project matches the given query.')
+
+    context = {
+        'project': project,
+        'related_projects': related_projects,
+    }
+    return await arender(request, 'project_detail.html', context)
@@ -0,0 +1,158 @@
+"""
+Content-versioned caching for the public pages.
+
+Every cache key embeds a global *content generation* number. Signals bump
+the number whenever portfolio content changes in the admin, which makes
+every cached page and template fragment unreachable at once; nothing has
+to be deleted explicitly and stale entries simply age out.
+"""
+import hashlib
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import HttpResponse
+
+CONTENT_GENERATION_KEY = 'pages:content-generation'
+CONTENT_MODIFIED_KEY = 'pages:content-modified'
+
+
+def _initial_generation():
+    # Seeded from the clock so a cache that lost only this key can never
+    # resurrect pages stored under an older generation.
+    return int(time.time() * 1000)
+
+
+def get_content_generation():
+    """Current content generation, creating it on first use"""
+    generation = cache.get(CONTENT_GENERATION_KEY)
+    if generation is None:
+        cache.add(CONTENT_GENERATION_KEY, _initial_generation(), timeout=None)
+        generation = cache.get(CONTENT_GENERATION_KEY)
+    return generation
+
+
+def get_content_modified():
+    """When content last changed, as far as this cache knows"""
+    timestamp = cache.get(CONTENT_MODIFIED_KEY)
+    if timestamp is None:
+        timestamp = time.time()
+        cache.add(CONTENT_MODIFIED_KEY, timestamp, timeout=None)
+    return datetime.fromtimestamp(int(timestamp), tz=timezone.utc)
+
+
+def bump_content_generation():
+    """Invalidate every cached page and fragment"""
+    cache.set(CONTENT_MODIFIED_KEY, time.time(), timeout=None)
+    try:
+        return cache.incr(CONTENT_GENERATION_KEY)
+    except ValueError:
+        # Key missing (first write or evicted): start a fresh generation
+        generation = _initial_generation()
+        cache.set(CONTENT_GENERATION_KEY, generation, timeout=None)
+        return generation
+
+
+def per_generation(name, compute):
+    """``compute()`` memoised until the content generation moves"""
+    key = f'pages:memo:{get_content_generation()}:{name}'
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, settings.PAGE_CACHE_TIMEOUT)
+    return value
+
+
+def queryset_version(name, queryset, **extra_aggregates):
+    """
+    ``(last_modified, count, *extra)`` for a queryset of models with an
+    ``updated_at`` column: one aggregate query, memoised per generation so
+    repeat visitors cost no database work at all.
+    """
+    def compute():
+        aggregates = queryset.aggregate(
+            last_modified=Max('updated_at'), count=Count('pk'), **extra_aggregates
+        )
+        return (aggregates.pop('last_modified'), aggregates.pop('count'), *aggregates.values())
+
+    return per_generation(f'version:{name}', compute)
+
+
+def page_cache_key(request, generation=None):
+    if generation is None:
+        generation = get_content_generation()
+    path = hashlib.sha1(request.get_full_path().encode('utf-8')).hexdigest()
+    return f'pages:page:{generation}:{path}'
+
+
+def _is_cacheable_request(request):
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    user = getattr(request, 'user', None)
+    return user is None or not user.is_authenticated
+
+
+def _is_cacheable_response(response):
+    # Never share a response that carries per-visitor state (cookies such as
+    # the CSRF token, or a Vary: Cookie added by the session/CSRF machinery).
+    if response.status_code != 200 or response.cookies or response.streaming:
+        return False
+    return 'cookie' not in response.get('Vary', '').lower()
+
+
+def cache_public_page(view):
+    """
+    Cache the rendered page for anonymous visitors, keyed on the full path
+    and the content generation. Staff always get a fresh render. Works on
+    sync and async views.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            # request.user is loaded from the session, which is sync code
+            if not await sync_to_async(_is_cacheable_request)(request):
+                return await view(request, *args, **kwargs)
+
+            key = page_cache_key(request)
+            cached = await cache.aget(key)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+
+            response = await view(request, *args, **kwargs)
+            if _is_cacheable_response(response):
+                await cache.aset(
+                    key,
+                    (response.content, response['Content-Type']),
+                    settings.PAGE_CACHE_TIMEOUT,
+                )
+            return response
+
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not _is_cacheable_request(request):
+            return view(request, *args, **kwargs)
+
+        key = page_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = view(request, *args, **kwargs)
+        if _is_cacheable_response(response):
+            cache.set(
+                key,
+                (response.content, response['Content-Type']),
+                settings.PAGE_CACHE_TIMEOUT,
+            )
+        return response
+
+    return wrapper
@@ -0,0 +1,74 @@
+"""
+Deployment self-checks for the production profile (settings.PRODUCTION).
+
+They run with every management command, so ``migrate`` in build_files.sh
+fails the build on an error instead of shipping slow or unsafe settings.
+"""
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+PER_PROCESS_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def _uses_cached_loader(engine):
+    loaders = engine.get('OPTIONS', {}).get('loaders')
+    if loaders is None:
+        return True  # Django wraps the default loaders in the cached loader
+    return all(
+        isinstance(loader, (list, tuple)) and loader[0] == 'django.template.loaders.cached.Loader'
+        for loader in loaders
+    )
+
+
+@register(Tags.database, Tags.caches, Tags.templates)
+def check_production_settings(app_configs, **kwargs):
+    if not settings.PRODUCTION:
+        return []
+
+    errors = []
+    if settings.DEBUG:
+        errors.append(Error(
+            'DEBUG is on in the production profile.',
+            hint='Unset DEBUG; it defaults to off when PRODUCTION is set.',
+            id='pages.E001',
+        ))
+
+    database = settings.DATABASES['default']
+    if database['ENGINE'] != 'django.db.backends.sqlite3':
+        if not database.get('CONN_MAX_AGE'):
+            errors.append(Error(
+                'Database connections are closed after every request.',
+                hint='Set DB_CONN_MAX_AGE to keep them open between requests.',
+                id='pages.E002',
+            ))
+        elif not database.get('CONN_HEALTH_CHECKS'):
+            errors.append(Warning(
+                'Persistent database connections are reused without a health check.',
+                hint='Set CONN_HEALTH_CHECKS so a dropped connection is replaced, not reported.',
+                id='pages.W003',
+            ))
+        if settings.DB_POOLER == 'transaction' and not database.get('DISABLE_SERVER_SIDE_CURSORS'):
+            errors.append(Error(
+                'Server-side cursors are enabled behind a transaction-mode pooler.',
+                id='pages.E004',
+            ))
+
+    for engine in settings.TEMPLATES:
+        if engine['BACKEND'].endswith('DjangoTemplates') and not _uses_cached_loader(engine):
+            errors.append(Error(
+                'Templates are loaded without the cached loader.',
+                hint="Wrap the 'loaders' option in django.template.loaders.cached.Loader.",
+                id='pages.E005',
+            ))
+
+    if settings.CACHES['default']['BACKEND'] in PER_PROCESS_CACHES:
+        errors.append(Warning(
+            'The default cache is per process, so each worker keeps its own '
+            'content generation, page cache and contact form throttle.',
+            hint='Set CACHE_BACKEND=redis (or REDIS_URL) when running several workers or hosts.',
+            id='pages.W006',
+        ))
+    return errors
@@ -0,0 +1,108 @@
+"""
+ETag / Last-Modified support for the public pages.
+
+Each view gets a validator function returning ``(token, last_modified)``.
+The token is hashed together with the full path (so ``?page=2`` and
+``?page=3`` differ) into a weak ETag. Validators only read the cache or run
+one aggregate query, and a matching ``If-None-Match``/``If-Modified-Since``
+is answered with 304 before the view or any template runs.
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+
+from django.contrib.messages import get_messages
+from django.db.models import Max, Q
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .cache import get_content_generation, get_content_modified, queryset_version
+from .models import Blog, Project
+
+
+def site_validators(request, *args, **kwargs):
+    """Pages built from many models (index, about): the content generation"""
+    return f'site-{get_content_generation()}', get_content_modified()
+
+
+def project_list_validators(request, *args, **kwargs):
+    last_modified, count = queryset_version('projects', Project.objects.all())
+    return f'projects-{last_modified}-{count}', last_modified
+
+
+def blog_list_validators(request, *args, **kwargs):
+    last_modified, count = queryset_version('blogs', Blog.objects.all())
+    return f'blogs-{last_modified}-{count}', last_modified
+
+
+def project_detail_validators(request, project_id, **kwargs):
+    # The page also lists related projects, so any project change counts
+    latest, count, this_project = queryset_version(
+        f'project:{project_id}',
+        Project.objects.all(),
+        this_project=Max('updated_at', filter=Q(pk=project_id)),
+    )
+    if this_project is None:
+        return None, None  # Let the view produce its 404
+    return f'project-{project_id}-{this_project}-{latest}-{count}', max(latest, this_project)
+
+
+def make_etag(request, token):
+    digest = hashlib.sha1(f'{token}|{request.get_full_path()}'.encode('utf-8')).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def conditional_page(validators):
+    """
+    Answer conditional GET/HEAD requests with 304 and stamp ETag and
+    Last-Modified on full responses. Responses that would show flash
+    messages are always rendered in full. Works on sync and async views.
+    """
+    def decorator(view):
+        def check(request, args, kwargs):
+            """``(etag, last_modified_ts, response)``; the response is set for a 304"""
+            if request.method not in ('GET', 'HEAD') or get_messages(request):
+                return None, None, None
+
+            token, last_modified = validators(request, *args, **kwargs)
+            if token is None:
+                return None, None, None
+
+            etag = make_etag(request, token)
+            last_modified_ts = int(last_modified.timestamp()) if last_modified else None
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified_ts
+            )
+            return etag, last_modified_ts, response
+
+        def stamp(response, etag, last_modified_ts):
+            if etag is not None and response.status_code in (200, 304):
+                response.headers.setdefault('ETag', etag)
+                if last_modified_ts is not None:
+                    response.headers.setdefault('Last-Modified', http_date(last_modified_ts))
+                # Allow caching but make browsers revalidate every time
+                patch_cache_control(response, no_cache=True)
+            return response
+
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                # Validators and the session-backed messages are sync code
+                etag, last_modified_ts, response = await sync_to_async(check)(request, args, kwargs)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return stamp(response, etag, last_modified_ts)
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            etag, last_modified_ts, response = check(request, args, kwargs)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return stamp(response, etag, last_modified_ts)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,11 @@
+from django.conf import settings
+
+from .cache import get_content_generation
+
+
+def content_cache(request):
+    """Expose the content generation for versioned {% cache %} fragments"""
+    return {
+        'content_generation': get_content_generation(),
+        'fragment_cache_timeout': settings.FRAGMENT_CACHE_TIMEOUT,
+    }
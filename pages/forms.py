@@ -0,0 +1,26 @@
+import hashlib
+import re
+
+from django import forms
+
+from .models import Contact
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+class ContactForm(forms.ModelForm):
+    class Meta:
+        model = Contact
+        fields = ['name', 'email', 'subject', 'message']
+        widgets = {
+            'name': forms.TextInput(attrs={'placeholder': 'Your Name'}),
+            'email': forms.EmailInput(attrs={'placeholder': 'Your Email'}),
+            'subject': forms.TextInput(attrs={'placeholder': 'Subject'}),
+            'message': forms.Textarea(attrs={'placeholder': 'Your Message', 'rows': 5}),
+        }
+
+    def content_hash(self):
+        """Same sender and text, ignoring case and whitespace, hash the same"""
+        parts = [self.cleaned_data['email'], self.cleaned_data['subject'], self.cleaned_data['message']]
+        normalized = '\x00'.join(WHITESPACE_RE.sub(' ', part).strip().lower() for part in parts)
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
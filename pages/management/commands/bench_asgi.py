@@ -0,0 +1,138 @@
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = ['/', '/about/', '/projects/', '/blogs/']
+
+PROFILES = {
+    'wsgi': lambda workers, threads, bind: [
+        'django_project.wsgi:application', '--worker-class', 'gthread',
+        '--workers', str(workers), '--threads', str(threads), '--bind', bind,
+    ],
+    'asgi': lambda workers, threads, bind: [
+        'django_project.asgi:application', '--config', 'gunicorn_asgi.conf.py',
+        '--workers', str(workers), '--bind', bind,
+    ],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_listening(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise CommandError(f'gunicorn exited with status {process.returncode}')
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise CommandError(f'gunicorn did not start listening on port {port}')
+
+
+def run_load(port, paths, total, concurrency):
+    """Latencies in ms and the number of failed requests, over ``total`` requests"""
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+    lock = threading.Lock()
+
+    def client():
+        nonlocal errors
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        for number in counter:
+            path = paths[number % len(paths)]
+            start = time.perf_counter()
+            try:
+                connection.request('GET', path, headers={'Host': 'localhost'})
+                response = connection.getresponse()
+                response.read()
+                ok = response.status == 200
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                ok = False
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+                errors += not ok
+        connection.close()
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        for future in [pool.submit(client) for _ in range(concurrency)]:
+            future.result()
+    return latencies, errors
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the sync views under gunicorn gthread workers (WSGI) with the '
+        'async views under uvicorn workers (ASGI) at a fixed client concurrency'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', default=DEFAULT_PATHS)
+        parser.add_argument('--profiles', nargs='+', choices=list(PROFILES), default=list(PROFILES))
+        parser.add_argument('--concurrency', type=int, default=32, help='Simultaneous client connections')
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per profile')
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument('--threads', type=int, default=8, help='Threads per WSGI worker')
+
+    def handle(self, *args, **options):
+        try:
+            import uvicorn  # noqa: F401
+        except ImportError:
+            raise CommandError('The ASGI profile needs uvicorn (pip install uvicorn)')
+        # The servers run with DEBUG off, so templates need hashed static names
+        if hasattr(staticfiles_storage, 'manifest_name') and not staticfiles_storage.read_manifest():
+            raise CommandError('No staticfiles manifest in STATIC_ROOT; run collectstatic first')
+
+        for name in options['profiles']:
+            port = free_port()
+            command = [sys.executable, '-m', 'gunicorn', *PROFILES[name](
+                options['workers'], options['threads'], f'127.0.0.1:{port}',
+            )]
+            env = {
+                **os.environ,
+                'ASYNC_VIEWS': '1' if name == 'asgi' else '0',
+                'MEDIUM_SYNC_ENABLED': '0',
+                'DEBUG': 'False',
+            }
+            process = subprocess.Popen(
+                command, cwd=settings.BASE_DIR, env=env,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            try:
+                wait_until_listening(port, process)
+                # Warm up: snapshot, caches and connections in every worker
+                run_load(port, options['paths'], options['workers'] * 20, options['concurrency'])
+
+                start = time.perf_counter()
+                latencies, errors = run_load(
+                    port, options['paths'], options['requests'], options['concurrency'],
+                )
+                elapsed = time.perf_counter() - start
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+
+            percentiles = statistics.quantiles(latencies, n=100)
+            self.stdout.write(
+                f'{name}: {len(latencies) / elapsed:8.1f} req/s  '
+                f'p50 {percentiles[49]:7.1f} ms  p95 {percentiles[94]:7.1f} ms  '
+                f'p99 {percentiles[98]:7.1f} ms  errors {errors}'
+            )
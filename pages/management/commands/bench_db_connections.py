@@ -0,0 +1,72 @@
+import statistics
+import time
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory, override_settings
+
+DEFAULT_PATHS = ['/projects/', '/about/']
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare per-request latency with database connections closed after '
+        'every request (CONN_MAX_AGE=0) and kept open between requests'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', default=DEFAULT_PATHS)
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--max-age', type=int, default=600, help='CONN_MAX_AGE of the reuse run')
+
+    def run(self, paths, total, max_age):
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+        opened = []
+
+        def count(sender, **kwargs):
+            opened.append(sender)
+
+        handler = WSGIHandler()
+        factory = RequestFactory()
+        timings = []
+        failures = 0
+        connection_created.connect(count)
+        try:
+            for number in range(total):
+                environ = factory.get(paths[number % len(paths)]).environ
+                start = time.perf_counter()
+                # Closing the response sends request_finished, which is
+                # where Django closes (or keeps) the connection
+                response = handler(environ, lambda status, headers, exc_info=None: None)
+                b''.join(response)
+                response.close()
+                timings.append((time.perf_counter() - start) * 1000)
+                failures += response.status_code != 200
+        finally:
+            connection_created.disconnect(count)
+            connection.close()
+        return timings, len(opened), failures
+
+    def handle(self, *args, **options):
+        original = connection.settings_dict['CONN_MAX_AGE']
+        # Without page caches every request reaches the database
+        no_cache = override_settings(
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+            MEDIUM_SYNC_ENABLED=False,
+        )
+        try:
+            with no_cache:
+                self.run(options['paths'], len(options['paths']), 0)  # warm up imports and templates
+                for label, max_age in [('close', 0), ('reuse', options['max_age'])]:
+                    timings, opened, failures = self.run(options['paths'], options['requests'], max_age)
+                    percentiles = statistics.quantiles(timings, n=100)
+                    self.stdout.write(
+                        f'{label:<6} CONN_MAX_AGE={max_age:<5} {opened:>5} connections  '
+                        f'median {statistics.median(timings):7.2f} ms  p95 {percentiles[94]:7.2f} ms  '
+                        f'non-200 {failures}'
+                    )
+        finally:
+            connection.settings_dict['CONN_MAX_AGE'] = original
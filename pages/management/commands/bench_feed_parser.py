@@ -0,0 +1,86 @@
+import re
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from email.utils import format_datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from pages.feeds import iter_feed_entries
+
+
+def build_feed(items, body_paragraphs):
+    """Synthetic Medium-style RSS document with content:encoded bodies"""
+    paragraph = '<p>' + ' '.join(['Lorem <b>ipsum</b> dolor sit amet'] * 12) + '</p>'
+    body = paragraph * body_paragraphs
+    published = format_datetime(timezone.now())
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">'
+        '<channel><title>Bench</title>'
+    ]
+    for i in range(items):
+        parts.append(
+            f'<item><title>Post {i}</title>'
+            f'<link>https://medium.com/@bench/post-{i}</link>'
+            f'<guid>https://medium.com/p/{i}</guid>'
+            f'<pubDate>{published}</pubDate>'
+            f'<category>python</category><category>django</category>'
+            f'<content:encoded><![CDATA[{body}]]></content:encoded></item>'
+        )
+    parts.append('</channel></rss>')
+    return ''.join(parts).encode('utf-8')
+
+
+def legacy_parse(content):
+    """The previous importer: whole-document parse plus regex tag stripping"""
+    root = ET.fromstring(content)
+    results = []
+    for item in root.findall('.//item'):
+        description = item.find('{http://purl.org/rss/1.0/modules/content/}encoded').text
+        clean = re.sub('<.*?>', '', description) if description else ''
+        clean = clean[:500] + '...' if len(clean) > 500 else clean
+        results.append((item.find('title').text, clean))
+    return results
+
+
+def streaming_parse(content, chunk_size=64 * 1024):
+    chunks = (content[i:i + chunk_size] for i in range(0, len(content), chunk_size))
+    return [(entry['title'], entry['summary']) for entry in iter_feed_entries(chunks)]
+
+
+class Command(BaseCommand):
+    help = 'Measure parse time and peak memory of the RSS importer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=1000)
+        parser.add_argument('--paragraphs', type=int, default=20,
+                            help='Paragraphs of HTML per item body')
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def measure(self, func, content, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(content)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        # Memory is measured separately so tracing overhead doesn't skew time
+        tracemalloc.start()
+        func(content)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return best, peak
+
+    def handle(self, *args, **options):
+        content = build_feed(options['items'], options['paragraphs'])
+        self.stdout.write(
+            f"Feed: {options['items']} items, {len(content) / 1024 / 1024:.1f} MiB"
+        )
+        for label, func in [('legacy', legacy_parse), ('streaming', streaming_parse)]:
+            elapsed, peak = self.measure(func, content, options['repeat'])
+            self.stdout.write(
+                f"{label:>10}: {elapsed * 1000:8.1f} ms  peak {peak / 1024 / 1024:7.2f} MiB"
+            )
@@ -0,0 +1,110 @@
+import datetime
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from pages import related
+from pages.models import Project, RelatedProject, Skill
+
+
+def percentile(timings, fraction):
+    timings = sorted(timings)
+    return timings[max(int(len(timings) * fraction) - 1, 0)]
+
+
+class Command(BaseCommand):
+    help = 'Time the related-projects index over a synthetic catalogue (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=10_000)
+        parser.add_argument('--skills', type=int, default=500)
+        parser.add_argument('--per-project', type=int, default=6, help='Technologies per project')
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def memberships(self, projects, skills, per_project):
+        # Zipf-like popularity: a handful of skills appear in most projects
+        rng = random.Random(42)
+        population = list(range(skills))
+        weights = [1 / (rank + 1) for rank in population]
+        return {
+            project: set(rng.choices(population, weights, k=per_project))
+            for project in range(projects)
+        }
+
+    def timed(self, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        return result, (time.perf_counter() - start) * 1000
+
+    def report_in_memory(self, skills_by_project, repeat):
+        index, elapsed = self.timed(related.SimilarityIndex, skills_by_project)
+        self.stdout.write(f'Index build: {elapsed:8.1f} ms')
+
+        _, elapsed = self.timed(index.all_neighbours, related.TOP_K, False)
+        self.stdout.write(f'All top-{related.TOP_K} (python): {elapsed:8.1f} ms')
+        if related.load_numpy() is not None:
+            _, elapsed = self.timed(index.all_neighbours, related.TOP_K, True)
+            self.stdout.write(f'All top-{related.TOP_K} (numpy):  {elapsed:8.1f} ms')
+        else:
+            self.stdout.write('numpy not installed; skipping the matrix path')
+
+        sample = random.Random(7).sample(sorted(skills_by_project), min(repeat, len(skills_by_project)))
+        timings = [self.timed(index.neighbours, project)[1] for project in sample]
+        self.stdout.write(
+            f'One project: median {statistics.median(timings):6.2f} ms  p95 {percentile(timings, 0.95):6.2f} ms'
+        )
+
+    def report_database(self, skills_by_project, skills, repeat):
+        skill_rows = Skill.objects.bulk_create(
+            Skill(name=f'skill{i}', category='Bench', proficiency='advanced') for i in range(skills)
+        )
+        projects = Project.objects.bulk_create(
+            (Project(title=f'Project {i}', description='', short_description='',
+                     date_created=datetime.date(2024, 1, 1))
+             for i in skills_by_project),
+            batch_size=2000,
+        )
+        through = Project.technologies.through
+        through.objects.bulk_create(
+            (through(project_id=projects[project].pk, skill_id=skill_rows[skill].pk)
+             for project, skill_ids in skills_by_project.items() for skill in skill_ids),
+            batch_size=5000,
+        )
+
+        count, elapsed = self.timed(related.rebuild_related_projects)
+        self.stdout.write(f'Rebuild table: {elapsed:8.1f} ms ({count} rows)')
+
+        rng = random.Random(11)
+        update_timings, lookup_timings = [], []
+        for project in rng.sample(projects, min(repeat, len(projects))):
+            # Swap one technology, then refresh the affected lists directly
+            # (bulk writes don't send m2m_changed)
+            through.objects.filter(project_id=project.pk).order_by('pk')[:1].get().delete()
+            through.objects.create(project_id=project.pk, skill_id=rng.choice(skill_rows).pk)
+            update_timings.append(self.timed(related.update_related_projects, project.pk)[1])
+
+            lookup = (Project.objects.filter(similar_to__project_id=project.pk)
+                      .order_by('similar_to__rank').values_list('pk', flat=True)[:3])
+            lookup_timings.append(self.timed(list, lookup)[1])
+
+        for label, timings in (('Incremental update', update_timings), ('Detail lookup', lookup_timings)):
+            self.stdout.write(
+                f'{label}: median {statistics.median(timings):7.2f} ms  '
+                f'p95 {percentile(timings, 0.95):7.2f} ms'
+            )
+        self.stdout.write(f'Stored rows: {RelatedProject.objects.count()}')
+
+    def handle(self, *args, **options):
+        skills_by_project = self.memberships(options['projects'], options['skills'], options['per_project'])
+        self.stdout.write(
+            f"{options['projects']} projects, {options['skills']} skills, "
+            f"database: {connection.vendor}"
+        )
+        self.report_in_memory(skills_by_project, options['repeat'])
+        with transaction.atomic():
+            self.report_database(skills_by_project, options['skills'], options['repeat'])
+            # Leave the database exactly as it was
+            transaction.set_rollback(True)
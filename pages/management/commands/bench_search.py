@@ -0,0 +1,75 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from pages.models import SearchDocument
+from pages.search import optimize_index, search
+
+# A Zipf-like vocabulary: a few very common words and a long tail
+COMMON = ['django', 'python', 'data', 'model', 'learning', 'web', 'api', 'cache']
+TOPICS = ['postgres', 'kubernetes', 'pytorch', 'tensorflow', 'graphql', 'redis', 'celery',
+          'docker', 'react', 'numpy', 'pandas', 'fastapi', 'rust', 'golang', 'kafka']
+FILLER = ['the', 'and', 'with', 'for', 'how', 'why', 'building', 'notes', 'guide', 'part']
+
+QUERIES = ['django', 'kubernetes', 'pytorch redis', 'building notes', 'tail42', 'nomatchword']
+
+
+class Command(BaseCommand):
+    help = 'Time search queries over a synthetic corpus (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000)
+        parser.add_argument('--words', type=int, default=60, help='Words per document body')
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def corpus(self, rows, words):
+        rng = random.Random(42)
+        tail = [f'tail{i}' for i in range(5000)]
+        for i in range(rows):
+            body = []
+            for _ in range(words):
+                roll = rng.random()
+                if roll < 0.15:
+                    body.append(rng.choice(COMMON))
+                elif roll < 0.20:
+                    body.append(rng.choice(TOPICS))
+                elif roll < 0.70:
+                    body.append(rng.choice(FILLER))
+                else:
+                    body.append(rng.choice(tail))
+            title = ' '.join(rng.sample(TOPICS, 2) + [rng.choice(COMMON)])
+            yield SearchDocument(
+                kind='blog', object_id=10_000_000 + i, title=title.title(),
+                body=' '.join(body), url=f'https://example.com/{i}',
+            )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Database: {connection.vendor}')
+        with transaction.atomic():
+            start = time.perf_counter()
+            SearchDocument.objects.bulk_create(
+                self.corpus(options['rows'], options['words']), batch_size=2000
+            )
+            optimize_index()
+            self.stdout.write(
+                f"Indexed {options['rows']} documents in {time.perf_counter() - start:.1f} s"
+            )
+
+            for query in QUERIES:
+                timings = []
+                for _ in range(options['repeat']):
+                    start = time.perf_counter()
+                    results = search(query)
+                    timings.append((time.perf_counter() - start) * 1000)
+                timings.sort()
+                p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+                self.stdout.write(
+                    f'{query!r:>16}: {len(results):2} results  '
+                    f'median {statistics.median(timings):6.2f} ms  p95 {p95:6.2f} ms'
+                )
+
+            # Leave the database exactly as it was
+            transaction.set_rollback(True)
@@ -0,0 +1,93 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter: import the WSGI module, then serve one request
+PROBE = '''
+import io, json, sys, time
+start = time.perf_counter()
+from importlib import import_module
+application = import_module(sys.argv[1]).application
+imported = time.perf_counter()
+environ = {
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': sys.argv[2], 'QUERY_STRING': '',
+    'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'HTTP_HOST': 'localhost',
+    'SERVER_PROTOCOL': 'HTTP/1.1', 'wsgi.url_scheme': 'https', 'wsgi.input': io.BytesIO(),
+    'wsgi.errors': sys.stderr, 'wsgi.multithread': False, 'wsgi.multiprocess': True,
+    'wsgi.run_once': False, 'wsgi.version': (1, 0),
+}
+status = []
+body = b''.join(application(environ, lambda line, headers, exc_info=None: status.append(line)))
+done = time.perf_counter()
+print(json.dumps({
+    'import': imported - start, 'request': done - imported,
+    'status': status[0], 'bytes': len(body), 'modules': len(sys.modules),
+}))
+'''
+
+
+def parse_importtime(stderr):
+    """Self time in ms per top-level package, from ``-X importtime`` output"""
+    totals = Counter()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        totals[name.strip().split('.')[0]] += int(self_us) / 1000
+    return totals
+
+
+class Command(BaseCommand):
+    help = (
+        'Time a cold start: import the WSGI application in a fresh interpreter and '
+        'serve its first request, then list the packages that took longest to import'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/about/', help='Path of the first request')
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--top', type=int, default=15, help='Packages to list from -X importtime')
+        parser.add_argument('--wsgi', default='django_project.wsgi', help='Module exposing `application`')
+
+    def run_probe(self, options, importtime=False):
+        command = [sys.executable, *(['-X', 'importtime'] if importtime else []),
+                   '-c', PROBE, options['wsgi'], options['path']]
+        env = {**os.environ, 'MEDIUM_SYNC_ENABLED': '0'}
+        start = time.perf_counter()
+        result = subprocess.run(command, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True)
+        wall = time.perf_counter() - start
+        if result.returncode:
+            raise CommandError(f'Probe failed:\n{result.stderr[-2000:]}')
+        return wall, json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+    def handle(self, *args, **options):
+        runs = []
+        for _ in range(options['runs']):
+            wall, probe, _ = self.run_probe(options)
+            runs.append((wall, probe))
+
+        def median_ms(values):
+            return statistics.median(values) * 1000
+
+        probe = runs[-1][1]
+        self.stdout.write(f"GET {options['path']} -> {probe['status']}, {probe['bytes']} B, "
+                          f"{probe['modules']} modules loaded")
+        self.stdout.write(
+            f"Cold start, median of {options['runs']}: "
+            f"interpreter {median_ms([wall - p['import'] - p['request'] for wall, p in runs]):.0f} ms, "
+            f"import {median_ms([p['import'] for _, p in runs]):.0f} ms, "
+            f"first response {median_ms([p['request'] for _, p in runs]):.0f} ms, "
+            f"total {median_ms([wall for wall, _ in runs]):.0f} ms"
+        )
+
+        _, _, stderr = self.run_probe(options, importtime=True)
+        self.stdout.write(f"Import self time by package (-X importtime, top {options['top']}):")
+        for package, ms in parse_importtime(stderr).most_common(options['top']):
+            self.stdout.write(f'  {package:<24} {ms:8.1f} ms')
@@ -0,0 +1,72 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpResponseNotFound
+from django.test import RequestFactory, override_settings
+from django.views.static import serve
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+DEFAULT_PATHS = ['css/style.css', 'css/index.css', 'js/index.js', 'js/animations.js', 'images/bip.w640.webp']
+
+
+def consume(response):
+    body = b''.join(response.streaming_content) if response.streaming else response.content
+    response.close()
+    return body
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare serving collected static files through the DEBUG static() view '
+        'with the WhiteNoise middleware (run collectstatic first)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', default=DEFAULT_PATHS)
+        parser.add_argument('--repeat', type=int, default=200)
+        parser.add_argument('--encoding', default='br, gzip', help='Accept-Encoding sent by the client')
+
+    def measure(self, label, handler, url, repeat, encoding):
+        factory = RequestFactory()
+        timings = []
+        for _ in range(repeat):
+            request = factory.get(url, HTTP_ACCEPT_ENCODING=encoding)
+            start = time.perf_counter()
+            response = handler(request)
+            body = consume(response)
+            timings.append((time.perf_counter() - start) * 1_000_000)
+        self.stdout.write(
+            f'  {label:<10} {response.status_code} {len(body):>9} B  '
+            f"{response.get('Content-Encoding', '-'):<4} {statistics.median(timings):8.1f} us  "
+            f"cache-control: {response.get('Cache-Control', '-')}  vary: {response.get('Vary', '-')}"
+        )
+        return len(body)
+
+    def handle(self, *args, **options):
+        if not hasattr(staticfiles_storage, 'manifest_name') or not staticfiles_storage.read_manifest():
+            raise CommandError('No staticfiles manifest in STATIC_ROOT; run collectstatic first')
+
+        # Production settings: the file index is built once, from STATIC_ROOT only
+        with override_settings(WHITENOISE_AUTOREFRESH=False, WHITENOISE_USE_FINDERS=False, DEBUG=False):
+            whitenoise = WhiteNoiseMiddleware(lambda request: HttpResponseNotFound())
+
+        def debug_view(request):
+            return serve(request, request.path[len(settings.STATIC_URL):], document_root=settings.STATIC_ROOT)
+
+        totals = {'static()': 0, 'whitenoise': 0}
+        for path in options['paths']:
+            hashed_url = settings.STATIC_URL + staticfiles_storage.stored_name(path)
+            self.stdout.write(path)
+            totals['static()'] += self.measure(
+                'static()', debug_view, settings.STATIC_URL + path, options['repeat'], options['encoding'],
+            )
+            totals['whitenoise'] += self.measure(
+                'whitenoise', whitenoise, hashed_url, options['repeat'], options['encoding'],
+            )
+        self.stdout.write(
+            f"Total bytes: static() {totals['static()']}, whitenoise {totals['whitenoise']} "
+            f"({100 * totals['whitenoise'] / max(totals['static()'], 1):.0f}%)"
+        )
@@ -0,0 +1,259 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from urllib.parse import quote
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from pages import seeding
+from pages.models import Project
+from pages.perf import RequestRecord
+
+from .bench_asgi import free_port, run_load, wait_until_listening
+from .perf_report import percentile
+
+VIEWS = ['home', 'about', 'projects', 'blogs', 'project_detail', 'contact']
+DEFAULT_SCALES = [10, 1000, 100_000]
+# Where time can only grow; throughput (http_rps) can only shrink
+LOWER_IS_BETTER = ['p50_ms', 'p99_ms', 'peak_kib', 'http_p50_ms', 'http_p99_ms']
+
+
+def scale_counts(rows):
+    """Rows per table at one scale point: lists get ``rows``, about-page sections a hundredth"""
+    return {
+        'projects': rows,
+        'blogs': rows,
+        'skills': min(rows, 300),
+        'tags': min(rows, 200),
+        'experience': max(rows // 100, 1),
+        'education': max(rows // 100, 1),
+        'certifications': max(rows // 100, 1),
+    }
+
+
+def database_url(settings_dict):
+    """DATABASE_URL that points a server process at the same database"""
+    engine = settings_dict['ENGINE'].rsplit('.', 1)[-1]
+    if engine == 'sqlite3':
+        return f"sqlite:///{settings_dict['NAME']}"
+    if engine == 'postgresql':
+        credentials = quote(settings_dict['USER'] or '', safe='')
+        if settings_dict['PASSWORD']:
+            credentials += ':' + quote(settings_dict['PASSWORD'], safe='')
+        return (
+            f"postgres://{credentials}@{settings_dict['HOST'] or 'localhost'}:"
+            f"{settings_dict['PORT'] or 5432}/{quote(settings_dict['NAME'], safe='')}"
+        )
+    raise CommandError(f'No DATABASE_URL scheme for {settings_dict["ENGINE"]}')
+
+
+def regressions(baseline, results, threshold, min_delta_ms):
+    """Messages for every metric in ``results`` that is worse than ``baseline`` by more than ``threshold``"""
+    found = []
+    for scale, views in results.items():
+        for view, metrics in views.items():
+            before = baseline.get(scale, {}).get(view)
+            if not before:
+                continue
+            where = f'{view} at {scale} rows'
+            if metrics['queries'] > before['queries']:
+                found.append(f"{where}: {before['queries']} -> {metrics['queries']} queries")
+            for key in LOWER_IS_BETTER:
+                if key not in metrics or key not in before:
+                    continue
+                floor = 0 if key == 'peak_kib' else min_delta_ms
+                if metrics[key] > before[key] * (1 + threshold) and metrics[key] - before[key] > floor:
+                    found.append(f'{where}: {key} {before[key]:g} -> {metrics[key]:g}')
+            if 'http_rps' in metrics and 'http_rps' in before and \
+                    metrics['http_rps'] < before['http_rps'] * (1 - threshold):
+                found.append(f"{where}: http_rps {before['http_rps']:g} -> {metrics['http_rps']:g}")
+    return found
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a scratch database at several scale points and measure every public view: '
+        'p50/p99 latency, throughput under concurrent load, queries and peak memory. '
+        'Compares against a JSON baseline and fails on regressions.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', nargs='+', type=int, default=DEFAULT_SCALES, help='Rows per list')
+        parser.add_argument('--views', nargs='+', choices=VIEWS, default=VIEWS)
+        parser.add_argument('--requests', type=int, default=30, help='Test client requests per view')
+        parser.add_argument(
+            '--http-requests', type=int, default=300, help='Requests per view against gunicorn (0 to skip)',
+        )
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument('--baseline', default=os.path.join(settings.BASE_DIR, 'benchmarks', 'views.json'))
+        parser.add_argument('--save-baseline', action='store_true', help='Write the results as the new baseline')
+        parser.add_argument('--threshold', type=float, default=0.25, help='Allowed slowdown, as a fraction')
+        parser.add_argument(
+            '--min-delta-ms', type=float, default=1.0, help='Ignore slowdowns smaller than this (timer noise)',
+        )
+
+    def urls(self, views):
+        urls = {}
+        for view in views:
+            if view == 'project_detail':
+                pks = Project.objects.order_by('pk').values_list('pk', flat=True)
+                urls[view] = reverse(view, args=[pks[pks.count() // 2]])
+            else:
+                urls[view] = reverse(view)
+        return urls
+
+    def measure_client(self, url, requests):
+        """Sequential test client requests: latencies, query count and peak traced memory"""
+        client = Client()
+        if client.get(url).status_code != 200:
+            raise CommandError(f'{url} did not return 200')
+        timings = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            client.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+        # Counted by a wrapper: with DEBUG on, seeding has already filled the
+        # bounded connection.queries log that CaptureQueriesContext reads
+        queries = RequestRecord()
+        with connection.execute_wrapper(queries):
+            client.get(url)
+        tracemalloc.start()
+        try:
+            client.get(url)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return {
+            'p50_ms': round(statistics.median(timings), 2),
+            'p99_ms': round(percentile(timings, 99), 2),
+            'queries': queries.queries,
+            'peak_kib': round(peak / 1024),
+        }
+
+    def measure_http(self, urls, options):
+        """Per-view latency and throughput against gunicorn serving the scratch database"""
+        port = free_port()
+        env = {
+            **os.environ,
+            'DATABASE_URL': database_url(connection.settings_dict),
+            'CACHE_BACKEND': 'dummy',
+            'MEDIUM_SYNC_ENABLED': '0',
+            'PERF_SAMPLE_RATE': '0',
+            'ASYNC_VIEWS': '0',
+            'DEBUG': 'False',
+        }
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', 'django_project.wsgi:application',
+             '--worker-class', 'gthread', '--workers', str(options['workers']),
+             '--threads', str(options['threads']), '--bind', f'127.0.0.1:{port}'],
+            cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        results = {}
+        try:
+            wait_until_listening(port, process)
+            for view, url in urls.items():
+                run_load(port, [url], options['workers'] * 10, options['concurrency'])  # warm up
+                start = time.perf_counter()
+                latencies, errors = run_load(port, [url], options['http_requests'], options['concurrency'])
+                elapsed = time.perf_counter() - start
+                results[view] = {
+                    'http_rps': round(len(latencies) / elapsed, 1),
+                    'http_p50_ms': round(statistics.median(latencies), 2),
+                    'http_p99_ms': round(percentile(latencies, 99), 2),
+                    'http_errors': errors,
+                }
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+        return results
+
+    def run_scale(self, rows, options):
+        call_command('flush', interactive=False, verbosity=0)
+        start = time.perf_counter()
+        inserted = seeding.seed(**scale_counts(rows))
+        # Above the limit project_detail runs its related lookup against an
+        # empty table: the same single indexed query, just with no rows
+        self.stdout.write(
+            f'\n{rows} rows: seeded {sum(inserted.values())} rows in {time.perf_counter() - start:.1f} s'
+            + ('' if rows <= seeding.RELATED_REBUILD_LIMIT else ' (related projects not rebuilt)')
+        )
+
+        urls = self.urls(options['views'])
+        with override_settings(
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+            MEDIUM_SYNC_ENABLED=False,
+        ):
+            results = {view: self.measure_client(url, options['requests']) for view, url in urls.items()}
+        if options['http_requests']:
+            for view, metrics in self.measure_http(urls, options).items():
+                results[view].update(metrics)
+
+        self.stdout.write(
+            f"{'view':<16} {'p50':>8} {'p99':>8} {'queries':>8} {'peak KiB':>9}"
+            f" {'req/s':>8} {'http p50':>9} {'http p99':>9} {'errors':>7}"
+        )
+        for view, metrics in results.items():
+            line = (
+                f"{view:<16} {metrics['p50_ms']:>8.2f} {metrics['p99_ms']:>8.2f} "
+                f"{metrics['queries']:>8} {metrics['peak_kib']:>9}"
+            )
+            if 'http_rps' in metrics:
+                line += (
+                    f" {metrics['http_rps']:>8.1f} {metrics['http_p50_ms']:>9.2f}"
+                    f" {metrics['http_p99_ms']:>9.2f} {metrics['http_errors']:>7}"
+                )
+            self.stdout.write(line)
+        return results
+
+    def handle(self, *args, **options):
+        # gunicorn runs with DEBUG off, so templates need hashed static names
+        if options['http_requests'] and hasattr(staticfiles_storage, 'manifest_name') \
+                and not staticfiles_storage.read_manifest():
+            raise CommandError('No staticfiles manifest in STATIC_ROOT; run collectstatic first (or --http-requests 0)')
+
+        # A throwaway database, so a server process can read what was seeded
+        # and the real one is never touched
+        scratch = tempfile.TemporaryDirectory()
+        if connection.vendor == 'sqlite':
+            connection.settings_dict['TEST']['NAME'] = os.path.join(scratch.name, 'bench.sqlite3')
+        original_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            results = {
+                str(rows): self.run_scale(rows, options) for rows in sorted(options['scales'])
+            }
+        finally:
+            connection.creation.destroy_test_db(original_name, verbosity=0)
+            scratch.cleanup()
+
+        path = options['baseline']
+        if options['save_baseline']:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as handle:
+                json.dump({'database': connection.vendor, 'results': results}, handle, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f'\nBaseline written to {path}'))
+            return
+        try:
+            with open(path, encoding='utf-8') as handle:
+                baseline = json.load(handle)
+        except FileNotFoundError:
+            self.stdout.write(f'\nNo baseline at {path}; run with --save-baseline to record one')
+            return
+
+        found = regressions(baseline['results'], results, options['threshold'], options['min_delta_ms'])
+        if found:
+            raise CommandError('Regressions against the baseline:\n' + '\n'.join(found))
+        self.stdout.write(self.style.SUCCESS(f'\nNo regressions beyond {options["threshold"]:.0%} of {path}'))
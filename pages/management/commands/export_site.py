@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+
+from pages.cache import queryset_version
+from pages.models import Blog, Project
+from pages.pagination import KeysetPaginator
+from pages.views import BLOGS_PER_PAGE, PROJECTS_PER_PAGE
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def digest(*parts):
+    return hashlib.sha256('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def build_fingerprint():
+    """Anything that changes every page: templates and hashed static names"""
+    sha = hashlib.sha256()
+    template_dir = Path(settings.BASE_DIR) / 'templates'
+    for path in sorted(template_dir.rglob('*.html')):
+        sha.update(str(path.relative_to(template_dir)).encode('utf-8'))
+        sha.update(path.read_bytes())
+    static_manifest = Path(settings.STATIC_ROOT) / 'staticfiles.json'
+    if static_manifest.exists():
+        sha.update(static_manifest.read_bytes())
+    return sha.hexdigest()
+
+
+def content_models():
+    return [
+        model for model in apps.get_app_config('pages').get_models()
+        if any(field.name == 'updated_at' for field in model._meta.concrete_fields)
+    ]
+
+
+def paginated(url, output_dir, paginator, fingerprint):
+    """Walk the keyset pages the way a visitor following "Next" would"""
+    page = paginator.page()
+    yield url, f'{output_dir}/index.html', digest(fingerprint)
+    while page.has_next():
+        cursor = page.next_cursor
+        yield f'{url}?after={cursor}', f'{output_dir}/after/{cursor}/index.html', digest(fingerprint, cursor)
+        page = paginator.page(cursor)
+
+
+def iter_pages():
+    """``(url, file, fingerprint)`` for every public page"""
+    site = digest(*(queryset_version(model._meta.label, model.objects.all()) for model in content_models()))
+    yield '/', 'index.html', site
+    yield '/about/', 'about/index.html', site
+    yield '/services/', 'services/index.html', 'static'
+
+    projects_version = queryset_version('projects', Project.objects.all())
+    yield from paginated(
+        '/projects/', 'projects',
+        KeysetPaginator(Project.objects.all(), PROJECTS_PER_PAGE, 'projects'), projects_version,
+    )
+
+    blogs_version = queryset_version('blogs', Blog.objects.all())
+    yield from paginated(
+        '/blogs/', 'blogs', KeysetPaginator(Blog.objects.all(), BLOGS_PER_PAGE, 'blogs'), blogs_version,
+    )
+
+    # Detail pages list related projects too, so they depend on all projects
+    for pk, updated_at in Project.objects.order_by('pk').values_list('pk', 'updated_at'):
+        yield f'/project/{pk}/', f'project/{pk}/index.html', digest(updated_at, *projects_version)
+
+
+class Command(BaseCommand):
+    help = 'Render every public page to static HTML for CDN serving'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=settings.SITE_EXPORT_DIR,
+                            help='Directory to write the site to')
+        parser.add_argument('--force', action='store_true',
+                            help='Re-render every page, ignoring the manifest')
+
+    def load_manifest(self, path):
+        try:
+            with open(path) as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return {'build': None, 'pages': {}}
+
+    def write_atomic(self, path, content):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        tmp.write_bytes(content)
+        os.replace(tmp, path)
+
+    def handle(self, *args, **options):
+        output = Path(options['output'])
+        manifest_path = output / MANIFEST_NAME
+        manifest = self.load_manifest(manifest_path)
+
+        build = build_fingerprint()
+        previous = {} if options['force'] or manifest['build'] != build else manifest['pages']
+
+        client = Client()
+        pages = {}
+        rendered = skipped = failed = 0
+
+        # Rendering must not kick off background Medium syncs
+        with override_settings(MEDIUM_SYNC_ENABLED=False):
+            for url, filename, fingerprint in iter_pages():
+                target = output / filename
+                entry = {'file': filename, 'fingerprint': fingerprint}
+                if previous.get(url) == entry and target.exists():
+                    pages[url] = entry
+                    skipped += 1
+                    continue
+
+                response = client.get(url)
+                if response.status_code != 200:
+                    self.stdout.write(self.style.WARNING(f'{url}: HTTP {response.status_code}, skipped'))
+                    failed += 1
+                    continue
+                self.write_atomic(target, response.content)
+                pages[url] = entry
+                rendered += 1
+
+        # Drop pages that no longer exist (deleted projects, fewer pages)
+        removed = 0
+        for url, entry in manifest['pages'].items():
+            if url not in pages:
+                stale = output / entry['file']
+                if stale.exists():
+                    stale.unlink()
+                    removed += 1
+
+        self.write_atomic(
+            manifest_path,
+            json.dumps({'build': build, 'pages': pages}, indent=1, sort_keys=True).encode('utf-8'),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported site to {output}: {rendered} rendered, {skipped} unchanged, '
+            f'{removed} removed, {failed} failed'
+        ))
@@ -0,0 +1,77 @@
+import json
+import math
+import statistics
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values``"""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def query_growth(records):
+    """``(smallest, largest)`` as (content size, median queries) when queries grow with data, else None"""
+    by_size = defaultdict(list)
+    for record in records:
+        by_size[record['content_size']].append(record['queries'])
+    if len(by_size) < 2:
+        return None
+    smallest, largest = min(by_size), max(by_size)
+    low, high = statistics.median(by_size[smallest]), statistics.median(by_size[largest])
+    if high > low:
+        return (smallest, low), (largest, high)
+    return None
+
+
+class Command(BaseCommand):
+    help = (
+        'Summarize the PerformanceMiddleware log: p50/p95/p99 latency per view, and '
+        'views whose query count grows with the amount of content'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--log', default=None, help='JSONL log (default: PERF_LOG_PATH)')
+        parser.add_argument('--min-samples', type=int, default=1)
+
+    def handle(self, *args, **options):
+        path = options['log'] or settings.PERF_LOG_PATH
+        by_view = defaultdict(list)
+        try:
+            with open(path, encoding='utf-8') as log:
+                for line in log:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # a line cut short by a crash
+                    by_view[record['view'] or record['path']].append(record)
+        except FileNotFoundError:
+            raise CommandError(f'No log at {path}; set PERF_SAMPLE_RATE to record requests')
+
+        self.stdout.write(
+            f"{'view':<22} {'n':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'db p50':>8} {'tpl p50':>8} {'queries':>8}"
+        )
+        growing = []
+        for view, records in sorted(by_view.items(), key=lambda item: -len(item[1])):
+            if len(records) < options['min_samples']:
+                continue
+            totals = [record['total_ms'] for record in records]
+            self.stdout.write(
+                f'{view:<22} {len(records):>6} {percentile(totals, 50):>8.1f} '
+                f'{percentile(totals, 95):>8.1f} {percentile(totals, 99):>8.1f} '
+                f"{statistics.median(record['db_ms'] for record in records):>8.1f} "
+                f"{statistics.median(record['template_ms'] for record in records):>8.1f} "
+                f"{statistics.median(record['queries'] for record in records):>8g}"
+            )
+            growth = query_growth(records)
+            if growth:
+                growing.append((view, growth))
+
+        for view, ((small_size, low), (large_size, high)) in growing:
+            self.stdout.write(self.style.WARNING(
+                f'{view}: queries grow with content, {low:g} at {small_size} rows '
+                f'-> {high:g} at {large_size} rows'
+            ))
@@ -0,0 +1,18 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from pages import related
+
+
+class Command(BaseCommand):
+    help = 'Recompute the related-projects table from project technologies'
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        count = related.rebuild_related_projects()
+        elapsed = time.perf_counter() - start
+        engine = 'numpy' if related.load_numpy() is not None else 'python'
+        self.stdout.write(self.style.SUCCESS(
+            f'Stored {count} related-project links in {elapsed * 1000:.0f} ms ({engine})'
+        ))
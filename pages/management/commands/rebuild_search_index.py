@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from pages import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search documents from the content tables'
+
+    def handle(self, *args, **options):
+        for kind in search.INDEXED_KINDS:
+            with transaction.atomic():
+                count = search.reindex(kind)
+            self.stdout.write(f'{kind}: {count} documents')
+        search.optimize_index()
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt'))
@@ -0,0 +1,67 @@
+import argparse
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from pages import seeding
+
+
+class Command(BaseCommand):
+    help = (
+        'Add deterministic synthetic content at production scale (or beyond) with '
+        'multi-row inserts, and report rows per second'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=1000)
+        parser.add_argument('--images-per-project', type=int, default=3)
+        parser.add_argument('--skills', type=int, default=200)
+        parser.add_argument('--blogs', type=int, default=1000)
+        parser.add_argument('--tags', type=int, default=100)
+        parser.add_argument('--contacts', type=int, default=10_000)
+        parser.add_argument('--experience', type=int, default=50)
+        parser.add_argument('--education', type=int, default=5)
+        parser.add_argument('--certifications', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=42, help='Same seed and sizes, same content')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per INSERT (capped by the backend)')
+        parser.add_argument(
+            '--related', action=argparse.BooleanOptionalAction, default=None,
+            help=f'Rebuild related projects (default: up to {seeding.RELATED_REBUILD_LIMIT} projects)',
+        )
+
+    def report(self, table, rows, seconds):
+        if rows:
+            self.stdout.write(f'{table:<36} {rows:>9} rows {seconds:7.2f} s {rows / max(seconds, 1e-9):>10.0f} rows/s')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Seeding {connection.vendor} database (seed {options["seed"]})')
+        start = time.perf_counter()
+        timings = []
+
+        def on_table(table, rows, seconds):
+            timings.append((rows, seconds))
+            self.report(table, rows, seconds)
+
+        seeding.seed(
+            projects=options['projects'],
+            images_per_project=options['images_per_project'],
+            skills=options['skills'],
+            blogs=options['blogs'],
+            tags=options['tags'],
+            contacts=options['contacts'],
+            experience=options['experience'],
+            education=options['education'],
+            certifications=options['certifications'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            related_projects=options['related'],
+            on_table=on_table,
+        )
+        elapsed = time.perf_counter() - start
+        rows = sum(count for count, _ in timings)
+        insert_seconds = sum(seconds for _, seconds in timings)
+        self.stdout.write(self.style.SUCCESS(
+            f'{rows} rows in {elapsed:.1f} s: {rows / max(insert_seconds, 1e-9):.0f} rows/s inserting, '
+            f'{elapsed - insert_seconds:.1f} s for primary images, related projects and commit'
+        ))
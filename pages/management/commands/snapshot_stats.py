@@ -0,0 +1,37 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from pages.snapshot import build_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Report build time, query count and memory of the content snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        best = None
+        for _ in range(options['repeat']):
+            start = time.perf_counter()
+            snapshot = build_snapshot()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        # Retained size is what stays allocated while the snapshot is alive
+        tracemalloc.start()
+        snapshot = build_snapshot()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.stdout.write(
+            f'Snapshot: {len(snapshot.skills)} skills, {len(snapshot.education)} education, '
+            f'{len(snapshot.experience)} experience, {len(snapshot.certifications)} certifications, '
+            f'{len(snapshot.featured_projects)} projects, {len(snapshot.featured_blogs)} blogs'
+        )
+        self.stdout.write(
+            f'Build: {best * 1000:.1f} ms in {snapshot.query_count} queries  '
+            f'retained {retained / 1024:.1f} KiB  peak {peak / 1024:.1f} KiB'
+        )
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from pages.tasks import run_medium_sync
+
+
+class Command(BaseCommand):
+    help = 'Sync blogs from the Medium RSS feed (suitable for cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Sync even if the last sync is newer than MEDIUM_SYNC_INTERVAL',
+        )
+
+    def handle(self, *args, **options):
+        success, message = run_medium_sync(force=options['force'])
+        if success:
+            self.stdout.write(self.style.SUCCESS(message))
+        else:
+            self.stdout.write(self.style.WARNING(message))
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0003_auto_20250825_1804'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('locked_until', models.DateTimeField(blank=True, null=True)),
+                ('last_started_at', models.DateTimeField(blank=True, null=True)),
+                ('last_finished_at', models.DateTimeField(blank=True, null=True)),
+                ('last_success', models.BooleanField(default=False)),
+                ('last_message', models.TextField(blank=True)),
+            ],
+            options={
+                'verbose_name': 'Sync State',
+                'verbose_name_plural': 'Sync States',
+            },
+        ),
+    ]
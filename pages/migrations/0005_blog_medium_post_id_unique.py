@@ -0,0 +1,38 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:57
+
+from django.db import migrations, models
+
+
+def drop_duplicate_medium_posts(apps, schema_editor):
+    """Keep the oldest row per medium_post_id so the unique index can be built"""
+    Blog = apps.get_model('pages', 'Blog')
+    seen = set()
+    duplicates = []
+    rows = Blog.objects.exclude(medium_post_id='').order_by('pk').values_list('pk', 'medium_post_id')
+    for pk, medium_post_id in rows:
+        if medium_post_id in seen:
+            duplicates.append(pk)
+        else:
+            seen.add(medium_post_id)
+    if duplicates:
+        Blog.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0004_syncstate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.RunPython(drop_duplicate_medium_posts, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='blog',
+            constraint=models.UniqueConstraint(condition=models.Q(('medium_post_id', ''), _negated=True), fields=('medium_post_id',), name='unique_blog_medium_post_id'),
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 4.2.16 on 2026-10-18 11:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def dedupe_primary_images(apps, schema_editor):
+    """Leave at most one is_primary image per project (the first by order)"""
+    ProjectImage = apps.get_model('pages', 'ProjectImage')
+    seen = set()
+    demote = []
+    rows = ProjectImage.objects.filter(is_primary=True).order_by('project_id', 'order', 'pk')
+    for pk, project_id in rows.values_list('pk', 'project_id'):
+        if project_id in seen:
+            demote.append(pk)
+        else:
+            seen.add(project_id)
+    ProjectImage.objects.filter(pk__in=demote).update(is_primary=False)
+
+
+def backfill_primary_images(apps, schema_editor):
+    Project = apps.get_model('pages', 'Project')
+    ProjectImage = apps.get_model('pages', 'ProjectImage')
+    chosen = {}
+    images = ProjectImage.objects.order_by('project_id', '-is_primary', 'order', 'pk')
+    for pk, project_id, resource in images.values_list('pk', 'project_id', 'image'):
+        chosen.setdefault(project_id, (pk, resource))
+
+    projects = []
+    for project_id, (image_id, resource) in chosen.items():
+        projects.append(Project(
+            pk=project_id,
+            primary_image_id=image_id,
+            primary_image_public_id=resource.get_prep_value() if resource else '',
+        ))
+    Project.objects.bulk_update(projects, ['primary_image', 'primary_image_public_id'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0005_blog_medium_post_id_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='primary_image',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='pages.projectimage'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='primary_image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='primary_image_public_id',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='primary_image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectimage',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectimage',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(dedupe_primary_images, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='projectimage',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_primary', True)), fields=('project',), name='unique_primary_image_per_project'),
+        ),
+        migrations.RunPython(backfill_primary_images, migrations.RunPython.noop),
+    ]
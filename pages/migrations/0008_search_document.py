@@ -0,0 +1,98 @@
+# Generated by Django 4.2.16 on 2026-10-18 11:12
+
+from django.db import migrations, models
+
+SQLITE_INDEX = [
+    """
+    CREATE VIRTUAL TABLE pages_searchdocument_fts USING fts5(
+        title, body,
+        content='pages_searchdocument', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER pages_searchdocument_ai AFTER INSERT ON pages_searchdocument BEGIN
+        INSERT INTO pages_searchdocument_fts(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER pages_searchdocument_ad AFTER DELETE ON pages_searchdocument BEGIN
+        INSERT INTO pages_searchdocument_fts(pages_searchdocument_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER pages_searchdocument_au AFTER UPDATE ON pages_searchdocument BEGIN
+        INSERT INTO pages_searchdocument_fts(pages_searchdocument_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO pages_searchdocument_fts(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS pages_searchdocument_au',
+    'DROP TRIGGER IF EXISTS pages_searchdocument_ad',
+    'DROP TRIGGER IF EXISTS pages_searchdocument_ai',
+    'DROP TABLE IF EXISTS pages_searchdocument_fts',
+]
+
+POSTGRES_INDEX = [
+    """
+    ALTER TABLE pages_searchdocument ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    'CREATE INDEX pages_searchdocument_vector_idx ON pages_searchdocument USING GIN (search_vector)',
+]
+
+POSTGRES_DROP = [
+    'DROP INDEX IF EXISTS pages_searchdocument_vector_idx',
+    'ALTER TABLE pages_searchdocument DROP COLUMN IF EXISTS search_vector',
+]
+
+
+def run_for_vendor(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0007_content_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('project', 'Project'), ('blog', 'Blog'), ('skill', 'Skill'), ('experience', 'Experience')], max_length=20)),
+                ('object_id', models.PositiveIntegerField()),
+                ('title', models.CharField(max_length=300)),
+                ('body', models.TextField(blank=True)),
+                ('url', models.CharField(max_length=500)),
+            ],
+            options={
+                'verbose_name': 'Search Document',
+                'verbose_name_plural': 'Search Documents',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_document'),
+        ),
+        # Other backends fall back to unindexed icontains (see pages.search)
+        migrations.RunPython(
+            run_for_vendor({'sqlite': SQLITE_INDEX, 'postgresql': POSTGRES_INDEX}),
+            run_for_vendor({'sqlite': SQLITE_DROP, 'postgresql': POSTGRES_DROP}),
+        ),
+    ]
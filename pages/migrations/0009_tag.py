@@ -0,0 +1,77 @@
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def split_tags(value):
+    return [name.strip()[:100] for name in value.split(',') if name.strip()]
+
+
+def backfill_tags(apps, schema_editor):
+    """Turn the comma-separated Blog.tags strings into Tag rows and links"""
+    Blog = apps.get_model('pages', 'Blog')
+    Tag = apps.get_model('pages', 'Tag')
+    Through = Blog.tags.through
+
+    names = {}
+    blog_slugs = []
+    for pk, value in Blog.objects.exclude(tags_text='').values_list('pk', 'tags_text'):
+        slugs = []
+        for name in split_tags(value):
+            slug = slugify(name, allow_unicode=True)[:100]
+            if slug and slug not in slugs:
+                names.setdefault(slug, name)
+                slugs.append(slug)
+        blog_slugs.append((pk, slugs))
+
+    Tag.objects.bulk_create([Tag(name=name, slug=slug) for slug, name in names.items()], batch_size=500)
+    tag_ids = dict(Tag.objects.values_list('slug', 'pk'))
+    Through.objects.bulk_create(
+        [Through(blog_id=pk, tag_id=tag_ids[slug]) for pk, slugs in blog_slugs for slug in slugs],
+        batch_size=500,
+    )
+
+
+def restore_tag_strings(apps, schema_editor):
+    Blog = apps.get_model('pages', 'Blog')
+    blogs = []
+    for blog in Blog.objects.prefetch_related('tags'):
+        blog.tags_text = ', '.join(tag.name for tag in blog.tags.all())[:500]
+        blogs.append(blog)
+    Blog.objects.bulk_update(blogs, ['tags_text'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0008_search_document'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(allow_unicode=True, max_length=100, unique=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.RenameField(
+            model_name='blog',
+            old_name='tags',
+            new_name='tags_text',
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='tags',
+            field=models.ManyToManyField(blank=True, related_name='blogs', to='pages.tag'),
+        ),
+        migrations.RunPython(backfill_tags, restore_tag_strings),
+        migrations.RemoveField(
+            model_name='blog',
+            name='tags_text',
+        ),
+    ]
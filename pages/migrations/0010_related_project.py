@@ -0,0 +1,35 @@
+# Generated by Django 4.2.16 on 2026-10-18 11:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0009_tag'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedProject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='pages.project')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_to', to='pages.project')),
+            ],
+            options={
+                'ordering': ['project', 'rank'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='relatedproject',
+            constraint=models.UniqueConstraint(fields=('project', 'rank'), name='unique_related_project_rank'),
+        ),
+        migrations.AddConstraint(
+            model_name='relatedproject',
+            constraint=models.UniqueConstraint(fields=('project', 'related'), name='unique_related_project_pair'),
+        ),
+    ]
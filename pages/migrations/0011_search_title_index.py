@@ -0,0 +1,62 @@
+# Generated by Django 4.2.16 on 2026-10-18 15:02
+
+from django.db import migrations
+
+# A title-only FTS5 index next to pages_searchdocument_fts. Titles are short,
+# so its doclists stay small even for words that are common in bodies, and
+# pages.search can rank every title match before looking at bodies.
+# PostgreSQL needs nothing extra: titles carry weight A in search_vector.
+SQLITE_INDEX = [
+    """
+    CREATE VIRTUAL TABLE pages_searchdocument_title_fts USING fts5(
+        title,
+        content='pages_searchdocument', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER pages_searchdocument_title_ai AFTER INSERT ON pages_searchdocument BEGIN
+        INSERT INTO pages_searchdocument_title_fts(rowid, title) VALUES (new.id, new.title);
+    END
+    """,
+    """
+    CREATE TRIGGER pages_searchdocument_title_ad AFTER DELETE ON pages_searchdocument BEGIN
+        INSERT INTO pages_searchdocument_title_fts(pages_searchdocument_title_fts, rowid, title)
+        VALUES ('delete', old.id, old.title);
+    END
+    """,
+    """
+    CREATE TRIGGER pages_searchdocument_title_au AFTER UPDATE OF title ON pages_searchdocument BEGIN
+        INSERT INTO pages_searchdocument_title_fts(pages_searchdocument_title_fts, rowid, title)
+        VALUES ('delete', old.id, old.title);
+        INSERT INTO pages_searchdocument_title_fts(rowid, title) VALUES (new.id, new.title);
+    END
+    """,
+    "INSERT INTO pages_searchdocument_title_fts(pages_searchdocument_title_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS pages_searchdocument_title_au',
+    'DROP TRIGGER IF EXISTS pages_searchdocument_title_ad',
+    'DROP TRIGGER IF EXISTS pages_searchdocument_title_ai',
+    'DROP TABLE IF EXISTS pages_searchdocument_title_fts',
+]
+
+
+def run_on_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == 'sqlite':
+            for statement in statements:
+                schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0010_related_project'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_on_sqlite(SQLITE_INDEX), run_on_sqlite(SQLITE_DROP)),
+    ]
@@ -1,4 +1,7 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.text import slugify
 from cloudinary.models import CloudinaryField
 from django.contrib.auth.models import User
 
@@ -15,6 +18,7 @@ class Profile(models.Model):
     twitter_url = models.URLField(blank=True)
     resume_url = models.URLField(blank=True)
     profile_image = CloudinaryField('image', blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return self.name
@@ -35,6 +39,7 @@ class Skill(models.Model):
     ])
     icon = models.CharField(max_length=100, blank=True)  # CSS class or icon name
     order = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.name} ({self.category})"
@@ -43,6 +48,57 @@ class Skill(models.Model):
         ordering = ['category', 'order']
 
 
+PRIMARY_IMAGE_FIELDS = [
+    'primary_image', 'primary_image_public_id', 'primary_image_width',
+    'primary_image_height', 'updated_at',
+]
+
+
+class ProjectQuerySet(models.QuerySet):
+    def with_card_data(self):
+        """Prefetch what a project card renders besides the denormalized image: technology names"""
+        return self.prefetch_related(
+            models.Prefetch('technologies', queryset=Skill.objects.only('id', 'name', 'category', 'order')),
+        )
+
+    def with_images(self):
+        """Prefetch all images in display order (gallery pages)"""
+        return self.prefetch_related(
+            models.Prefetch('images', queryset=ProjectImage.objects.order_by('order', 'pk')),
+        )
+
+    def refresh_primary_images(self):
+        """
+        Recompute the denormalized primary image of every project in the
+        queryset: the image flagged is_primary, else the first by order.
+        Two queries regardless of the number of projects.
+        """
+        project_ids = list(self.values_list('pk', flat=True))
+        if not project_ids:
+            return 0
+
+        chosen = {}
+        images = ProjectImage.objects.filter(project_id__in=project_ids).order_by(
+            'project_id', '-is_primary', 'order', 'pk'
+        ).values_list('pk', 'project_id', 'image', 'width', 'height')
+        for image_id, project_id, resource, width, height in images:
+            chosen.setdefault(project_id, (image_id, resource, width, height))
+
+        now = timezone.now()
+        projects = []
+        for project_id in project_ids:
+            image_id, resource, width, height = chosen.get(project_id, (None, None, None, None))
+            projects.append(Project(
+                pk=project_id,
+                primary_image_id=image_id,
+                primary_image_public_id=resource.get_prep_value() if resource else '',
+                primary_image_width=width,
+                primary_image_height=height,
+                updated_at=now,
+            ))
+        return Project.objects.bulk_update(projects, PRIMARY_IMAGE_FIELDS, batch_size=500)
+
+
 class Project(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
@@ -53,16 +109,43 @@ class Project(models.Model):
     is_featured = models.BooleanField(default=False, help_text="Show on homepage")
     date_created = models.DateField()
     order = models.PositiveIntegerField(default=0, help_text="Display order (lower numbers first)")
+    # Denormalized card image, maintained by ProjectImage signals
+    primary_image = models.ForeignKey(
+        'ProjectImage', null=True, blank=True, editable=False,
+        on_delete=models.SET_NULL, related_name='+',
+    )
+    primary_image_public_id = models.CharField(max_length=255, blank=True, editable=False)
+    primary_image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    primary_image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ProjectQuerySet.as_manager()
     
     def __str__(self):
         return self.title
     
     def get_primary_image(self):
         """Get the first image for display in cards"""
+        prefetched = getattr(self, '_prefetched_objects_cache', {})
+        if 'images' in prefetched:
+            # Resolve from the prefetched images instead of querying again
+            images = list(prefetched['images'])
+            for image in images:
+                if image.is_primary:
+                    return image
+            return images[0] if images else None
+
         first_image = self.images.filter(is_primary=True).first()
         if first_image:
             return first_image
         return self.images.first()
+
+    @cached_property
+    def card_image(self):
+        """Cloudinary resource for the card image, built without a query"""
+        if not self.primary_image_public_id:
+            return None
+        return ProjectImage._meta.get_field('image').to_python(self.primary_image_public_id)
     
     class Meta:
         ordering = ['-is_featured', 'order', '-date_created']
@@ -70,16 +153,57 @@ class Project(models.Model):
 
 class ProjectImage(models.Model):
     project = models.ForeignKey(Project, related_name='images', on_delete=models.CASCADE)
-    image = CloudinaryField('image')
+    image = CloudinaryField('image', width_field='width', height_field='height')
     caption = models.CharField(max_length=200, blank=True)
     is_primary = models.BooleanField(default=False, help_text="Use as main image for project cards")
     order = models.PositiveIntegerField(default=0)
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.project.title} - Image {self.order}"
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            if self.is_primary:
+                # Only one primary image per project (also enforced by the index)
+                ProjectImage.objects.filter(
+                    project_id=self.project_id, is_primary=True
+                ).exclude(pk=self.pk).update(is_primary=False)
+            super().save(*args, **kwargs)
     
     class Meta:
         ordering = ['order']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project'],
+                condition=models.Q(is_primary=True),
+                name='unique_primary_image_per_project',
+            ),
+        ]
+
+
+class RelatedProject(models.Model):
+    """
+    Precomputed nearest neighbours of a project by shared technologies,
+    maintained by pages.related. ``rank`` 0 is the most similar.
+    """
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='related_links')
+    related = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='similar_to')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    def __str__(self):
+        return f"{self.project_id} -> {self.related_id} ({self.score:.2f})"
+
+    class Meta:
+        ordering = ['project', 'rank']
+        constraints = [
+            # Also the index behind the project_detail lookup
+            models.UniqueConstraint(fields=['project', 'rank'], name='unique_related_project_rank'),
+            models.UniqueConstraint(fields=['project', 'related'], name='unique_related_project_pair'),
+        ]
 
 
 class Education(models.Model):
@@ -92,6 +216,7 @@ class Education(models.Model):
     description = models.TextField(blank=True)
     activities = models.TextField(blank=True)
     grade = models.CharField(max_length=50, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.degree} at {self.institution}"
@@ -117,6 +242,7 @@ class Experience(models.Model):
     experience_type = models.CharField(max_length=20, choices=EXPERIENCE_TYPES)
     description = models.TextField()
     technologies_used = models.ManyToManyField(Skill, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.title} at {self.organization}"
@@ -134,6 +260,7 @@ class Certification(models.Model):
     credential_url = models.URLField(blank=True)
     badge_image = CloudinaryField('image', blank=True, null=True)
     skills = models.ManyToManyField(Skill, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.name} - {self.issuer}"
@@ -142,21 +269,79 @@ class Certification(models.Model):
         ordering = ['-issue_date']
 
 
+def tag_slug(name):
+    return slugify(name.strip()[:100], allow_unicode=True)[:100]
+
+
+class TagQuerySet(models.QuerySet):
+    def with_blog_counts(self):
+        """Tags that are in use, with ``blog_count``, in one aggregate query"""
+        return (
+            self.annotate(blog_count=models.Count('blogs'))
+            .filter(blog_count__gt=0)
+            .order_by('-blog_count', 'name')
+        )
+
+    def for_names(self, names):
+        """
+        ``{slug: Tag}`` for the given names, creating missing tags with one
+        bulk insert. Names that differ only in case or punctuation share a tag.
+        """
+        wanted = {}
+        for name in names:
+            name = name.strip()[:100]
+            slug = tag_slug(name)
+            if slug:
+                wanted.setdefault(slug, name)
+        if not wanted:
+            return {}
+        existing = {tag.slug: tag for tag in self.filter(slug__in=list(wanted))}
+        missing = [Tag(name=name, slug=slug) for slug, name in wanted.items() if slug not in existing]
+        if missing:
+            # Another writer may insert the same slug first; re-read below
+            self.bulk_create(missing, ignore_conflicts=True)
+            existing.update({tag.slug: tag for tag in self.filter(slug__in=[tag.slug for tag in missing])})
+        return existing
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=100, unique=True, allow_unicode=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = TagQuerySet.as_manager()
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        ordering = ['name']
+
+
 class Blog(models.Model):
     title = models.CharField(max_length=300)
     description = models.TextField()
     url = models.URLField()
     published_date = models.DateTimeField()
     image = CloudinaryField('image', blank=True, null=True)
-    tags = models.CharField(max_length=500, blank=True)  # Comma-separated tags
+    tags = models.ManyToManyField(Tag, related_name='blogs', blank=True)
     is_featured = models.BooleanField(default=False)
     medium_post_id = models.CharField(max_length=100, blank=True)  # For Medium integration
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)  # Detects upstream edits
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return self.title
     
     class Meta:
         ordering = ['-published_date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['medium_post_id'],
+                condition=~models.Q(medium_post_id=''),
+                name='unique_blog_medium_post_id',
+            ),
+        ]
 
 
 class Contact(models.Model):
@@ -181,6 +366,7 @@ class SiteSettings(models.Model):
     logo = CloudinaryField('image', blank=True, null=True)
     footer_text = models.TextField(default="© 2024 Biplove Gautam. All rights reserved.")
     analytics_code = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return "Site Settings"
@@ -188,3 +374,53 @@ class SiteSettings(models.Model):
     class Meta:
         verbose_name = "Site Settings"
         verbose_name_plural = "Site Settings"
+
+
+class SyncState(models.Model):
+    """Bookkeeping for background jobs, shared by every worker process"""
+    name = models.CharField(max_length=50, unique=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_started_at = models.DateTimeField(null=True, blank=True)
+    last_finished_at = models.DateTimeField(null=True, blank=True)
+    last_success = models.BooleanField(default=False)
+    last_message = models.TextField(blank=True)
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        verbose_name = "Sync State"
+        verbose_name_plural = "Sync States"
+
+
+class SearchDocument(models.Model):
+    """
+    One row per searchable object, maintained by signals (see pages.search).
+
+    The full-text index lives outside the ORM: an FTS5 table kept in step by
+    triggers on SQLite, a generated tsvector column with a GIN index on
+    PostgreSQL. Both are created in migration 0008; a migration that rebuilds
+    this table on SQLite must recreate the triggers.
+    """
+    KIND_CHOICES = [
+        ('project', 'Project'),
+        ('blog', 'Blog'),
+        ('skill', 'Skill'),
+        ('experience', 'Experience'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    title = models.CharField(max_length=300)
+    body = models.TextField(blank=True)
+    url = models.CharField(max_length=500)
+
+    def __str__(self):
+        return f"{self.kind}: {self.title}"
+
+    class Meta:
+        verbose_name = "Search Document"
+        verbose_name_plural = "Search Documents"
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_document'),
+        ]
@@ -0,0 +1,199 @@
+"""
+Keyset (cursor) pagination for the project and blog lists.
+
+A page is addressed by ``?after=<cursor>``, where the cursor encodes the
+ordering values of the last row on the previous page. Fetching a page is a
+``WHERE (ordering) > (cursor) LIMIT n`` query that costs the same on page
+500 as on page 1, unlike ``OFFSET``. The ordering is the queryset's (or the
+model's ``Meta.ordering``) with the primary key appended as a tie-breaker;
+ordering columns must be plain, non-null fields.
+
+Every page has exactly one URL: the previous link is also an ``after``
+cursor, so pages can be cached and exported by URL. Old ``?page=N`` links
+still work through a single bounded ``OFFSET`` slice.
+"""
+import base64
+import binascii
+import datetime
+import json
+from collections.abc import Sequence
+from urllib.parse import urlencode
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from .cache import queryset_version
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _jsonable(value):
+    # DjangoJSONEncoder drops microseconds, which would break equality
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+class KeysetPage(Sequence):
+    def __init__(self, object_list, paginator, next_cursor=None, has_previous=False,
+                 previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<KeysetPage after {self.previous_cursor or "start"}>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def _query(self, cursor):
+        params = dict(self.paginator.query_params)
+        if cursor:
+            params['after'] = cursor
+        return f'?{urlencode(params)}' if params else ''
+
+    @property
+    def next_query(self):
+        return self._query(self.next_cursor) if self.next_cursor else ''
+
+    @property
+    def previous_query(self):
+        """Query string of the previous page; empty means the first page"""
+        return self._query(self.previous_cursor)
+
+
+class KeysetPaginator:
+    def __init__(self, queryset, per_page, count_key, query_params=None):
+        self.per_page = per_page
+        self.count_key = count_key
+        # Extra parameters (filters) carried over into page links
+        self.query_params = query_params or {}
+
+        model = queryset.model
+        ordering = list(queryset.query.order_by or model._meta.ordering)
+        names = {name.lstrip('-') for name in ordering}
+        if 'pk' not in names and model._meta.pk.name not in names:
+            ordering.append('pk')
+        self.ordering = [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+        self.fields = [
+            model._meta.pk if name == 'pk' else model._meta.get_field(name)
+            for name, _ in self.ordering
+        ]
+        self.queryset = queryset.order_by(*ordering)
+
+    @property
+    def count(self):
+        # Cached per content generation under ``count_key``; the list views
+        # use the same key as their validators so both share one aggregate.
+        return queryset_version(self.count_key, self.queryset)[1]
+
+    def encode_cursor(self, obj):
+        return self._encode_values([getattr(obj, field.attname) for field in self.fields])
+
+    def _encode_values(self, values):
+        raw = json.dumps([_jsonable(value) for value in values], separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            values = json.loads(raw)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise InvalidCursor(cursor)
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise InvalidCursor(cursor)
+        try:
+            return [field.to_python(value) for field, value in zip(self.fields, values)]
+        except ValidationError:
+            raise InvalidCursor(cursor)
+
+    def _beyond(self, values, backwards=False):
+        """Rows strictly after ``values`` in the ordering (before, if backwards)"""
+        condition = Q()
+        equal = {}
+        for (name, descending), value in zip(self.ordering, values):
+            lookup = 'lt' if descending != backwards else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    def _reversed(self):
+        return self.queryset.order_by(
+            *[name if descending else f'-{name}' for name, descending in self.ordering]
+        )
+
+    def page(self, cursor=None):
+        """The page after ``cursor`` (the first page when None)"""
+        queryset = self.queryset
+        if cursor is not None:
+            queryset = queryset.filter(self._beyond(self.decode_cursor(cursor)))
+        rows = list(queryset[:self.per_page + 1])
+        object_list = rows[:self.per_page]
+        next_cursor = self.encode_cursor(object_list[-1]) if len(rows) > self.per_page else None
+
+        if cursor is None or not object_list:
+            return KeysetPage(object_list, self, next_cursor, has_previous=cursor is not None)
+
+        # The previous page ends just before our first row; we need the row
+        # preceding *it* as that page's own cursor.
+        first = [getattr(object_list[0], field.attname) for field in self.fields]
+        before = list(
+            self._reversed().filter(self._beyond(first, backwards=True))
+            .values_list(*[field.attname for field in self.fields])[:self.per_page + 1]
+        )
+        previous_cursor = None
+        if len(before) > self.per_page:
+            previous_cursor = self._encode_values(before[self.per_page])
+        return KeysetPage(
+            object_list, self, next_cursor,
+            has_previous=bool(before), previous_cursor=previous_cursor,
+        )
+
+    def page_number(self, number):
+        """Compatibility path for ``?page=N`` links: one bounded OFFSET slice"""
+        try:
+            number = max(int(number), 1)
+        except (TypeError, ValueError):
+            number = 1
+        last = max((self.count - 1) // self.per_page + 1, 1)
+        number = min(number, last)
+        if number == 1:
+            return self.page()
+
+        offset = (number - 1) * self.per_page
+        start = max(offset - self.per_page - 1, 0)
+        rows = list(self.queryset[start:offset + self.per_page + 1])
+        leading, rows = rows[:offset - start], rows[offset - start:]
+        object_list = rows[:self.per_page]
+        next_cursor = self.encode_cursor(object_list[-1]) if len(rows) > self.per_page else None
+        previous_cursor = self.encode_cursor(leading[0]) if len(leading) > self.per_page else None
+        return KeysetPage(object_list, self, next_cursor, has_previous=True,
+                          previous_cursor=previous_cursor)
+
+    def get_page(self, cursor=None, number=None):
+        """Like ``Paginator.get_page``: bad input falls back to the first page"""
+        if cursor:
+            try:
+                return self.page(cursor)
+            except InvalidCursor:
+                return self.page()
+        if number is not None:
+            return self.page_number(number)
+        return self.page()
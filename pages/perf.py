@@ -0,0 +1,194 @@
+"""
+Per-request performance records.
+
+``PerformanceMiddleware`` times each request and splits it into database
+time and query count and template rendering. Staff get the numbers in a
+``Server-Timing`` header, visible in the browser's network panel. A
+PERF_SAMPLE_RATE share of requests is appended to PERF_LOG_PATH as JSON
+lines for ``manage.py perf_report``. The middleware works under WSGI and
+ASGI.
+
+Nothing is patched process-wide. Every database connection gets one
+execute wrapper as it connects, and templates render through
+``TimedDjangoTemplates`` (the TEMPLATES backend). Both only measure when
+the current context belongs to a measured request; context variables
+follow ``sync_to_async``, so queries async views run on worker threads
+(pages.aio) count too. Parallel queries overlap, so db time can exceed
+the total.
+
+Template time includes the queries templates run lazily, so the parts can
+add up to more than the total. No request waits on outbound HTTP: the
+Medium feed is fetched by the background sync (pages.tasks), which records
+its fetch time in the job's SyncState message instead.
+"""
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.template.backends.django import DjangoTemplates, Template
+
+from .cache import per_generation
+from .models import Blog, Certification, Education, Experience, Project, Skill
+
+_current = contextvars.ContextVar('pages_perf_record', default=None)
+_query_observers = contextvars.ContextVar('pages_query_observers', default=())
+_log_lock = threading.Lock()
+
+
+def _run_observers(execute, sql, params, many, context):
+    observers = _query_observers.get()
+    if not observers:
+        return execute(sql, params, many, context)
+    for observer in reversed(observers):
+        execute = partial(observer, execute)
+    return execute(sql, params, many, context)
+
+
+@receiver(connection_created, dispatch_uid='pages.perf.watch_queries')
+def watch_queries(sender, connection, **kwargs):
+    if _run_observers not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_run_observers)
+
+
+@contextmanager
+def observe_queries(observer):
+    """
+    Pass the queries run in this context, on any connection or thread it
+    reaches, through ``observer`` (an execute_wrapper-style callable).
+    """
+    token = _query_observers.set(_query_observers.get() + (observer,))
+    try:
+        yield observer
+    finally:
+        _query_observers.reset(token)
+
+
+class RequestRecord:
+    __slots__ = ('db', 'queries', 'template', 'rendering', 'lock')
+
+    def __init__(self):
+        self.db = self.template = 0.0
+        self.queries = 0
+        self.rendering = False
+        # pages.aio can run a request's queries on several threads at once
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        # observe_queries hook
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.db += elapsed
+                self.queries += 1
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        record = _current.get()
+        if record is None or record.rendering:
+            # Templates rendered while rendering (render_to_string in a
+            # tag) are part of the outer render
+            return super().render(context, request)
+        record.rendering = True
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            record.rendering = False
+            record.template += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The stock DjangoTemplates backend, timing renders for PerformanceMiddleware"""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+def content_size():
+    """Rows of portfolio content, so perf_report can relate query counts to data size"""
+    return per_generation('perf:content-size', lambda: sum(
+        model.objects.count() for model in (Blog, Certification, Education, Experience, Project, Skill)
+    ))
+
+
+def write_record(entry):
+    line = json.dumps(entry, separators=(',', ':'))
+    os.makedirs(os.path.dirname(settings.PERF_LOG_PATH), exist_ok=True)
+    with _log_lock, open(settings.PERF_LOG_PATH, 'a', encoding='utf-8') as log:
+        log.write(line + '\n')
+
+
+class PerformanceMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        record = RequestRecord()
+        token = _current.set(record)
+        start = time.perf_counter()
+        try:
+            with observe_queries(record):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, record, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        record = RequestRecord()
+        token = _current.set(record)
+        start = time.perf_counter()
+        try:
+            with observe_queries(record):
+                response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        # request.user and content_size() may query the database
+        return await sync_to_async(self.finish)(request, response, record, time.perf_counter() - start)
+
+    def finish(self, request, response, record, total):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_staff:
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={record.db * 1000:.1f};desc="{record.queries} queries"',
+                f'tpl;dur={record.template * 1000:.1f}',
+                f'total;dur={total * 1000:.1f}',
+            ])
+
+        if settings.PERF_SAMPLE_RATE and random.random() < settings.PERF_SAMPLE_RATE:
+            match = request.resolver_match
+            write_record({
+                'ts': round(time.time(), 3),
+                'method': request.method,
+                'path': request.path,
+                'view': match.view_name if match else None,
+                'status': response.status_code,
+                'total_ms': round(total * 1000, 2),
+                'db_ms': round(record.db * 1000, 2),
+                'queries': record.queries,
+                'template_ms': round(record.template * 1000, 2),
+                'content_size': content_size(),
+            })
+        return response
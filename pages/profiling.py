@@ -0,0 +1,229 @@
+"""
+On-demand profiling of single requests, for staff.
+
+A staff request carrying ``?_profile`` (or an ``X-Profile`` header) runs
+under a profiler and stores what it finds in PROFILE_DIR:
+
+- ``<id>.collapsed``: collapsed stacks ("outer;inner count" per line) from
+  a sampling thread, ready for flamegraph.pl or speedscope. With
+  ``?_profile=cprofile`` it is ``<id>.prof`` from cProfile instead
+  (snakeviz, pstats).
+- ``<id>.json``: the request, its timing and the SQL timeline.
+
+The response names the profile in an ``X-Profile-Id`` header; the stored
+profiles are listed at /admin/profiles/. When PROFILE_DIR can't be written
+the page is still served, with an ``X-Profile-Error`` header instead.
+Requests without the switch only pay for looking it up in the query string
+and headers.
+
+The sampler reads the request thread's stack from another thread, so it
+only gets to run when the request thread lets go of the GIL: the effective
+interval is at least ``sys.getswitchinterval()`` (5 ms by default).
+
+Under ASGI both profilers watch the event loop thread. Sync code the view
+hands to worker threads shows up as awaiting them, and other requests
+served by the same loop meanwhile are included. The SQL timeline covers
+every thread the request's queries run on.
+"""
+import cProfile
+import json
+import os
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+
+from .perf import observe_queries
+
+PROFILE_ID_RE = re.compile(r'^[0-9]{8}-[0-9]{6}-[\w.-]+-[0-9a-f]{6}$')
+MODES = ('sample', 'cprofile')
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}:{code.co_qualname}"
+
+
+class StackSampler:
+    """Counts the stacks one thread is seen in, sampled every ``interval`` seconds"""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='pages-profiler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                names.append(_frame_name(frame))
+                frame = frame.f_back
+            if names:
+                self.stacks[';'.join(reversed(names))] += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+
+class SqlTimeline:
+    """observe_queries hook recording when each query ran"""
+
+    def __init__(self, origin):
+        self.origin = origin
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'start_ms': round((start - self.origin) * 1000, 3),
+                'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+                'sql': sql,
+            })
+
+
+def requested_mode(request):
+    """The profiler mode a request asks for, None when it doesn't"""
+    mode = request.GET.get('_profile', request.META.get('HTTP_X_PROFILE'))
+    if mode is None:
+        return None
+    return mode if mode in MODES else 'sample'
+
+
+def new_profile_id(request):
+    match = request.resolver_match
+    view = re.sub(r'[^\w.-]', '_', match.view_name if match else 'unresolved')
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{view}-{secrets.token_hex(3)}"
+
+
+def list_profiles():
+    """Stored profiles, newest first: ``[{'id', 'files', 'meta'}]``"""
+    try:
+        names = os.listdir(settings.PROFILE_DIR)
+    except FileNotFoundError:
+        return []
+    files = {}
+    for name in names:
+        profile_id, _, _ = name.partition('.')
+        if PROFILE_ID_RE.match(profile_id):
+            files.setdefault(profile_id, []).append(name)
+
+    profiles = []
+    for profile_id in sorted(files, reverse=True):
+        meta = {}
+        if f'{profile_id}.json' in files[profile_id]:
+            with open(os.path.join(settings.PROFILE_DIR, f'{profile_id}.json'), encoding='utf-8') as handle:
+                meta = json.load(handle)
+        profiles.append({'id': profile_id, 'files': sorted(files[profile_id]), 'meta': meta})
+    return profiles
+
+
+def profile_file_path(name):
+    """Path of a stored profile file, or None for anything that isn't one"""
+    profile_id, _, extension = name.partition('.')
+    if not PROFILE_ID_RE.match(profile_id) or extension not in ('collapsed', 'prof', 'json'):
+        return None
+    path = os.path.join(settings.PROFILE_DIR, name)
+    return path if os.path.isfile(path) else None
+
+
+def _is_staff(request):
+    return request.user.is_staff
+
+
+class ProfilerMiddleware:
+    """Goes after AuthenticationMiddleware: only staff may switch the profiler on"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        mode = requested_mode(request)
+        if mode is None or not _is_staff(request):
+            return self.get_response(request)
+
+        origin = time.perf_counter()
+        with observe_queries(SqlTimeline(origin)) as timeline:
+            if mode == 'cprofile':
+                collector = cProfile.Profile()
+                response = collector.runcall(self.get_response, request)
+            else:
+                with StackSampler(threading.get_ident(), settings.PROFILE_SAMPLE_INTERVAL) as collector:
+                    response = self.get_response(request)
+        return self.finish(request, response, mode, collector, timeline)
+
+    async def __acall__(self, request):
+        mode = requested_mode(request)
+        # request.user loads the session and user from the database
+        if mode is None or not await sync_to_async(_is_staff)(request):
+            return await self.get_response(request)
+
+        origin = time.perf_counter()
+        with observe_queries(SqlTimeline(origin)) as timeline:
+            if mode == 'cprofile':
+                collector = cProfile.Profile()
+                collector.enable()
+                try:
+                    response = await self.get_response(request)
+                finally:
+                    collector.disable()
+            else:
+                with StackSampler(threading.get_ident(), settings.PROFILE_SAMPLE_INTERVAL) as collector:
+                    response = await self.get_response(request)
+        return await sync_to_async(self.finish)(request, response, mode, collector, timeline)
+
+    def finish(self, request, response, mode, collector, timeline):
+        total_ms = (time.perf_counter() - timeline.origin) * 1000
+        profile_id = new_profile_id(request)
+        try:
+            self.store(profile_id, collector, {
+                'path': request.get_full_path(),
+                'method': request.method,
+                'status': response.status_code,
+                'mode': mode,
+                'total_ms': round(total_ms, 2),
+                'sql_ms': round(sum(query['duration_ms'] for query in timeline.queries), 2),
+                'queries': timeline.queries,
+            })
+        except OSError as exc:
+            # A profile is a debugging aid: never fail the page over it
+            response['X-Profile-Error'] = f'Profile not stored: {exc.strerror or exc}'
+        else:
+            response['X-Profile-Id'] = profile_id
+        return response
+
+    def store(self, profile_id, collector, meta):
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        base = os.path.join(settings.PROFILE_DIR, profile_id)
+        if isinstance(collector, cProfile.Profile):
+            collector.dump_stats(f'{base}.prof')
+        else:
+            with open(f'{base}.collapsed', 'w', encoding='utf-8') as handle:
+                handle.write(collector.collapsed())
+        with open(f'{base}.json', 'w', encoding='utf-8') as handle:
+            json.dump(meta, handle, indent=1)
@@ -0,0 +1,269 @@
+"""
+Related projects by shared technologies.
+
+Similarity is a weighted Jaccard over each project's skills: every skill is
+weighted by its inverse document frequency, so sharing a niche library
+counts for more than sharing Python. The top ``TOP_K`` neighbours of every
+project are stored in ``RelatedProject`` and ``project_detail`` reads them
+with one indexed lookup.
+
+``rebuild_related_projects()`` recomputes the whole table. Scores come from
+an inverted index (skill -> projects), so a project is only compared with
+projects it actually shares a skill with; when numpy is importable the bulk
+rebuild uses chunked dense matrix products instead. numpy is optional and
+deliberately left out of requirements.txt: it alone is bigger than the
+Vercel function limit (maxLambdaSize in vercel.json). Install it where
+``rebuild_related_projects`` runs over large catalogues; both paths give
+the same lists. After that,
+``update_related_projects()`` keeps the table current as technologies
+change by touching only the lists the change can affect, and reads only the
+projects that share a skill with the ones it scores. Lists it doesn't
+touch keep the skill weights they were computed with until the next full
+rebuild, so a single edit never rewrites every list.
+"""
+import functools
+import heapq
+import math
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Project, RelatedProject
+
+
+# Stored per project; project_detail shows the first three. Keeping a few
+# spare lets an incremental update drop a neighbour without a recompute.
+TOP_K = 6
+NUMPY_CHUNK_ROWS = 512
+
+
+@functools.cache
+def load_numpy():
+    """numpy if installed, else None; imported on first use as it is slow to import"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _sort_key(item):
+    related_id, score = item
+    return (-score, related_id)
+
+
+def load_memberships(projects=None):
+    """
+    project id -> set of skill ids, from one query on the through table;
+    only for ``projects`` (ids or a subquery) when given
+    """
+    rows = Project.technologies.through.objects.all()
+    if projects is not None:
+        rows = rows.filter(project_id__in=projects)
+    skills_by_project = defaultdict(set)
+    for project_id, skill_id in rows.values_list('project_id', 'skill_id').iterator(chunk_size=5000):
+        skills_by_project[project_id].add(skill_id)
+    return skills_by_project
+
+
+class SimilarityIndex:
+    def __init__(self, skills_by_project, project_counts=None, total=None):
+        """
+        ``skills_by_project`` is the whole through table unless
+        ``project_counts`` (skill id -> projects using it) and ``total``
+        (projects with any skill) give the table-wide figures the skill
+        weights need.
+        """
+        self.skills_by_project = skills_by_project
+        self.postings = defaultdict(list)
+        for project_id, skill_ids in skills_by_project.items():
+            for skill_id in skill_ids:
+                self.postings[skill_id].append(project_id)
+
+        if project_counts is None:
+            project_counts = {skill_id: len(projects) for skill_id, projects in self.postings.items()}
+            total = len(skills_by_project)
+        self.weights = {
+            skill_id: math.log((1 + total) / (1 + project_counts[skill_id])) + 1
+            for skill_id in self.postings
+        }
+        self.totals = {
+            project_id: sum(self.weights[skill_id] for skill_id in skill_ids)
+            for project_id, skill_ids in skills_by_project.items()
+        }
+
+    @classmethod
+    def around(cls, project_ids):
+        """
+        An index that can score ``project_ids`` against every other project:
+        it holds them and the projects sharing a skill with them, and nothing
+        else.
+        """
+        through = Project.technologies.through.objects
+        skills = through.filter(project_id__in=list(project_ids)).values('skill_id')
+        skills_by_project = load_memberships(through.filter(skill_id__in=skills).values('project_id'))
+        skill_ids = set().union(*skills_by_project.values())
+        project_counts = dict(
+            through.filter(skill_id__in=skill_ids).values('skill_id')
+            .annotate(projects=Count('project_id')).values_list('skill_id', 'projects')
+        )
+        total = through.values('project_id').distinct().count()
+        return cls(skills_by_project, project_counts, total)
+
+    def scores(self, project_id):
+        """related id -> similarity for every project sharing a skill"""
+        shared = defaultdict(float)
+        for skill_id in self.skills_by_project.get(project_id, ()):
+            weight = self.weights[skill_id]
+            for other in self.postings[skill_id]:
+                shared[other] += weight
+        shared.pop(project_id, None)
+        total = self.totals.get(project_id, 0.0)
+        return {
+            other: weight / (total + self.totals[other] - weight)
+            for other, weight in shared.items()
+        }
+
+    def neighbours(self, project_id, k=TOP_K):
+        """Best ``k`` (related id, score) pairs, ties broken by lower id"""
+        return heapq.nsmallest(k, self.scores(project_id).items(), key=_sort_key)
+
+    def all_neighbours(self, k=TOP_K, use_numpy=None):
+        """project id -> ``neighbours()`` for every project with skills"""
+        if use_numpy is None:
+            use_numpy = load_numpy() is not None
+        if use_numpy and self.skills_by_project:
+            return self._all_neighbours_numpy(k)
+        return {project_id: self.neighbours(project_id, k) for project_id in self.skills_by_project}
+
+    def _all_neighbours_numpy(self, k):
+        numpy = load_numpy()
+        project_ids = numpy.array(sorted(self.skills_by_project), dtype=numpy.int64)
+        columns = {skill_id: column for column, skill_id in enumerate(self.postings)}
+        membership = numpy.zeros((len(project_ids), len(columns)), dtype=numpy.float64)
+        for row, project_id in enumerate(project_ids.tolist()):
+            membership[row, [columns[skill_id] for skill_id in self.skills_by_project[project_id]]] = 1.0
+        weights = numpy.array([self.weights[skill_id] for skill_id in self.postings])
+        weighted = membership * weights
+        totals = weighted.sum(axis=1)
+
+        result = {}
+        for start in range(0, len(project_ids), NUMPY_CHUNK_ROWS):
+            stop = min(start + NUMPY_CHUNK_ROWS, len(project_ids))
+            shared = weighted[start:stop] @ membership.T
+            union = totals[start:stop, None] + totals[None, :] - shared
+            scores = numpy.divide(shared, union, out=numpy.zeros_like(shared), where=shared > 0)
+            scores[numpy.arange(stop - start), numpy.arange(start, stop)] = 0.0
+
+            width = min(k, scores.shape[1] - 1)
+            cutoff = -numpy.partition(-scores, width - 1, axis=1)[:, width - 1] if width > 0 else None
+            for offset, row in enumerate(scores):
+                project_id = int(project_ids[start + offset])
+                if cutoff is None:
+                    result[project_id] = []
+                    continue
+                # Take every tie at the cutoff so the id tie-break is exact
+                candidates = numpy.nonzero((row >= cutoff[offset]) & (row > 0))[0]
+                pairs = zip(project_ids[candidates].tolist(), row[candidates].tolist())
+                result[project_id] = heapq.nsmallest(k, pairs, key=_sort_key)
+        return result
+
+
+def _link_rows(project_id, neighbours):
+    return [
+        RelatedProject(project_id=project_id, related_id=related_id, score=score, rank=rank)
+        for rank, (related_id, score) in enumerate(neighbours)
+    ]
+
+
+def _replace_lists(lists, batch_size=1000):
+    """Overwrite the stored lists of the given projects"""
+    project_ids = list(lists)
+    for start in range(0, len(project_ids), batch_size):
+        RelatedProject.objects.filter(project_id__in=project_ids[start:start + batch_size]).delete()
+    rows = [row for project_id, neighbours in lists.items() for row in _link_rows(project_id, neighbours)]
+    RelatedProject.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
+
+
+def rebuild_related_projects(k=TOP_K):
+    """Recompute every project's list; returns the number of rows stored"""
+    index = SimilarityIndex(load_memberships())
+    lists = index.all_neighbours(k)
+    rows = [row for project_id, neighbours in lists.items() for row in _link_rows(project_id, neighbours)]
+    with transaction.atomic():
+        RelatedProject.objects.all().delete()
+        RelatedProject.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def _stored_lists(project_ids, batch_size=1000):
+    lists = defaultdict(list)
+    project_ids = list(project_ids)
+    for start in range(0, len(project_ids), batch_size):
+        rows = RelatedProject.objects.filter(project_id__in=project_ids[start:start + batch_size])
+        for project_id, related_id, score in rows.values_list('project_id', 'related_id', 'score'):
+            lists[project_id].append((related_id, score))
+    return lists
+
+
+def update_related_projects(project_id, k=TOP_K):
+    """
+    Refresh the lists affected by a change to one project's technologies:
+    the project's own list, and its entry in every other project's list.
+    Another list is only recomputed from scratch when the change may have
+    let an unlisted project overtake it.
+    """
+    index = SimilarityIndex.around([project_id])
+    new_scores = index.scores(project_id)
+    referrers = set(RelatedProject.objects.filter(related_id=project_id).values_list('project_id', flat=True))
+    # A full list can only take the project if it scores at least the last
+    # entry, so most lists never need to be read.
+    cutoffs = dict(
+        RelatedProject.objects.filter(rank=k - 1, project_id__in=list(new_scores)).values_list('project_id', 'score')
+    )
+    affected = referrers | {
+        other for other, score in new_scores.items()
+        if other not in cutoffs or score >= cutoffs[other]
+    }
+    stored = _stored_lists(affected)
+
+    changed = {project_id: index.neighbours(project_id, k)}
+    recompute = []
+    for other in affected:
+        current = stored.get(other, [])
+        old_score = dict(current).get(project_id)
+        new_score = new_scores.get(other)
+        merged = [item for item in current if item[0] != project_id]
+        if new_score:
+            merged.append((project_id, new_score))
+        merged = sorted(merged, key=_sort_key)[:k]
+
+        dropped = old_score is not None and (new_score or 0) < old_score
+        if dropped and len(current) >= k:
+            # Something below the old cut-off may now beat this project
+            recompute.append(other)
+        elif merged != current:
+            changed[other] = merged
+
+    if recompute:
+        # Their own neighbours need not share a skill with project_id
+        around = SimilarityIndex.around(recompute)
+        for other in recompute:
+            if (merged := around.neighbours(other, k)) != stored.get(other, []):
+                changed[other] = merged
+
+    with transaction.atomic():
+        _replace_lists(changed)
+    return len(changed)
+
+
+def forget_project(project_ids, k=TOP_K):
+    """Recompute the lists that referenced a project that has been deleted"""
+    if not project_ids:
+        return 0
+    index = SimilarityIndex.around(project_ids)
+    with transaction.atomic():
+        _replace_lists({project_id: index.neighbours(project_id, k) for project_id in project_ids})
+    return len(project_ids)
@@ -0,0 +1,294 @@
+"""
+Full-text search over projects, blogs, skills and experience.
+
+Each searchable object has a ``SearchDocument`` row (title, body, url). The
+rows are kept current by signals and by ``reindex()`` after bulk writes.
+Queries go to SQLite FTS5 or PostgreSQL's tsvector index depending on the
+database, and return ranked results with highlighted snippets: title
+matches first, then body matches, each ranked among the newest matching
+documents so that common terms stay as cheap as rare ones. Terms are
+stemmed (porter / english) rather than prefix-matched, which keeps every
+query an index lookup. Any other backend falls back to unindexed
+``icontains`` matching.
+"""
+import heapq
+import re
+from dataclasses import dataclass
+from operator import itemgetter
+
+from django.db import connection
+from django.db.models import Q
+from django.urls import reverse
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from django.utils.text import Truncator
+
+from .models import Blog, Experience, Project, SearchDocument, Skill
+
+MAX_TERMS = 8
+SNIPPET_WORDS = 24
+# Documents scored per ranking tier (see _title_first)
+SEARCH_CANDIDATES = 1000
+
+# Placeholders for the highlight tags until the snippet is HTML-escaped;
+# they are stripped from indexed text so they can't be spoofed.
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+TERM_RE = re.compile(r'\w+')
+
+
+@dataclass(frozen=True, slots=True)
+class SearchResult:
+    kind: str
+    object_id: int
+    title: str
+    url: str
+    snippet: str
+    rank: float
+
+
+def _clean(text):
+    return text.replace(MARK_START, ' ').replace(MARK_END, ' ')
+
+
+def _project_document(project):
+    technologies = ' '.join(skill.name for skill in project.technologies.all())
+    body = ' '.join([project.short_description, project.description, technologies])
+    return project.title, body, reverse('project_detail', args=[project.pk])
+
+
+def _blog_document(blog):
+    tags = ' '.join(tag.name for tag in blog.tags.all())
+    return blog.title, f'{blog.description} {tags}', blog.url
+
+
+def _skill_document(skill):
+    body = f'{skill.category} {skill.get_proficiency_display()}'
+    return skill.name, body, reverse('home') + '#skills'
+
+
+def _experience_document(experience):
+    technologies = ' '.join(skill.name for skill in experience.technologies_used.all())
+    title = f'{experience.title} at {experience.organization}'
+    body = ' '.join([experience.description, experience.location, technologies])
+    return title, body, reverse('home') + '#experience'
+
+
+# kind -> (queryset factory, document builder)
+INDEXED_KINDS = {
+    'project': (lambda: Project.objects.prefetch_related('technologies'), _project_document),
+    'blog': (lambda: Blog.objects.prefetch_related('tags'), _blog_document),
+    'skill': (lambda: Skill.objects.all(), _skill_document),
+    'experience': (lambda: Experience.objects.prefetch_related('technologies_used'), _experience_document),
+}
+
+KIND_BY_MODEL = {Project: 'project', Blog: 'blog', Skill: 'skill', Experience: 'experience'}
+
+
+def reindex(kind, pks=None, batch_size=500):
+    """
+    Rebuild the documents of ``kind`` for the given primary keys (all rows
+    when None) and drop documents whose object no longer exists.
+    """
+    queryset_factory, build = INDEXED_KINDS[kind]
+    queryset = queryset_factory()
+    if pks is not None:
+        pks = list(pks)
+        if not pks:
+            return 0
+        queryset = queryset.filter(pk__in=pks)
+
+    documents = []
+    for obj in queryset.iterator(chunk_size=batch_size):
+        title, body, url = build(obj)
+        documents.append(SearchDocument(
+            kind=kind, object_id=obj.pk, title=_clean(title)[:300], body=_clean(body), url=url[:500],
+        ))
+    SearchDocument.objects.bulk_create(
+        documents, batch_size=batch_size,
+        update_conflicts=True, unique_fields=['kind', 'object_id'], update_fields=['title', 'body', 'url'],
+    )
+
+    existing = SearchDocument.objects.filter(kind=kind)
+    if pks is not None:
+        existing = existing.filter(object_id__in=pks)
+    stale = set(existing.values_list('object_id', flat=True))
+    stale.difference_update(document.object_id for document in documents)
+    stale = list(stale)
+    for start in range(0, len(stale), batch_size):
+        SearchDocument.objects.filter(kind=kind, object_id__in=stale[start:start + batch_size]).delete()
+    return len(documents)
+
+
+def optimize_index():
+    """Merge index segments / refresh statistics after a bulk load"""
+    statements = {
+        'sqlite': [
+            f"INSERT INTO {table}({table}) VALUES ('optimize')"
+            for table in ['pages_searchdocument_fts', 'pages_searchdocument_title_fts']
+        ],
+        'postgresql': ['ANALYZE pages_searchdocument'],
+    }.get(connection.vendor, [])
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def remove(kind, pk):
+    SearchDocument.objects.filter(kind=kind, object_id=pk).delete()
+
+
+def search_terms(query):
+    return TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def _highlight(snippet):
+    return mark_safe(
+        escape(snippet).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+    )
+
+
+def _best(cursor, sql, params, limit, exclude=()):
+    """The ``limit`` highest scoring ``(id, score)`` rows of ``sql``, skipping ``exclude``"""
+    cursor.execute(sql, params)
+    return heapq.nlargest(limit, (row for row in cursor if row[0] not in exclude), key=itemgetter(1))
+
+
+def _title_first(cursor, title_sql, title_params, body_sql, body_params, limit):
+    """
+    Rank title matches, then fill any remaining places from body matches.
+    Each tier scores only the newest ``SEARCH_CANDIDATES`` documents it
+    matches, so a query costs the same whether a term is rare or in every
+    document. Titles are short, so their matches are few and an old post
+    named after the query still comes first however many newer posts only
+    mention it.
+    """
+    found = _best(cursor, title_sql, title_params, limit)
+    if len(found) < limit:
+        seen = {pk for pk, _ in found}
+        found += _best(cursor, body_sql, body_params, limit - len(found), seen)
+    return found
+
+
+def _sqlite_search(terms, limit):
+    # Quote every term so user input can't use FTS5 query syntax
+    match = ' '.join(f'"{term}"' for term in terms)
+    newest = """
+        SELECT rowid, -bm25({table}{weights}) FROM {table}
+        WHERE {table} MATCH %s
+        ORDER BY rowid DESC
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        found = _title_first(
+            cursor,
+            newest.format(table='pages_searchdocument_title_fts', weights=''), [match, SEARCH_CANDIDATES],
+            newest.format(table='pages_searchdocument_fts', weights=', 10.0, 1.0'), [match, SEARCH_CANDIDATES],
+            limit,
+        )
+        if not found:
+            return []
+        # Snippets only for the rows that are returned
+        cursor.execute(f"""
+            SELECT d.id, d.kind, d.object_id, d.title, d.url,
+                   snippet(pages_searchdocument_fts, 1, char(2), char(3), '…', {SNIPPET_WORDS})
+            FROM pages_searchdocument_fts
+            CROSS JOIN pages_searchdocument d ON d.id = pages_searchdocument_fts.rowid
+            WHERE pages_searchdocument_fts MATCH %s
+              AND pages_searchdocument_fts.rowid IN ({', '.join(['%s'] * len(found))})
+        """, [match, *(pk for pk, _ in found)])
+        rows = {row[0]: row[1:] for row in cursor}
+    # bm25 is "lower is better"; it was negated so every backend ranks descending
+    return [(*rows[pk], score) for pk, score in found if pk in rows]
+
+
+def _postgres_search(terms, limit):
+    tsquery = ' & '.join(terms)
+    options = f'StartSel={MARK_START}, StopSel={MARK_END}, MaxWords={SNIPPET_WORDS}, MinWords=8'
+    newest = """
+        SELECT id, ts_rank(search_vector, query)
+        FROM (
+            SELECT id, search_vector
+            FROM pages_searchdocument
+            WHERE search_vector @@ to_tsquery('english', %s)
+            ORDER BY id DESC
+            LIMIT %s
+        ) AS newest, to_tsquery('english', %s) AS query
+    """
+    # Titles carry weight A in search_vector
+    title_tsquery = ' & '.join(f'{term}:A' for term in terms)
+    with connection.cursor() as cursor:
+        found = _title_first(
+            cursor,
+            newest, [title_tsquery, SEARCH_CANDIDATES, tsquery],
+            newest, [tsquery, SEARCH_CANDIDATES, tsquery],
+            limit,
+        )
+        if not found:
+            return []
+        cursor.execute("""
+            SELECT id, kind, object_id, title, url,
+                   ts_headline('english', body, to_tsquery('english', %s), %s)
+            FROM pages_searchdocument
+            WHERE id = ANY(%s)
+        """, [tsquery, options, [pk for pk, _ in found]])
+        rows = {row[0]: row[1:] for row in cursor}
+    return [(*rows[pk], score) for pk, score in found if pk in rows]
+
+
+def _fallback_filter(terms):
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(body__icontains=term)
+    return condition
+
+
+def _fallback_search(terms, limit):
+    documents = SearchDocument.objects.filter(_fallback_filter(terms))
+    return [
+        (doc.kind, doc.object_id, doc.title, doc.url,
+         Truncator(doc.body).words(SNIPPET_WORDS), 0.0)
+        for doc in documents[:limit]
+    ]
+
+
+def search(query, limit=20):
+    """Ranked ``SearchResult`` list for a free-text query"""
+    terms = search_terms(query)
+    if not terms:
+        return []
+    backend = {
+        'sqlite': _sqlite_search,
+        'postgresql': _postgres_search,
+    }.get(connection.vendor, _fallback_search)
+    return [
+        SearchResult(kind, pk, title, url, _highlight(snippet or ''), rank)
+        for kind, pk, title, url, snippet, rank in backend(terms, limit)
+    ]
+
+
+def matching_ids(kind, query):
+    """Unranked primary keys of every ``kind`` object matching ``query`` (for the admin)"""
+    terms = search_terms(query)
+    if not terms:
+        return []
+    if connection.vendor == 'sqlite':
+        sql = """
+            SELECT d.object_id FROM pages_searchdocument_fts
+            CROSS JOIN pages_searchdocument d ON d.id = pages_searchdocument_fts.rowid
+            WHERE pages_searchdocument_fts MATCH %s AND d.kind = %s
+        """
+        params = [' '.join(f'"{term}"' for term in terms), kind]
+    elif connection.vendor == 'postgresql':
+        sql = """
+            SELECT object_id FROM pages_searchdocument
+            WHERE search_vector @@ to_tsquery('english', %s) AND kind = %s
+        """
+        params = [' & '.join(terms), kind]
+    else:
+        documents = SearchDocument.objects.filter(_fallback_filter(terms), kind=kind)
+        return list(documents.values_list('object_id', flat=True))
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor]
@@ -0,0 +1,151 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import related, search
+from .cache import bump_content_generation
+from .models import (
+    Blog, Contact, Experience, Project, ProjectImage, RelatedProject, SearchDocument, Skill,
+    SyncState, Tag,
+)
+
+# Models whose rows never appear on public pages. Contact in particular is
+# written by anonymous visitors and must not be able to flush the cache.
+NON_CONTENT_MODELS = (Contact, SyncState, SearchDocument, RelatedProject)
+
+
+def is_content_model(model):
+    return model._meta.app_label == 'pages' and not issubclass(model, NON_CONTENT_MODELS)
+
+
+@receiver(post_save, sender=ProjectImage)
+@receiver(post_delete, sender=ProjectImage)
+def refresh_project_primary_image(sender, instance, **kwargs):
+    """Keep Project.primary_image* in step with the project's images"""
+    with transaction.atomic():
+        Project.objects.filter(pk=instance.project_id).refresh_primary_images()
+
+
+def invalidate_on_content_change(sender, **kwargs):
+    transaction.on_commit(bump_content_generation)
+
+
+def has_updated_at(model):
+    return any(field.name == 'updated_at' for field in model._meta.concrete_fields)
+
+
+@receiver(m2m_changed)
+def invalidate_on_relation_change(sender, instance, action, model, pk_set, **kwargs):
+    if not action.startswith('post_') or not is_content_model(type(instance)):
+        return
+    # A relation change alters both sides, so refresh their validators too
+    now = timezone.now()
+    if has_updated_at(type(instance)):
+        type(instance).objects.filter(pk=instance.pk).update(updated_at=now)
+    if pk_set and has_updated_at(model):
+        model.objects.filter(pk__in=pk_set).update(updated_at=now)
+    transaction.on_commit(bump_content_generation)
+
+
+@receiver(post_save, sender=Skill)
+def touch_projects_using_skill(sender, instance, created, **kwargs):
+    """Project pages show technology names, so a renamed skill changes them"""
+    if not created:
+        Project.objects.filter(technologies=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Tag)
+def touch_blogs_with_tag(sender, instance, created, raw=False, **kwargs):
+    """Blog lists show tag names and slugs, so a renamed tag changes them"""
+    if not (created or raw):
+        Blog.objects.filter(tags=instance).update(updated_at=timezone.now())
+
+
+@receiver(pre_delete, sender=Tag)
+def touch_blogs_losing_tag(sender, instance, **kwargs):
+    # The through rows go in a cascade that doesn't send m2m_changed
+    Blog.objects.filter(tags=instance).update(updated_at=timezone.now())
+
+
+def index_for_search(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.reindex(search.KIND_BY_MODEL[sender], [instance.pk])
+
+
+def remove_from_search(sender, instance, **kwargs):
+    search.remove(search.KIND_BY_MODEL[sender], instance.pk)
+
+
+@receiver(m2m_changed, sender=Project.technologies.through)
+@receiver(m2m_changed, sender=Experience.technologies_used.through)
+@receiver(m2m_changed, sender=Blog.tags.through)
+def reindex_on_relation_change(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """Documents include technology and tag names"""
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        search.reindex(search.KIND_BY_MODEL[type(instance)], [instance.pk])
+    elif pk_set is None:
+        # skill.projects.clear() doesn't say which rows it touched
+        search.reindex(search.KIND_BY_MODEL[model])
+    else:
+        search.reindex(search.KIND_BY_MODEL[model], pk_set)
+
+
+@receiver(post_save, sender=Tag)
+def reindex_blogs_with_tag(sender, instance, created, raw=False, **kwargs):
+    if not (created or raw):
+        search.reindex('blog', Blog.objects.filter(tags=instance).values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Skill)
+def reindex_users_of_skill(sender, instance, created, raw=False, **kwargs):
+    if created or raw:
+        return
+    search.reindex('project', Project.objects.filter(technologies=instance).values_list('pk', flat=True))
+    search.reindex('experience', Experience.objects.filter(technologies_used=instance).values_list('pk', flat=True))
+
+
+@receiver(m2m_changed, sender=Project.technologies.through)
+def update_related_on_technology_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        related.update_related_projects(instance.pk)
+    elif pk_set is None:
+        related.rebuild_related_projects()
+    else:
+        for pk in pk_set:
+            related.update_related_projects(pk)
+
+
+@receiver(pre_delete, sender=Project)
+def remember_related_referrers(sender, instance, **kwargs):
+    instance._related_referrers = list(
+        RelatedProject.objects.filter(related=instance).values_list('project_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Project)
+def refill_related_after_delete(sender, instance, **kwargs):
+    related.forget_project(getattr(instance, '_related_referrers', []))
+
+
+@receiver(post_delete, sender=Skill)
+def rebuild_related_after_skill_delete(sender, instance, **kwargs):
+    # The through rows go in a cascade that doesn't send m2m_changed
+    transaction.on_commit(related.rebuild_related_projects)
+
+
+# Connected per model rather than for every sender: a model with no
+# listeners (RelatedProject, SearchDocument) is deleted with a single DELETE
+# instead of being fetched and signalled row by row.
+for model in apps.get_app_config('pages').get_models():
+    if is_content_model(model):
+        post_save.connect(invalidate_on_content_change, sender=model)
+        post_delete.connect(invalidate_on_content_change, sender=model)
+for model in search.KIND_BY_MODEL:
+    post_save.connect(index_for_search, sender=model)
+    post_delete.connect(remove_from_search, sender=model)
@@ -0,0 +1,351 @@
+"""
+In-process snapshot of the read-mostly portfolio content.
+
+The homepage, about and contact pages only show content the owner edits in
+the admin. ``get_snapshot()`` loads all of it in a fixed number of queries
+into frozen, slotted dataclasses and keeps the result in memory until the
+content generation changes (see ``pages.cache``) or it is older than
+``PAGE_CACHE_TIMEOUT``. The age limit covers per-process caches (locmem),
+where an edit saved by another worker or instance never moves this
+process's generation. Rebuilds happen under a
+lock and replace the module-level reference in one assignment, so readers
+always see either the old or the new snapshot, never a mix.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Optional
+
+from django.conf import settings
+
+from .aio import gather_sync
+from .cache import get_content_generation
+from .models import (
+    Blog, Certification, Education, Experience, Profile, Project, SiteSettings, Skill,
+)
+
+FEATURED_PROJECTS = 3
+FEATURED_BLOGS = 3
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileData:
+    name: str
+    title: str
+    description: str
+    email: str
+    phone: str
+    location: str
+    github_url: str
+    linkedin_url: str
+    twitter_url: str
+    resume_url: str
+    profile_image: Any
+
+
+@dataclass(frozen=True, slots=True)
+class SiteSettingsData:
+    site_title: str
+    site_description: str
+    footer_text: str
+    analytics_code: str
+    favicon: Any
+    logo: Any
+
+
+@dataclass(frozen=True, slots=True)
+class SkillData:
+    id: int
+    name: str
+    category: str
+    proficiency: str
+    proficiency_display: str
+    icon: str
+
+
+@dataclass(frozen=True, slots=True)
+class EducationData:
+    institution: str
+    degree: str
+    field_of_study: str
+    start_date: Any
+    end_date: Any
+    is_current: bool
+    description: str
+    activities: str
+    grade: str
+
+
+@dataclass(frozen=True, slots=True)
+class ExperienceData:
+    title: str
+    organization: str
+    location: str
+    start_date: Any
+    end_date: Any
+    is_current: bool
+    experience_type: str
+    experience_type_display: str
+    description: str
+    technologies: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class CertificationData:
+    name: str
+    issuer: str
+    issue_date: Any
+    expiry_date: Any
+    credential_id: str
+    credential_url: str
+    badge_image: Any
+
+
+@dataclass(frozen=True, slots=True)
+class ProjectCardData:
+    id: int
+    title: str
+    short_description: str
+    github_url: str
+    demo_url: str
+    is_featured: bool
+    card_image: Any
+    primary_image_width: Optional[int]
+    primary_image_height: Optional[int]
+    technologies: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class TagData:
+    name: str
+    slug: str
+
+
+@dataclass(frozen=True, slots=True)
+class BlogCardData:
+    id: int
+    title: str
+    description: str
+    url: str
+    published_date: Any
+    image: Any
+    is_featured: bool
+    tags: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class PortfolioSnapshot:
+    generation: Any
+    built_at: float
+    build_seconds: float
+    query_count: int
+    profile: Optional[ProfileData]
+    site_settings: Optional[SiteSettingsData]
+    skills: tuple
+    skills_by_category: MappingProxyType
+    education: tuple
+    experience: tuple
+    certifications: tuple
+    featured_projects: tuple
+    featured_blogs: tuple
+
+
+def _fields(instance, data_class, **overrides):
+    values = {name: getattr(instance, name) for name in data_class.__slots__ if name not in overrides}
+    values.update(overrides)
+    return data_class(**values)
+
+
+def _through_rows(through, owner_field, owner_ids):
+    """``[(owner_id, skill_id)]`` from one query on an M2M through table"""
+    if not owner_ids:
+        return []
+    return list(through.objects.filter(**{f'{owner_field}__in': owner_ids}).values_list(owner_field, 'skill_id'))
+
+
+def _relation_map(rows, skills_by_id):
+    """owner id -> tuple of SkillData"""
+    related = {}
+    for owner_id, skill_id in rows:
+        skill = skills_by_id.get(skill_id)
+        if skill is not None:
+            related.setdefault(owner_id, []).append(skill)
+    # Keep the skill display order regardless of insertion order
+    order = {skill_id: position for position, skill_id in enumerate(skills_by_id)}
+    return {
+        owner_id: tuple(sorted(skills, key=lambda skill: order[skill.id]))
+        for owner_id, skills in related.items()
+    }
+
+
+# Each section loader runs its own queries and needs nothing from the
+# others, so the async views can run them concurrently (see pages.aio).
+# They return ``(query_count, data)``; ``_assemble`` joins the results.
+
+def _load_profile():
+    return 1, Profile.objects.order_by('pk').first()
+
+
+def _load_site_settings():
+    return 1, SiteSettings.objects.order_by('pk').first()
+
+
+def _load_skills():
+    return 1, tuple(
+        _fields(skill, SkillData, proficiency_display=skill.get_proficiency_display())
+        for skill in Skill.objects.all()
+    )
+
+
+def _load_education():
+    return 1, tuple(_fields(edu, EducationData) for edu in Education.objects.all())
+
+
+def _load_experience():
+    experiences = list(Experience.objects.all())
+    rows = _through_rows(
+        Experience.technologies_used.through, 'experience_id', [exp.pk for exp in experiences],
+    )
+    return 1 + bool(experiences), (experiences, rows)
+
+
+def _load_certifications():
+    return 1, tuple(_fields(cert, CertificationData) for cert in Certification.objects.all())
+
+
+def _load_featured_projects():
+    projects = list(Project.objects.filter(is_featured=True)[:FEATURED_PROJECTS])
+    rows = _through_rows(Project.technologies.through, 'project_id', [p.pk for p in projects])
+    return 1 + bool(projects), (projects, rows)
+
+
+def _load_featured_blogs():
+    blogs = list(Blog.objects.filter(is_featured=True)[:FEATURED_BLOGS])
+    blog_tags = {}
+    if blogs:
+        rows = (
+            Blog.tags.through.objects.filter(blog_id__in=[blog.pk for blog in blogs])
+            .order_by('tag__name').values_list('blog_id', 'tag__name', 'tag__slug')
+        )
+        for blog_id, name, slug in rows:
+            blog_tags.setdefault(blog_id, []).append(TagData(name, slug))
+    return 1 + bool(blogs), tuple(
+        _fields(blog, BlogCardData, tags=tuple(blog_tags.get(blog.pk, ())))
+        for blog in blogs
+    )
+
+
+SECTION_LOADERS = (
+    _load_profile, _load_site_settings, _load_skills, _load_education,
+    _load_experience, _load_certifications, _load_featured_projects, _load_featured_blogs,
+)
+
+
+def _assemble(sections, generation, start):
+    queries = sum(count for count, _ in sections)
+    (profile, site_settings, skills, education, (experiences, experience_rows),
+     certifications, (projects, project_rows), featured_blogs) = [data for _, data in sections]
+
+    skills_by_id = {skill.id: skill for skill in skills}
+    skills_by_category = {}
+    for skill in skills:
+        skills_by_category.setdefault(skill.category, []).append(skill)
+
+    experience_skills = _relation_map(experience_rows, skills_by_id)
+    experience = tuple(
+        _fields(
+            exp, ExperienceData,
+            experience_type_display=exp.get_experience_type_display(),
+            technologies=experience_skills.get(exp.pk, ()),
+        )
+        for exp in experiences
+    )
+    project_skills = _relation_map(project_rows, skills_by_id)
+    featured_projects = tuple(
+        _fields(project, ProjectCardData, technologies=project_skills.get(project.pk, ()))
+        for project in projects
+    )
+
+    return PortfolioSnapshot(
+        generation=generation,
+        built_at=time.time(),
+        build_seconds=time.perf_counter() - start,
+        query_count=queries,
+        profile=_fields(profile, ProfileData) if profile else None,
+        site_settings=_fields(site_settings, SiteSettingsData) if site_settings else None,
+        skills=skills,
+        skills_by_category=MappingProxyType({
+            category: tuple(members) for category, members in skills_by_category.items()
+        }),
+        education=education,
+        experience=experience,
+        certifications=certifications,
+        featured_projects=featured_projects,
+        featured_blogs=featured_blogs,
+    )
+
+
+def build_snapshot(generation=None):
+    """Load every section in a fixed number of queries (at most eleven)"""
+    start = time.perf_counter()
+    return _assemble([load() for load in SECTION_LOADERS], generation, start)
+
+
+async def abuild_snapshot(generation=None):
+    """``build_snapshot`` with the sections loaded concurrently"""
+    start = time.perf_counter()
+    return _assemble(await gather_sync(*SECTION_LOADERS), generation, start)
+
+
+_snapshot = None
+_build_lock = threading.Lock()
+
+
+def _is_current(snapshot, generation):
+    return (
+        snapshot is not None
+        and snapshot.generation == generation
+        and time.time() - snapshot.built_at < settings.PAGE_CACHE_TIMEOUT
+    )
+
+
+def get_snapshot():
+    """The current snapshot, rebuilt when the content generation moves or it expires"""
+    global _snapshot
+
+    generation = get_content_generation()
+    if generation is None:
+        # No shared cache (DummyCache): nothing tells us when to rebuild
+        return build_snapshot()
+
+    snapshot = _snapshot
+    if _is_current(snapshot, generation):
+        return snapshot
+
+    with _build_lock:
+        # Another thread may have rebuilt it while we waited
+        snapshot = _snapshot
+        if not _is_current(snapshot, generation):
+            snapshot = build_snapshot(generation)
+            _snapshot = snapshot
+    return snapshot
+
+
+async def aget_snapshot():
+    """``get_snapshot`` for async views: a rebuild loads its sections concurrently"""
+    global _snapshot
+
+    generation = get_content_generation()
+    if generation is None:
+        return await abuild_snapshot()
+
+    snapshot = _snapshot
+    if _is_current(snapshot, generation):
+        return snapshot
+
+    # No lock: overlapping rebuilds only waste work. A snapshot that lost a
+    # race to a newer generation is replaced on the next request.
+    snapshot = await abuild_snapshot(generation)
+    _snapshot = snapshot
+    return snapshot
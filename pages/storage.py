@@ -0,0 +1,145 @@
+"""
+Static files storage that also ships resized WebP (and AVIF, when Pillow
+can write it) variants of the raster images under ``static/images/``.
+
+Variants are made during ``collectstatic`` before files are hashed, so they
+get hashed names and manifest entries like any other file. The manifest
+also records each source's size and variants under ``"images"``, which is
+what ``{% picture %}`` reads. Encoded variants are cached by source hash
+in ``STATIC_IMAGE_CACHE_DIR``, so unchanged images cost nothing on the
+next build even though ``collectstatic --clear`` empties STATIC_ROOT.
+"""
+import hashlib
+import io
+import json
+import os
+import posixpath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+SOURCE_PREFIX = 'images/'
+SOURCE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+# Smaller files (icons, logos) aren't worth a <picture>
+MIN_SOURCE_BYTES = 32 * 1024
+VARIANT_WIDTHS = (320, 640, 960, 1280)
+# Best first: {% picture %} emits <source> elements in this order
+VARIANT_FORMATS = {
+    'avif': {'quality': 50},
+    'webp': {'quality': 80, 'method': 6},
+}
+# Bump to regenerate every cached variant after changing the settings above
+PIPELINE_VERSION = '1'
+
+EXIF_ORIENTATION = 0x0112
+# Orientations that swap width and height once applied
+ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+# PIL is imported where images are processed, during collectstatic: at run
+# time this storage only resolves {% static %} names and shouldn't pay for it.
+
+def supported_formats():
+    from PIL import Image
+
+    Image.init()
+    return [fmt for fmt in VARIANT_FORMATS if fmt.upper() in Image.SAVE]
+
+
+def variant_name(name, width, fmt):
+    root, _ = posixpath.splitext(name)
+    return f'{root}.w{width}.{fmt}'
+
+
+def encode_variant(source, width, fmt):
+    from PIL import Image
+
+    image = source.resize((width, round(source.height * width / source.width)), Image.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, fmt.upper(), **VARIANT_FORMATS[fmt])
+    return buffer.getvalue()
+
+
+class OptimizedStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    def load_manifest(self):
+        self.image_variants = {}
+        content = self.read_manifest()
+        if content:
+            try:
+                self.image_variants = json.loads(content).get('images', {})
+            except ValueError:
+                pass  # the base class reports a broken manifest
+        return super().load_manifest()
+
+    def save_manifest(self):
+        super().save_manifest()
+        with self.manifest_storage.open(self.manifest_name) as manifest:
+            payload = json.loads(manifest.read().decode())
+        payload['images'] = self.image_variants
+        self.manifest_storage.delete(self.manifest_name)
+        self.manifest_storage._save(self.manifest_name, ContentFile(json.dumps(payload).encode()))
+
+    def post_process(self, paths, dry_run=False, **options):
+        self.image_variants = {}
+        if not dry_run:
+            yield from self.make_image_variants(paths)
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+    def is_variant_source(self, name, storage, path):
+        return (
+            name.startswith(SOURCE_PREFIX)
+            and name.lower().endswith(SOURCE_EXTENSIONS)
+            and storage.size(path) >= MIN_SOURCE_BYTES
+        )
+
+    def make_image_variants(self, paths):
+        """Add variant files to ``paths`` so the manifest pass hashes them too"""
+        from PIL import Image, ImageOps
+
+        formats = supported_formats()
+        cache_dir = getattr(settings, 'STATIC_IMAGE_CACHE_DIR', None)
+        for name, (storage, path) in sorted(paths.items()):
+            if not self.is_variant_source(name, storage, path):
+                continue
+            with storage.open(path) as handle:
+                data = handle.read()
+            digest = hashlib.sha256(data + PIPELINE_VERSION.encode()).hexdigest()[:16]
+            # Only the header is read unless a variant has to be encoded
+            original = Image.open(io.BytesIO(data))
+            source_width, source_height = original.size
+            if original.getexif().get(EXIF_ORIENTATION, 1) in ROTATED_ORIENTATIONS:
+                source_width, source_height = source_height, source_width
+            source = None
+
+            widths = [width for width in VARIANT_WIDTHS if width < source_width]
+            if len(widths) < len(VARIANT_WIDTHS):
+                widths.append(source_width)
+            variants = []
+            for fmt in formats:
+                for width in widths:
+                    encoded = None
+                    cached = cache_dir and os.path.join(cache_dir, f'{digest}.w{width}.{fmt}')
+                    if cached and os.path.exists(cached):
+                        with open(cached, 'rb') as handle:
+                            encoded = handle.read()
+                    if encoded is None:
+                        if source is None:
+                            source = ImageOps.exif_transpose(original)
+                        encoded = encode_variant(source, width, fmt)
+                        if cached:
+                            os.makedirs(cache_dir, exist_ok=True)
+                            with open(cached, 'wb') as handle:
+                                handle.write(encoded)
+
+                    target = variant_name(name, width, fmt)
+                    if self.exists(target):
+                        self.delete(target)
+                    self._save(target, ContentFile(encoded))
+                    paths[target] = (self, target)
+                    variants.append([fmt, width, target])
+                    yield name, target, True
+
+            self.image_variants[name] = {
+                'width': source_width, 'height': source_height, 'variants': variants,
+            }
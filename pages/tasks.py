@@ -0,0 +1,205 @@
+"""
+Background jobs for the pages app.
+
+Anything that talks to the network (the Medium RSS sync, contact
+notification emails) runs on a single in-process worker thread instead of
+the request path. Views only enqueue
+work; the worker coalesces duplicate jobs and a database-backed lock in
+``SyncState`` makes sure only one process syncs at a time.
+"""
+import logging
+import queue
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import close_old_connections, connections
+from django.utils import timezone
+
+from .models import SyncState
+from .utils import fetch_medium_blogs
+
+logger = logging.getLogger(__name__)
+
+MEDIUM_SYNC_JOB = 'medium-sync'
+CONTACT_NOTIFY_JOB = 'contact-notify'
+
+
+class BackgroundQueue:
+    """
+    A single daemon worker thread draining a FIFO of callables.
+
+    Jobs are keyed; enqueuing a key that is already waiting is a no-op, so a
+    burst of requests results in one job. The thread is started lazily on the
+    first enqueue, which keeps management commands and tests thread-free.
+    """
+
+    def __init__(self, name, idle_callback=None, idle_interval=None):
+        self.name = name
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._idle_callback = idle_callback
+        self._idle_interval = idle_interval
+
+    def enqueue(self, key, func, *args, **kwargs):
+        """Queue ``func`` unless a job with the same key is already waiting"""
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+            self._ensure_worker()
+        self._queue.put((key, func, args, kwargs))
+        return True
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name=f'pages-{self.name}', daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            timeout = self._idle_interval() if self._idle_interval else None
+            try:
+                key, func, args, kwargs = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                if self._idle_callback:
+                    self._idle_callback()
+                continue
+
+            with self._lock:
+                self._pending.discard(key)
+            close_old_connections()
+            try:
+                func(*args, **kwargs)
+            except Exception:
+                logger.exception('Background job %s failed', key)
+            finally:
+                # Worker threads own their connections; never leak them.
+                connections.close_all()
+                self._queue.task_done()
+
+    def join(self):
+        """Block until every queued job has run (used by tests)"""
+        self._queue.join()
+
+
+def acquire_sync_lock(name, timeout):
+    """
+    Take the cross-process lock for ``name``.
+
+    The lock is a single conditional UPDATE, so it works the same on SQLite
+    and Postgres and across gunicorn workers or serverless instances. A lock
+    whose holder died is reclaimed once ``locked_until`` has passed.
+    """
+    SyncState.objects.get_or_create(name=name)
+    now = timezone.now()
+    acquired = SyncState.objects.filter(name=name).exclude(
+        locked_until__gt=now
+    ).update(
+        locked_until=now + timedelta(seconds=timeout),
+        last_started_at=now,
+    )
+    return acquired == 1
+
+
+def release_sync_lock(name, success, message):
+    """Release the lock for ``name`` and record the outcome"""
+    SyncState.objects.filter(name=name).update(
+        locked_until=None,
+        last_finished_at=timezone.now(),
+        last_success=success,
+        last_message=message,
+    )
+
+
+def medium_sync_is_fresh():
+    """True when some process finished a sync within MEDIUM_SYNC_INTERVAL"""
+    cutoff = timezone.now() - timedelta(seconds=settings.MEDIUM_SYNC_INTERVAL)
+    return SyncState.objects.filter(
+        name=MEDIUM_SYNC_JOB, last_finished_at__gte=cutoff
+    ).exists()
+
+
+def run_medium_sync(force=False):
+    """
+    Sync Medium blogs if they are stale and no other process is syncing.
+
+    Returns ``(success, message)`` like ``fetch_medium_blogs``.
+    """
+    if not force and medium_sync_is_fresh():
+        return True, "Medium blogs are already up to date"
+
+    if not acquire_sync_lock(MEDIUM_SYNC_JOB, settings.MEDIUM_SYNC_LOCK_TIMEOUT):
+        return False, "Another worker is already syncing Medium blogs"
+
+    success, message = False, "Sync interrupted"
+    try:
+        success, message = fetch_medium_blogs()
+    finally:
+        release_sync_lock(MEDIUM_SYNC_JOB, success, message)
+    return success, message
+
+
+_last_scheduled = None
+_schedule_lock = threading.Lock()
+
+
+def _sync_interval():
+    return max(settings.MEDIUM_SYNC_INTERVAL, 1)
+
+
+def schedule_medium_sync(force=False):
+    """
+    Stale-while-revalidate entry point for views.
+
+    Never blocks on the network: it only enqueues a background sync, and at
+    most once per MEDIUM_SYNC_INTERVAL per process unless ``force`` is set.
+    Whether the sync actually runs is decided by the worker against the
+    shared ``SyncState`` row. Returns True when a job was queued.
+    """
+    global _last_scheduled
+
+    if not settings.MEDIUM_SYNC_ENABLED:
+        return False
+
+    now = time.monotonic()
+    with _schedule_lock:
+        if (not force and _last_scheduled is not None
+                and now - _last_scheduled < _sync_interval()):
+            return False
+        _last_scheduled = now
+
+    return background_queue.enqueue(MEDIUM_SYNC_JOB, run_medium_sync, force=force)
+
+
+background_queue = BackgroundQueue(
+    'background',
+    idle_callback=schedule_medium_sync,
+    idle_interval=_sync_interval,
+)
+
+
+def notify_owner_of_contact(name, email, subject, message):
+    """Email a contact message to CONTACT_NOTIFY_EMAIL, replying to the sender"""
+    EmailMessage(
+        subject=f"Portfolio contact: {' '.join(subject.split())}",
+        body=f'From: {name} <{email}>\n\n{message}',
+        to=[settings.CONTACT_NOTIFY_EMAIL],
+        reply_to=[email],
+    ).send()
+
+
+def schedule_contact_notification(contact):
+    """Queue the owner's email for a saved ``Contact``; False when notifications are off"""
+    if not settings.CONTACT_NOTIFY_EMAIL:
+        return False
+    return background_queue.enqueue(
+        f'{CONTACT_NOTIFY_JOB}:{contact.pk}', notify_owner_of_contact,
+        contact.name, contact.email, contact.subject, contact.message,
+    )
@@ -1,17 +0,0 @@
-from django import template
-
-register = template.Library()
-
-@register.filter
-def split(value, arg):
-    """Split a string by the given separator"""
-    if value:
-        return value.split(arg)
-    return []
-
-@register.filter
-def strip(value):
-    """Strip whitespace from a string"""
-    if value:
-        return value.strip()
-    return value
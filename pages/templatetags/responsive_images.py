@@ -0,0 +1,128 @@
+"""
+Responsive image tags: ``{% responsive_image %}`` for Cloudinary images and
+``{% picture %}`` for local static images.
+
+``{% responsive_image image 'card' alt=project.title %}`` renders an image
+with a ``srcset`` of width-bounded ``f_auto,q_auto`` transforms, a ``sizes``
+hint for the usage, explicit width/height (so the layout doesn't shift) and
+lazy, async decoding. When the original's dimensions are known the image is
+only ever scaled down; otherwise it is cropped to the usage's aspect ratio,
+which is how the stylesheets display it anyway (``object-fit: cover``).
+
+Cloudinary URL building is pure string work but not free, so the markup
+for each (image, usage, size) is memoized for the life of the process.
+
+``{% picture 'images/bip.png' 'hero' alt=... %}`` uses the WebP/AVIF
+variants that ``pages.storage`` records in the staticfiles manifest, and
+degrades to a plain ``<img>`` where there are none (DEBUG, tests).
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+
+import cloudinary
+from django import template
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+
+@dataclass(frozen=True, slots=True)
+class Usage:
+    widths: tuple
+    sizes: str
+    aspect_ratio: float  # width / height, used when the original's size is unknown
+    default_width: int
+
+
+USAGES = {
+    'card': Usage((320, 480, 640, 800), '(max-width: 768px) 100vw, 400px', 16 / 10, 480),
+    'gallery': Usage((480, 768, 1024, 1440, 1920), '(max-width: 1024px) 100vw, 1024px', 16 / 10, 1024),
+    'thumbnail': Usage((120, 240), '120px', 1, 120),
+    'hero': Usage((240, 360, 480, 720), '(max-width: 768px) 70vw, 400px', 1, 480),
+    'badge': Usage((80, 120, 160, 240), '80px', 1, 120),
+}
+
+
+def _transform(resource, width, height, usage):
+    options = {'fetch_format': 'auto', 'quality': 'auto', 'width': width}
+    if height is None:
+        options.update(crop='fill', gravity='auto', height=round(width / usage.aspect_ratio))
+    else:
+        options['crop'] = 'limit'
+    return resource.build_url(**options)
+
+
+@lru_cache(maxsize=4096)
+def image_sources(public_id, image_format, version, delivery_type, resource_type, usage_name,
+                  width=None, height=None):
+    """(src, srcset, sizes, width, height) for one image in one usage"""
+    usage = USAGES[usage_name]
+    resource = cloudinary.CloudinaryResource(
+        public_id, format=image_format, version=version, type=delivery_type, resource_type=resource_type,
+    )
+    widths = list(usage.widths)
+    if width and height:
+        # Never ask for an upscale: cap the candidates at the original width
+        smaller = [candidate for candidate in widths if candidate < width]
+        if len(smaller) < len(widths):
+            widths = smaller + [width]
+    else:
+        height = None
+
+    srcset = ', '.join(f'{_transform(resource, candidate, height, usage)} {candidate}w' for candidate in widths)
+    default = min(usage.default_width, widths[-1])
+    if height:
+        rendered_width, rendered_height = default, round(default * height / width)
+    else:
+        rendered_width, rendered_height = default, round(default / usage.aspect_ratio)
+    src = _transform(resource, default, height, usage)
+    return src, srcset, usage.sizes, rendered_width, rendered_height
+
+
+@register.simple_tag
+def responsive_image(image, usage, alt='', width=None, height=None, css_class='', eager=False):
+    """
+    ``<img>`` for a CloudinaryResource. Pass ``width``/``height`` when the
+    original's size is stored (ProjectImage, Project.primary_image_*); set
+    ``eager`` for the largest above-the-fold image.
+    """
+    if not image:
+        return ''
+    src, srcset, sizes, rendered_width, rendered_height = image_sources(
+        image.public_id, image.format, image.version, image.type, image.resource_type,
+        usage, width or None, height or None,
+    )
+    return format_html(
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}"{}{} decoding="async">',
+        src, srcset, sizes, rendered_width, rendered_height, alt,
+        format_html(' class="{}"', css_class) if css_class else '',
+        mark_safe(' fetchpriority="high"' if eager else ' loading="lazy"'),
+    )
+
+
+@register.simple_tag
+def picture(path, usage, alt='', css_class='', eager=False):
+    """``<picture>`` for a static image, with its optimized variants as sources"""
+    usage = USAGES[usage]
+    record = getattr(staticfiles_storage, 'image_variants', {}).get(path)
+    loading = mark_safe(' fetchpriority="high"' if eager else ' loading="lazy"')
+    css = format_html(' class="{}"', css_class) if css_class else ''
+    if not record:
+        return format_html('<img src="{}" alt="{}"{}{} decoding="async">', static(path), alt, css, loading)
+
+    by_format = {}
+    for fmt, width, name in record['variants']:
+        by_format.setdefault(fmt, []).append(f'{staticfiles_storage.url(name)} {width}w')
+    sources = format_html_join(
+        '', '<source type="image/{}" srcset="{}" sizes="{}">',
+        ((fmt, ', '.join(candidates), usage.sizes) for fmt, candidates in by_format.items()),
+    )
+    width = min(usage.default_width, record['width'])
+    height = round(width * record['height'] / record['width'])
+    return format_html(
+        '<picture>{}<img src="{}" width="{}" height="{}" alt="{}"{}{} decoding="async"></picture>',
+        sources, static(path), width, height, alt, css, loading,
+    )
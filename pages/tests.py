@@ -1,3 +1,1206 @@
-from django.test import TestCase
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from dataclasses import FrozenInstanceError
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import cloudinary
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.http import Http404
+from django.template import Context, Template
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import async_views, checks, perf, profiling, related, search, seeding, tasks, views
+from .cache import get_content_generation
+from .feeds import FeedTooLarge, html_to_text, iter_feed_entries, iter_response_chunks
+from .management.commands.bench_views import regressions
+from .models import (
+    Blog, Contact, Experience, Profile, Project, ProjectImage, RelatedProject, SearchDocument, Skill,
+    SyncState, Tag,
+)
+from .pagination import KeysetPaginator
+from .templatetags.responsive_images import image_sources
+from .snapshot import build_snapshot, get_snapshot
+from .utils import blog_content_hash, insert_new_blogs, upsert_medium_blogs
+
+# Tests render templates without running collectstatic first
+PLAIN_STATIC = override_settings(
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage'
+)
+
+NO_CACHE = override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+)
+
+
+def setUpModule():
+    # Image URLs are built offline but Cloudinary insists on a cloud name
+    cloudinary.config(cloud_name='demo')
+
+
+@PLAIN_STATIC
+class MediumSyncTests(TestCase):
+    def setUp(self):
+        tasks._last_scheduled = None
+
+    def test_index_does_not_sync_inline(self):
+        with mock.patch.object(tasks, 'fetch_medium_blogs') as fetch, \
+                mock.patch.object(tasks.background_queue, 'enqueue') as enqueue:
+            response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, 200)
+        fetch.assert_not_called()
+        enqueue.assert_called_once()
+
+    def test_schedule_respects_minimum_interval(self):
+        with mock.patch.object(tasks.background_queue, 'enqueue', return_value=True) as enqueue:
+            self.assertTrue(tasks.schedule_medium_sync())
+            self.assertFalse(tasks.schedule_medium_sync())
+            self.assertTrue(tasks.schedule_medium_sync(force=True))
+        self.assertEqual(enqueue.call_count, 2)
+
+    @override_settings(MEDIUM_SYNC_ENABLED=False)
+    def test_schedule_disabled(self):
+        self.assertFalse(tasks.schedule_medium_sync())
+
+    def test_lock_is_exclusive_until_released(self):
+        self.assertTrue(tasks.acquire_sync_lock('job', 60))
+        self.assertFalse(tasks.acquire_sync_lock('job', 60))
+        tasks.release_sync_lock('job', True, 'done')
+        self.assertTrue(tasks.acquire_sync_lock('job', 60))
+
+    def test_expired_lock_is_reclaimed(self):
+        SyncState.objects.create(
+            name='job', locked_until=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertTrue(tasks.acquire_sync_lock('job', 60))
+
+    def test_run_skips_fresh_feed(self):
+        SyncState.objects.create(name=tasks.MEDIUM_SYNC_JOB, last_finished_at=timezone.now())
+        with mock.patch.object(tasks, 'fetch_medium_blogs') as fetch:
+            success, _ = tasks.run_medium_sync()
+        self.assertTrue(success)
+        fetch.assert_not_called()
+
+    @override_settings(MEDIUM_USERNAME='@me')
+    def test_sync_message_records_fetch_time(self):
+        import requests
+        response = requests.Response()
+        response.status_code, response._content, response._content_consumed = 200, RSS_FEED, True
+        with mock.patch.object(requests, 'get', return_value=response):
+            success, message = tasks.fetch_medium_blogs()
+        self.assertTrue(success)
+        self.assertRegex(message, r'2 new, 0 updated, 0 unchanged \(feed fetched in \d+ ms\)')
+
+    def test_run_records_outcome(self):
+        with mock.patch.object(tasks, 'fetch_medium_blogs', return_value=(True, 'ok')):
+            self.assertEqual(tasks.run_medium_sync(), (True, 'ok'))
+        state = SyncState.objects.get(name=tasks.MEDIUM_SYNC_JOB)
+        self.assertTrue(state.last_success)
+        self.assertIsNone(state.locked_until)
+        self.assertIsNotNone(state.last_finished_at)
+
+
+def make_feed_entry(post_id, title='Post', **overrides):
+    entry = {
+        'title': title,
+        'description': 'Body',
+        'url': f'https://medium.com/@me/{post_id}',
+        'published_date': timezone.now().replace(microsecond=0),
+        'tags': ['python', 'Django'],
+        'medium_post_id': post_id,
+    }
+    entry.update(overrides)
+    entry['content_hash'] = blog_content_hash(entry)
+    return entry
+
+
+def blog_fields(post_id, title='Post', **overrides):
+    """Feed entry as Blog model kwargs (tags live in a separate relation)"""
+    entry = make_feed_entry(post_id, title, **overrides)
+    del entry['tags']
+    return entry
+
+
+class MediumUpsertTests(TestCase):
+    def test_inserts_updates_and_skips_unchanged(self):
+        first = [make_feed_entry('a'), make_feed_entry('b')]
+        self.assertEqual(upsert_medium_blogs(first), {'inserted': 2, 'updated': 0, 'unchanged': 0})
+
+        Blog.objects.filter(medium_post_id='a').update(is_featured=True)
+        second = [first[0], make_feed_entry('b', title='Edited'), make_feed_entry('c')]
+        # Blogs, their tags and their search documents, however many posts
+        with self.assertNumQueries(15):
+            counts = upsert_medium_blogs(second)
+        self.assertEqual(counts, {'inserted': 1, 'updated': 1, 'unchanged': 1})
+
+        edited = Blog.objects.get(medium_post_id='b')
+        self.assertEqual(edited.title, 'Edited')
+        self.assertEqual(sorted(tag.slug for tag in edited.tags.all()), ['django', 'python'])
+        self.assertEqual(Tag.objects.count(), 2)
+        self.assertTrue(Blog.objects.get(medium_post_id='a').is_featured)
+        self.assertEqual(Blog.objects.count(), 3)
+
+    def test_duplicate_post_ids_are_not_inserted_twice(self):
+        upsert_medium_blogs([make_feed_entry('a')])
+        Blog.objects.bulk_create([Blog(**blog_fields('a'))], ignore_conflicts=True)
+        self.assertEqual(Blog.objects.filter(medium_post_id='a').count(), 1)
+
+    def test_posts_inserted_concurrently_are_not_counted(self):
+        # Another sync stored 'a' after this one looked for known posts
+        Blog.objects.create(**blog_fields('a'))
+        inserted = insert_new_blogs([Blog(**blog_fields('a')), Blog(**blog_fields('b'))])
+        self.assertEqual([blog.medium_post_id for blog in inserted], ['b'])
+        self.assertEqual(Blog.objects.count(), 2)
+
+
+RSS_FEED = b"""<?xml version="1.0"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel>
+<item><title>First</title><link>https://medium.com/@me/first-1a2b</link>
+<pubDate>Mon, 01 Jan 2024 10:00:00 GMT</pubDate><category>python</category>
+<content:encoded><![CDATA[<p>Hello <b>world</b></p><script>x()</script>]]></content:encoded></item>
+<item><title>Second</title><link>https://medium.com/@me/second-3c4d</link>
+<pubDate>Tue, 02 Jan 2024 10:00:00 GMT</pubDate><description>Plain</description></item>
+</channel></rss>"""
+
+ATOM_FEED = b"""<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><entry><title>Atom post</title>
+<link rel="alternate" href="https://example.com/atom-post"/><id>urn:1</id>
+<published>2024-01-03T10:00:00+00:00</published><summary>Short &lt;i&gt;summary&lt;/i&gt;</summary>
+<category term="django"/></entry></feed>"""
+
+
+def chunked(data, size=16):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+class FeedParserTests(TestCase):
+    def test_rss_items_stream_out_of_small_chunks(self):
+        entries = list(iter_feed_entries(chunked(RSS_FEED)))
+        self.assertEqual([e['title'] for e in entries], ['First', 'Second'])
+        self.assertEqual(entries[0]['summary'], 'Hello world')
+        self.assertEqual(entries[0]['categories'], ['python'])
+        self.assertEqual(entries[0]['published'].year, 2024)
+        self.assertIsNotNone(entries[0]['published'].tzinfo)
+        self.assertEqual(entries[1]['summary'], 'Plain')
+
+    def test_atom_entries(self):
+        [entry] = iter_feed_entries(chunked(ATOM_FEED))
+        self.assertEqual(entry['link'], 'https://example.com/atom-post')
+        self.assertEqual(entry['summary'], 'Short summary')
+        self.assertEqual(entry['categories'], ['django'])
+
+    def test_html_to_text_truncates_on_word_boundary(self):
+        self.assertEqual(html_to_text('<p>alpha beta gamma</p>', 12), 'alpha beta...')
+        self.assertEqual(html_to_text('a < b', 50), 'a < b')
+
+    def test_size_cap(self):
+        response = mock.Mock(headers={}, iter_content=lambda chunk_size: chunked(RSS_FEED, 64))
+        with self.assertRaises(FeedTooLarge):
+            list(iter_response_chunks(response, max_bytes=100))
+
+
+def create_project(index, featured=True, images=2, skills=()):
+    project = Project.objects.create(
+        title=f'Project {index}',
+        description='Description',
+        short_description='Short',
+        is_featured=featured,
+        date_created=date(2024, 1, 1),
+        order=index,
+    )
+    for position in range(images):
+        ProjectImage.objects.create(
+            project=project,
+            image=f'image/upload/v1/project-{index}-{position}.jpg',
+            is_primary=position == images - 1,
+            order=position,
+        )
+    project.technologies.add(*skills)
+    return project
+
+
+@PLAIN_STATIC
+@NO_CACHE
+@override_settings(MEDIUM_SYNC_ENABLED=False)
+class QueryBudgetTests(TestCase):
+    """Public views must issue a constant number of queries"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.skills = [
+            Skill.objects.create(name=f'Skill {i}', category='Tools', proficiency='advanced')
+            for i in range(4)
+        ]
+
+    def add_content(self, count):
+        start = Project.objects.count()
+        for index in range(start, start + count):
+            create_project(index, skills=self.skills[:2])
+            experience = Experience.objects.create(
+                title='Engineer', organization='Org', start_date=date(2024, 1, 1),
+                experience_type='work', description='Work',
+            )
+            experience.technologies_used.add(*self.skills)
+
+    def add_blogs(self, count):
+        tags = [Tag.objects.get_or_create(name=f'Tag {i}', slug=f'tag-{i}')[0] for i in range(2)]
+        start = Blog.objects.count()
+        for index in range(start, start + count):
+            Blog.objects.create(**blog_fields(f'post-{index}', title=f'Post {index}')).tags.add(*tags)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def assertQueryCount(self, count, url):
+        with self.assertNumQueries(count):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+    def assertFlatQueryCount(self, url_for):
+        self.add_content(2)
+        small = self.count_queries(url_for())
+        self.add_content(6)
+        self.assertQueryCount(small, url_for())
+
+    def test_index(self):
+        self.assertFlatQueryCount(lambda: reverse('home'))
+
+    def test_about(self):
+        self.assertFlatQueryCount(lambda: reverse('about'))
+
+    def test_contact(self):
+        self.assertFlatQueryCount(lambda: reverse('contact'))
+
+    def test_blogs(self):
+        self.add_blogs(1)
+        single = self.count_queries(reverse('blogs'))
+        # Two full pages, every post with tags
+        self.add_blogs(2 * views.BLOGS_PER_PAGE)
+        self.assertQueryCount(single, reverse('blogs'))
+
+    def test_projects(self):
+        self.assertFlatQueryCount(lambda: reverse('projects'))
+
+    def test_project_detail(self):
+        self.assertFlatQueryCount(
+            lambda: reverse('project_detail', args=[Project.objects.first().pk])
+        )
+
+    def test_api_projects(self):
+        self.assertFlatQueryCount(lambda: reverse('api', args=['projects']) + '?limit=100')
+
+    def test_primary_image_from_prefetch(self):
+        project = create_project(99, images=3)
+        project = Project.objects.with_images().get(pk=project.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(project.get_primary_image().order, 2)
+
+    def test_cards_do_not_query_images(self):
+        self.add_content(3)
+        for url in [reverse('home'), reverse('projects')]:
+            with CaptureQueriesContext(connection) as context:
+                self.client.get(url)
+            tables = ' '.join(query['sql'] for query in context.captured_queries)
+            self.assertNotIn('pages_projectimage', tables)
+
+
+class PrimaryImageTests(TestCase):
+    def test_pointer_follows_images(self):
+        project = create_project(1, images=0)
+        self.assertIsNone(project.card_image)
+
+        first = ProjectImage.objects.create(project=project, image='image/upload/v1/a.jpg', order=1)
+        project.refresh_from_db()
+        self.assertEqual(project.primary_image, first)
+        self.assertEqual(project.primary_image_public_id, 'image/upload/v1/a.jpg')
+
+        second = ProjectImage.objects.create(
+            project=project, image='image/upload/v1/b.jpg', order=2, is_primary=True
+        )
+        project.refresh_from_db()
+        self.assertEqual(project.primary_image, second)
+        self.assertEqual(Project.objects.get(pk=project.pk).card_image.public_id, 'b')
+
+        second.delete()
+        project.refresh_from_db()
+        self.assertEqual(project.primary_image, first)
+
+    def test_single_primary_per_project(self):
+        project = create_project(1, images=2)
+        ProjectImage.objects.create(project=project, image='image/upload/v1/c.jpg', is_primary=True)
+        self.assertEqual(project.images.filter(is_primary=True).count(), 1)
+
+
+@PLAIN_STATIC
+@override_settings(MEDIUM_SYNC_ENABLED=False)
+class ContentCacheTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def test_public_page_is_served_from_cache_until_content_changes(self):
+        url = reverse('projects')
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        generation = get_content_generation()
+        with self.captureOnCommitCallbacks(execute=True):
+            create_project(1)
+        self.assertGreater(get_content_generation(), generation)
+        self.assertContains(self.client.get(url), 'Project 1')
+
+    def test_index_sections_come_from_fragment_cache(self):
+        self.client.get(reverse('home'))
+        with self.assertNumQueries(0):
+            self.client.get(reverse('home'))
+
+    def test_m2m_change_invalidates(self):
+        project = create_project(1, images=0)
+        skill = Skill.objects.create(name='Rust', category='Languages', proficiency='beginner')
+        generation = get_content_generation()
+        with self.captureOnCommitCallbacks(execute=True):
+            project.technologies.add(skill)
+        self.assertGreater(get_content_generation(), generation)
+
+    def test_contact_messages_do_not_invalidate(self):
+        generation = get_content_generation()
+        with self.captureOnCommitCallbacks(execute=True):
+            Contact.objects.create(name='A', email='a@example.com', subject='Hi', message='Hello')
+        self.assertEqual(get_content_generation(), generation)
+
+
+class SnapshotTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def test_fixed_query_count(self):
+        skills = [Skill.objects.create(name=f'S{i}', category='Tools', proficiency='expert') for i in range(3)]
+        create_project(1, skills=skills)
+        with self.assertNumQueries(build_snapshot().query_count):
+            build_snapshot()
+        for index in range(2, 8):
+            create_project(index, skills=skills)
+        with self.assertNumQueries(build_snapshot().query_count):
+            snapshot = build_snapshot()
+        self.assertEqual(len(snapshot.featured_projects), 3)
+        self.assertEqual([tech.name for tech in snapshot.featured_projects[0].technologies], ['S0', 'S1', 'S2'])
+        self.assertEqual(list(snapshot.skills_by_category), ['Tools'])
+
+    def test_reused_until_content_changes(self):
+        snapshot = get_snapshot()
+        self.assertIsNone(snapshot.profile)
+        with self.assertNumQueries(0):
+            self.assertIs(get_snapshot(), snapshot)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Profile.objects.create(
+                name='Ada', title='Engineer', description='Bio',
+                email='ada@example.com', phone='1', location='Earth',
+            )
+        fresh = get_snapshot()
+        self.assertIsNot(fresh, snapshot)
+        self.assertEqual(fresh.profile.name, 'Ada')
+        with self.assertRaises(FrozenInstanceError):
+            fresh.profile.name = 'Changed'
+
+    def test_expires_when_another_process_changes_content(self):
+        snapshot = get_snapshot()
+        # Saved elsewhere: this process's generation doesn't move
+        Profile.objects.create(
+            name='Ada', title='Engineer', description='Bio',
+            email='ada@example.com', phone='1', location='Earth',
+        )
+        self.assertIs(get_snapshot(), snapshot)
+        with mock.patch('pages.snapshot.time.time', return_value=snapshot.built_at + settings.PAGE_CACHE_TIMEOUT):
+            self.assertEqual(get_snapshot().profile.name, 'Ada')
+
+
+@PLAIN_STATIC
+@override_settings(MEDIUM_SYNC_ENABLED=False)
+class ConditionalResponseTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def test_not_modified_without_rendering(self):
+        url = reverse('projects')
+        etag = self.client.get(url)['ETag']
+        with mock.patch('pages.views.render') as render:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        render.assert_not_called()
+
+    def test_if_modified_since(self):
+        response = self.client.get(reverse('home'))
+        again = self.client.get(reverse('home'), HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(again.status_code, 304)
+
+    def test_pages_get_distinct_validators(self):
+        first = self.client.get(reverse('blogs'))['ETag']
+        second = self.client.get(reverse('blogs') + '?page=2')['ETag']
+        self.assertNotEqual(first, second)
+
+    def test_project_validator_tracks_its_object(self):
+        project = create_project(1, images=0)
+        url = reverse('project_detail', args=[project.pk])
+        etag = self.client.get(url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Blog.objects.create(**blog_fields('unrelated'))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ProjectImage.objects.create(project=project, image='image/upload/v1/new.jpg')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_blog_list_validator_tracks_tag_renames(self):
+        tag = Tag.objects.create(name='Python', slug='python')
+        Blog.objects.create(**blog_fields('a')).tags.add(tag)
+        url = reverse('blogs')
+        etag = self.client.get(url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            tag.name, tag.slug = 'CPython', 'cpython'
+            tag.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertContains(response, 'cpython')
+
+    def test_missing_project_is_still_404(self):
+        request = RequestFactory().get(reverse('project_detail', args=[999]))
+        request.user = AnonymousUser()
+        with self.assertRaises(Http404):
+            views.project_detail(request, project_id=999)
+
+
+@PLAIN_STATIC
+@override_settings(MEDIUM_SYNC_ENABLED=False)
+class TagTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        upsert_medium_blogs([
+            make_feed_entry('a', tags=['Python', 'Web Dev']),
+            make_feed_entry('b', tags=['python']),
+            make_feed_entry('c', tags=[]),
+        ])
+
+    def test_names_share_a_slug(self):
+        self.assertEqual(
+            list(Tag.objects.with_blog_counts().values_list('slug', 'blog_count')),
+            [('python', 2), ('web-dev', 1)],
+        )
+
+    def test_filter_and_cached_counts(self):
+        response = self.client.get(reverse('blogs'), {'tag': 'web-dev'})
+        self.assertEqual([blog.medium_post_id for blog in response.context['blogs']], ['a'])
+        self.assertEqual(response.context['total_blogs'], 1)
+        self.assertEqual(response.context['tag_counts'], [('Python', 'python', 2), ('Web Dev', 'web-dev', 1)])
+
+        with self.assertNumQueries(0):
+            views.tag_counts()
+        with self.captureOnCommitCallbacks(execute=True):
+            Blog.objects.get(medium_post_id='c').tags.add(Tag.objects.get(slug='web-dev'))
+        self.assertIn(('Web Dev', 'web-dev', 2), views.tag_counts())
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def test_documents_follow_model_changes(self):
+        skill = Skill.objects.create(name='Pytorch', category='Frameworks', proficiency='advanced')
+        project = create_project(1, images=0)
+        project.technologies.add(skill)
+        self.assertEqual(search.matching_ids('project', 'pytorch'), [project.pk])
+
+        skill.name = 'Jax'
+        skill.save()
+        self.assertEqual(search.search('pytorch'), [])
+        self.assertEqual({r.kind for r in search.search('jax')}, {'project', 'skill'})
+
+        project.delete()
+        self.assertEqual([r.kind for r in search.search('jax')], ['skill'])
+
+    def test_ranking_snippets_and_bulk_sync(self):
+        upsert_medium_blogs([
+            make_feed_entry('a', title='Notes', description='A long post that mentions caching once'),
+            make_feed_entry('b', title='Caching in Django', description='All about <b>caching</b> pages'),
+        ])
+        results = search.search('cach')
+        self.assertEqual([result.title for result in results], ['Caching in Django', 'Notes'])
+        self.assertIn('<mark>caching</mark>', results[0].snippet)
+        self.assertIn('&lt;b&gt;', results[0].snippet)
+        self.assertEqual(search.search('"unbalanced AND (quote'), [])
+
+    def test_old_relevant_documents_outrank_newer_weak_matches(self):
+        SearchDocument.objects.create(kind='project', object_id=1, title='Kubernetes', body='kubernetes kubernetes', url='/')
+        SearchDocument.objects.bulk_create(
+            SearchDocument(kind='blog', object_id=pk, title=f'Post {pk}', body=f'notes {pk} ' * 20 + 'kubernetes', url='/')
+            for pk in range(2100)
+        )
+        self.assertEqual(search.search('kubernetes', limit=3)[0].title, 'Kubernetes')
+        self.assertEqual(len(search.matching_ids('blog', 'kubernetes')), 2100)
+
+    @PLAIN_STATIC
+    @override_settings(MEDIUM_SYNC_ENABLED=False)
+    def test_view(self):
+        Blog.objects.create(**blog_fields('a', title='Vector databases'))
+        response = self.client.get(reverse('search'), {'q': 'vector'})
+        self.assertContains(response, 'Vector databases')
+        self.assertContains(response, 'https://medium.com/@me/a')
+
+
+@PLAIN_STATIC
+@override_settings(MEDIUM_SYNC_ENABLED=False)
+class RelatedProjectTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.python, self.django, self.pytorch, self.rust = [
+            Skill.objects.create(name=name, category='Tools', proficiency='advanced')
+            for name in ['Python', 'Django', 'Pytorch', 'Rust']
+        ]
+
+    def stored(self, project):
+        return list(RelatedProject.objects.filter(project=project).values_list('related_id', flat=True))
+
+    def test_rare_shared_skills_rank_first(self):
+        base = create_project(0, images=0, skills=[self.python, self.django, self.pytorch])
+        common = create_project(1, images=0, skills=[self.python])
+        niche = create_project(2, images=0, skills=[self.pytorch])
+        for index in range(3, 6):
+            create_project(index, images=0, skills=[self.python, self.rust])
+
+        self.assertEqual(self.stored(base)[:2], [niche.pk, common.pk])
+        related.rebuild_related_projects()
+        self.assertEqual(self.stored(base)[:2], [niche.pk, common.pk])
+
+        response = self.client.get(reverse('project_detail', args=[base.pk]))
+        self.assertEqual([project.pk for project in response.context['related_projects']][:2],
+                         [niche.pk, common.pk])
+
+    def test_incremental_updates_match_a_rebuild(self):
+        projects = [create_project(index, images=0, skills=[self.python]) for index in range(8)]
+        projects[0].technologies.add(self.rust)
+        projects[5].technologies.add(self.rust)
+        projects[3].technologies.remove(self.python)
+        self.django.projects.add(projects[1], projects[2])
+        projects[7].delete()
+
+        incremental = {project.pk: self.stored(project) for project in projects[:7]}
+        self.assertEqual(incremental[projects[0].pk][0], projects[5].pk)
+        self.assertEqual(incremental[projects[3].pk], [])
+        related.rebuild_related_projects()
+        self.assertEqual({project.pk: self.stored(project) for project in projects[:7]}, incremental)
+
+    def test_updates_read_only_projects_sharing_a_skill(self):
+        projects = [create_project(index, images=0, skills=[self.python]) for index in range(3)]
+        projects[1].technologies.add(self.rust)
+        unrelated = create_project(3, images=0, skills=[self.django])
+
+        index = related.SimilarityIndex.around([projects[0].pk])
+        self.assertEqual(set(index.skills_by_project), {project.pk for project in projects})
+        full = related.SimilarityIndex(related.load_memberships())
+        self.assertEqual(index.scores(projects[0].pk), full.scores(projects[0].pk))
+        # RelatedProject has no listeners, so this is one DELETE
+        with self.assertNumQueries(1):
+            RelatedProject.objects.filter(project=unrelated).delete()
+
+    def test_rebuild_uses_numpy_only_when_importable(self):
+        for index in range(4):
+            create_project(index, images=0, skills=[self.python, self.django])
+        index = related.SimilarityIndex(related.load_memberships())
+        with mock.patch.object(related, 'load_numpy', return_value=None):
+            python = index.all_neighbours()
+        self.assertEqual(len(python), 4)
+
+        # numpy itself may be missing here: force the branch and check the dispatch
+        with mock.patch.object(related, 'load_numpy', return_value=mock.sentinel.numpy), \
+                mock.patch.object(related.SimilarityIndex, '_all_neighbours_numpy', return_value=python) as matrix:
+            self.assertIs(index.all_neighbours(), python)
+        matrix.assert_called_once_with(related.TOP_K)
+
+    @skipUnless(related.load_numpy(), 'numpy is not installed')
+    def test_numpy_matches_python(self):
+        skills = [self.python, self.django, self.pytorch, self.rust]
+        for index in range(12):
+            create_project(index, images=0, skills=skills[index % 3:index % 4 + 1])
+        index = related.SimilarityIndex(related.load_memberships())
+        python, matrix = index.all_neighbours(use_numpy=False), index.all_neighbours(use_numpy=True)
+        self.assertEqual(python.keys(), matrix.keys())
+        for project_id, neighbours in python.items():
+            self.assertEqual([pk for pk, _ in matrix[project_id]], [pk for pk, _ in neighbours])
+
+
+class ResponsiveImageTests(TestCase):
+    def render(self, snippet, **context):
+        return Template('{% load responsive_images %}' + snippet).render(Context(context))
+
+    def test_srcset_is_bounded_by_the_original(self):
+        image = ProjectImage._meta.get_field('image').to_python('image/upload/v1/shot.png')
+        html = self.render("{% responsive_image image 'gallery' alt=alt width=900 height=450 %}",
+                           image=image, alt='A <b>')
+        self.assertIn('c_limit,f_auto,q_auto,w_480/v1/shot.png 480w', html)
+        self.assertIn('w_768/v1/shot.png 768w, ', html)
+        self.assertIn('w_900/v1/shot.png 900w"', html)
+        self.assertNotIn('w_1024', html.split('srcset')[1])
+        self.assertIn('width="900" height="450" alt="A &lt;b&gt;"', html)
+        self.assertIn('loading="lazy"', html)
+
+    def test_unknown_size_crops_to_the_usage(self):
+        image = Blog._meta.get_field('image').to_python('image/upload/v3/cover.jpg')
+        html = self.render("{% responsive_image image 'card' eager=True %}", image=image)
+        self.assertIn('c_fill,f_auto,g_auto,h_200,q_auto,w_320/v3/cover.jpg 320w', html)
+        self.assertIn('width="480" height="300"', html)
+        self.assertIn('fetchpriority="high"', html)
+        self.assertEqual(self.render("{% responsive_image None 'card' %}"), '')
+
+        hits = image_sources.cache_info().hits
+        self.render("{% responsive_image image 'card' %}", image=image)
+        self.assertEqual(image_sources.cache_info().hits, hits + 1)
+
+
+class StaticImagePipelineTests(TestCase):
+    def setUp(self):
+        from PIL import Image
+        self.source_dir = tempfile.TemporaryDirectory()
+        self.output_dir = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.source_dir.name, 'images'))
+        # Noise doesn't compress, so the PNG is over the size threshold
+        Image.frombytes('RGB', (500, 250), os.urandom(500 * 250 * 3)).save(
+            os.path.join(self.source_dir.name, 'images', 'photo.png')
+        )
+        with open(os.path.join(self.source_dir.name, 'site.css'), 'w') as handle:
+            handle.write('body { color: #123456; }\n' * 200)
+        self.settings = override_settings(
+            STATICFILES_DIRS=[self.source_dir.name],
+            STATIC_ROOT=os.path.join(self.output_dir.name, 'static'),
+            STATIC_IMAGE_CACHE_DIR=os.path.join(self.output_dir.name, 'cache'),
+            STATICFILES_STORAGE='pages.storage.OptimizedStaticFilesStorage',
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+        )
+        self.settings.enable()
+
+    def tearDown(self):
+        self.settings.disable()
+        self.source_dir.cleanup()
+        self.output_dir.cleanup()
+
+    def test_variants_are_hashed_cached_and_used(self):
+        call_command('collectstatic', '--noinput', verbosity=0)
+        from django.contrib.staticfiles.storage import staticfiles_storage
+        record = staticfiles_storage.image_variants['images/photo.png']
+        self.assertEqual((record['width'], record['height']), (500, 250))
+        self.assertEqual([width for fmt, width, _ in record['variants'] if fmt == 'webp'], [320, 500])
+
+        html = Template(
+            "{% load responsive_images %}{% picture 'images/photo.png' 'card' alt='Photo' %}"
+        ).render(Context())
+        hashed = staticfiles_storage.stored_name('images/photo.w320.webp')
+        self.assertRegex(hashed, r'photo\.w320\.[0-9a-f]{12}\.webp$')
+        self.assertIn(f'<source type="image/webp" srcset="/static/{hashed} 320w, ', html)
+        self.assertIn('width="480" height="240" alt="Photo" loading="lazy"', html)
+
+        with mock.patch('pages.storage.encode_variant') as encode:
+            call_command('collectstatic', '--noinput', '--clear', verbosity=0)
+        encode.assert_not_called()
+
+    def test_hashed_files_are_served_precompressed_and_immutable(self):
+        call_command('collectstatic', '--noinput', verbosity=0)
+        from django.contrib.staticfiles.storage import staticfiles_storage
+        url = '/static/' + staticfiles_storage.stored_name('site.css')
+
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertLess(len(b''.join(response.streaming_content)), 200)
+        response.close()
+
+        response = self.client.get('/static/site.css')
+        self.assertNotIn('immutable', response['Cache-Control'])
+        response.close()
+
+
+@PLAIN_STATIC
+@override_settings(
+    CONTACT_THROTTLE_BURST=3, CONTACT_THROTTLE_RATE=10, CONTACT_NOTIFY_EMAIL='owner@example.com',
+)
+class ContactFormTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def post(self, **overrides):
+        data = {'name': 'Ada', 'email': 'ada@example.com', 'subject': 'Hello', 'message': 'Nice site'}
+        data.update(overrides)
+        return self.client.post(reverse('contact'), data)
+
+    def test_accepted_message_redirects_and_notifies_once(self):
+        with mock.patch.object(tasks.background_queue, 'enqueue', return_value=True) as enqueue:
+            with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(1):
+                response = self.post()
+            self.assertRedirects(response, reverse('contact'), fetch_redirect_response=False)
+            self.assertContains(self.client.get(reverse('contact')), 'sent successfully')
+
+            # A refresh or double submit with cosmetic differences is stored once
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(self.post(message='  nice   SITE ').status_code, 302)
+        self.assertEqual(Contact.objects.count(), 1)
+        enqueue.assert_called_once()
+        self.assertEqual(enqueue.call_args.args[1], tasks.notify_owner_of_contact)
+
+        tasks.notify_owner_of_contact(*enqueue.call_args.args[2:])
+        self.assertEqual(mail.outbox[0].to, ['owner@example.com'])
+        self.assertEqual(mail.outbox[0].reply_to, ['ada@example.com'])
+
+    def test_invalid_and_throttled_posts(self):
+        response = self.post(email='not-an-email')
+        self.assertEqual(response.status_code, 400)
+        self.assertContains(response, 'value="Ada"', status_code=400)
+
+        self.post(subject='Two')
+        self.post(subject='Three')
+        with self.assertNumQueries(0):
+            response = self.post(subject='Four')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(Contact.objects.count(), 2)
+        # Another client has its own bucket
+        response = self.client.post(reverse('contact'), {
+            'name': 'Bob', 'email': 'bob@example.com', 'subject': 'Hi', 'message': 'Hi',
+        }, REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.status_code, 302)
+
+    @override_settings(MEDIUM_SYNC_ENABLED=False)
+    def test_form_fields_render_from_the_form(self):
+        for url in (reverse('home'), reverse('contact')):
+            with self.subTest(url):
+                response = self.client.get(url)
+                self.assertContains(response, 'placeholder="Your Name"')
+                self.assertContains(response, 'rows="5"')
+
+    def test_posts_need_a_csrf_token_from_the_token_endpoint(self):
+        client = self.client_class(enforce_csrf_checks=True)
+        data = {'name': 'Ada', 'email': 'ada@example.com', 'subject': 'Hello', 'message': 'Nice site'}
+        self.assertEqual(client.post(reverse('contact'), data).status_code, 403)
+
+        response = client.get(reverse('csrf'))
+        self.assertIn('no-cache', response['Cache-Control'])
+        data['csrfmiddlewaretoken'] = response.json()['token']
+        self.assertEqual(client.post(reverse('contact'), data).status_code, 302)
+        self.assertEqual(Contact.objects.count(), 1)
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Ties on published_date must be broken by pk, not lost or repeated
+        base = timezone.now().replace(microsecond=123456)
+        Blog.objects.bulk_create([
+            Blog(**blog_fields(f'post-{i}', published_date=base - timedelta(days=i // 3)))
+            for i in range(14)
+        ])
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def test_walks_every_row_once_in_order(self):
+        paginator = KeysetPaginator(Blog.objects.all(), 4, 'blogs')
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            pages.append(paginator.page(pages[-1].next_cursor))
+
+        seen = [blog.pk for page in pages for blog in page]
+        self.assertEqual(seen, list(Blog.objects.order_by('-published_date', 'pk').values_list('pk', flat=True)))
+        self.assertEqual([len(page) for page in pages], [4, 4, 4, 2])
+        self.assertFalse(pages[0].has_previous())
+
+        # Previous links point at the canonical URL of the page before
+        self.assertEqual(pages[1].previous_query, '')
+        self.assertEqual(pages[3].previous_cursor, pages[1].next_cursor)
+
+    def test_page_number_compatibility(self):
+        paginator = KeysetPaginator(Blog.objects.all(), 4, 'blogs')
+        second = paginator.page(paginator.page().next_cursor)
+        third = paginator.page(second.next_cursor)
+        compat = paginator.page_number('3')
+        self.assertEqual(list(compat), list(third))
+        self.assertEqual(compat.next_cursor, third.next_cursor)
+        self.assertEqual(compat.previous_cursor, third.previous_cursor)
+        self.assertEqual(list(paginator.page_number('99')), list(paginator.page_number(4)))
+
+    def test_deep_pages_cost_the_same(self):
+        paginator = KeysetPaginator(Blog.objects.all(), 2, 'blogs')
+        cursor = paginator.page().next_cursor
+        with self.assertNumQueries(2):
+            page = paginator.page(cursor)
+        for _ in range(4):
+            page = paginator.page(page.next_cursor)
+        with self.assertNumQueries(2):
+            paginator.page(page.next_cursor)
+
+    @PLAIN_STATIC
+    @override_settings(MEDIUM_SYNC_ENABLED=False)
+    def test_view_links_and_bad_cursor(self):
+        response = self.client.get(reverse('blogs'))
+        self.assertEqual(response.context['total_blogs'], 14)
+        next_url = reverse('blogs') + response.context['blogs'].next_query
+        self.assertContains(response, next_url)
+        self.assertEqual(self.client.get(next_url).status_code, 200)
+        self.assertEqual(
+            list(self.client.get(reverse('blogs') + '?after=not-a-cursor').context['blogs']),
+            list(response.context['blogs']),
+        )
+
+
+@override_settings(MEDIUM_SYNC_ENABLED=False)
+class ApiTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def test_fields_and_cursor_pagination(self):
+        skill = Skill.objects.create(name='Django', category='Frameworks', proficiency='expert')
+        for index in range(3):
+            create_project(index, images=1, skills=[skill])
+        url = reverse('api', args=['projects'])
+
+        response = self.client.get(url, {'fields': 'title,technologies', 'limit': 2})
+        self.assertEqual(response['Content-Type'], 'application/json')
+        payload = response.json()
+        self.assertEqual(payload['count'], 3)
+        self.assertEqual(payload['results'][0], {
+            'title': 'Project 0',
+            'technologies': [{'id': skill.pk, 'name': 'Django', 'category': 'Frameworks'}],
+        })
+        following = self.client.get(payload['next']).json()
+        self.assertEqual([item['title'] for item in following['results']], ['Project 2'])
+        self.assertIsNone(following['next'])
+
+        self.assertEqual(self.client.get(url, {'fields': 'title,secret'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'after': 'garbage'}).status_code, 400)
+
+    def test_cached_body_follows_content(self):
+        url = reverse('api', args=['projects'])
+        response = self.client.get(url)
+        self.assertEqual(response.json()['count'], 0)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_project(1, images=0)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+        self.assertEqual(self.client.get(url).json()['count'], 1)
+
+
+@PLAIN_STATIC
+@override_settings(MEDIUM_SYNC_ENABLED=False)
+class AsyncViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        skill = Skill.objects.create(name='Django', category='Frameworks', proficiency='expert')
+        cls.projects = [create_project(index, skills=[skill]) for index in range(3)]
+        related.rebuild_related_projects()
+        Blog.objects.create(**blog_fields('async', title='Async blog post'))
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def request(self, factory, path='/'):
+        request = factory.get(path)
+        request.user = AnonymousUser()
+        return request
+
+    # Without a page cache, so that every call really renders its view
+    @NO_CACHE
+    async def test_pages_match_sync_views(self):
+        pages = [
+            ('about', (), 'finished class 12'),
+            ('projects', (), 'Project 2'),
+            ('blogs', (), 'Async blog post'),
+            ('project_detail', (self.projects[0].pk,), self.projects[0].title),
+        ]
+        rendered = set()
+        for name, args, marker in pages:
+            with self.subTest(name):
+                path = reverse(name, args=args)
+                expected = await sync_to_async(getattr(views, name))(self.request(RequestFactory(), path), *args)
+                response = await getattr(async_views, name)(self.request(AsyncRequestFactory(), path), *args)
+                self.assertContains(response, marker)
+                self.assertEqual(response.content, expected.content)
+                rendered.add(response.content)
+        self.assertEqual(len(rendered), len(pages))
+
+        # The homepage embeds a per-request CSRF token
+        response = await async_views.index(self.request(AsyncRequestFactory()))
+        self.assertContains(response, 'Project 0')
+
+    async def test_missing_project_is_404(self):
+        with self.assertRaises(Http404):
+            await async_views.project_detail(self.request(AsyncRequestFactory()), 999)
+
+
+@PLAIN_STATIC
+@override_settings(MEDIUM_SYNC_ENABLED=False)
+class PerformanceTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def test_server_timing_and_sampled_log(self):
+        create_project(1, images=0)
+        with tempfile.TemporaryDirectory() as directory:
+            log_path = os.path.join(directory, 'perf.jsonl')
+            with override_settings(PERF_SAMPLE_RATE=1.0, PERF_LOG_PATH=log_path):
+                self.assertNotIn('Server-Timing', self.client.get(reverse('projects')))
+                staff = User.objects.create_user('staff', password='x', is_staff=True)
+                self.client.force_login(staff)
+                timing = self.client.get(reverse('projects'))['Server-Timing']
+                self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries"')
+                # Requests never wait on outbound HTTP, so there is no span for it
+                self.assertNotIn('http;', timing)
+
+            with open(log_path) as log:
+                records = [json.loads(line) for line in log]
+            self.assertEqual([record['view'] for record in records], ['projects', 'projects'])
+            self.assertGreater(records[0]['queries'], 0)
+            self.assertGreater(records[0]['template_ms'], 0)
+            self.assertNotIn('http_ms', records[0])
+        # Render timing comes from the template backend, not a patched Template
+        self.assertEqual(Template.render.__module__, 'django.template.base')
+
+    @override_settings(PERF_SAMPLE_RATE=0)
+    async def test_async_requests_count_queries_from_worker_threads(self):
+        await sync_to_async(create_project)(1, images=0)
+        middleware = perf.PerformanceMiddleware(async_views.projects)
+        self.assertTrue(iscoroutinefunction(middleware))
+        request = AsyncRequestFactory().get(reverse('projects'))
+        request.user = await User.objects.acreate(username='staff', is_staff=True)
+        timing = (await middleware(request))['Server-Timing']
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+        self.assertRegex(timing, r'tpl;dur=(?!0\.0,)[\d.]+')
+
+    def test_report_flags_queries_growing_with_content(self):
+        lines = [
+            {'view': 'home', 'path': '/', 'total_ms': 5.0, 'db_ms': 1.0, 'template_ms': 2.0,
+             'queries': 3, 'content_size': size}
+            for size in (10, 100)
+        ] + [
+            {'view': 'projects', 'path': '/projects/', 'total_ms': 9.0, 'db_ms': 4.0, 'template_ms': 2.0,
+             'queries': size // 10, 'content_size': size}
+            for size in (10, 100)
+        ]
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl') as log:
+            log.write(''.join(json.dumps(line) + '\n' for line in lines))
+            log.flush()
+            stdout = StringIO()
+            call_command('perf_report', log=log.name, stdout=stdout)
+        output = stdout.getvalue()
+        self.assertIn('projects: queries grow with content, 1 at 10 rows -> 10 at 100 rows', output)
+        self.assertNotIn('home: queries grow', output)
+
+
+class ProductionCheckTests(SimpleTestCase):
+    def check_ids(self, **overrides):
+        database = {'ENGINE': 'django.db.backends.postgresql', **overrides.pop('database', {})}
+        with mock.patch.dict(settings.DATABASES['default'], database), \
+                override_settings(PRODUCTION=True, **overrides):
+            return [message.id for message in checks.check_production_settings(None)]
+
+    def test_slow_and_unsafe_settings_are_refused(self):
+        self.assertEqual(self.check_ids(
+            DEBUG=False, database={'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True},
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}},
+        ), [])
+        self.assertEqual(
+            self.check_ids(DEBUG=True, database={'CONN_MAX_AGE': 0})[:2], ['pages.E001', 'pages.E002'],
+        )
+        self.assertIn('pages.E004', self.check_ids(
+            DB_POOLER='transaction', database={'CONN_MAX_AGE': 600, 'DISABLE_SERVER_SIDE_CURSORS': False},
+        ))
+        self.assertIn('pages.E005', self.check_ids(TEMPLATES=[{
+            'BACKEND': 'django.template.backends.django.DjangoTemplates',
+            'OPTIONS': {'loaders': ['django.template.loaders.filesystem.Loader']},
+        }]))
+
+
+class StartupTests(SimpleTestCase):
+    def test_cold_start_skips_heavy_imports(self):
+        # Setting up Django and loading every view must not import packages
+        # only the background sync, collectstatic or bulk rebuilds need
+        code = (
+            'import sys, django; django.setup(); '
+            'from django.urls import resolve; resolve("/"); '
+            'print(sorted(name for name in ("numpy", "requests", "PIL") if name in sys.modules))'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=settings.BASE_DIR, capture_output=True, text=True,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'django_project.settings'},
+        )
+        self.assertEqual(result.stdout.strip(), '[]', result.stderr)
+
+
+@PLAIN_STATIC
+class ProfilerTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.enterContext(override_settings(PROFILE_DIR=directory.name))
+        self.directory = directory.name
+
+    def test_only_staff_can_profile(self):
+        create_project(1, images=0)
+        self.assertNotIn('X-Profile-Id', self.client.get(reverse('projects'), {'_profile': ''}))
+        self.assertEqual(os.listdir(self.directory), [])
+
+        self.client.force_login(User.objects.create_user('staff', password='x', is_staff=True))
+        profile_id = self.client.get(reverse('projects'), {'_profile': 'cprofile'})['X-Profile-Id']
+        self.assertEqual(sorted(os.listdir(self.directory)), [f'{profile_id}.json', f'{profile_id}.prof'])
+        with open(os.path.join(self.directory, f'{profile_id}.json')) as handle:
+            meta = json.load(handle)
+        self.assertEqual((meta['path'], meta['status'], meta['mode']), ('/projects/?_profile=cprofile', 200, 'cprofile'))
+        self.assertTrue(meta['queries'])
+
+        sampled = self.client.get(reverse('projects'), HTTP_X_PROFILE='1')['X-Profile-Id']
+        self.assertTrue(os.path.exists(os.path.join(self.directory, f'{sampled}.collapsed')))
+
+    def test_unwritable_profile_dir_still_serves_the_page(self):
+        self.client.force_login(User.objects.create_user('staff', password='x', is_staff=True))
+        with mock.patch.object(profiling.os, 'makedirs', side_effect=PermissionError(13, 'Read-only file system')):
+            response = self.client.get(reverse('about'), {'_profile': ''})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(response['X-Profile-Error'], 'Profile not stored: Read-only file system')
+
+    async def test_async_stack_profiles_queries_from_worker_threads(self):
+        await sync_to_async(create_project)(1, images=0)
+        middleware = profiling.ProfilerMiddleware(async_views.projects)
+        self.assertTrue(iscoroutinefunction(middleware))
+        for mode, suffix in [('cprofile', 'prof'), ('sample', 'collapsed')]:
+            with self.subTest(mode):
+                request = AsyncRequestFactory().get(reverse('projects'), {'_profile': mode})
+                request.user = User(username='staff', is_staff=True)
+                profile_id = (await middleware(request))['X-Profile-Id']
+                self.assertTrue(os.path.exists(os.path.join(self.directory, f'{profile_id}.{suffix}')))
+                with open(os.path.join(self.directory, f'{profile_id}.json')) as handle:
+                    self.assertTrue(json.load(handle)['queries'])
+
+    def test_admin_lists_and_serves_profiles(self):
+        self.client.force_login(User.objects.create_user('staff', password='x', is_staff=True))
+        profile_id = self.client.get(reverse('about'), {'_profile': ''})['X-Profile-Id']
+        self.assertContains(self.client.get(reverse('admin_profiles')), f'{profile_id}.collapsed')
+        response = self.client.get(reverse('admin_profile_download', args=[f'{profile_id}.json']))
+        self.assertEqual(json.loads(b''.join(response.streaming_content))['status'], 200)
+        self.assertIsNone(profiling.profile_file_path('..settings.py'))
+
+
+class SeedingTests(TestCase):
+    def test_seed_is_deterministic_and_consistent(self):
+        inserted = seeding.seed(
+            projects=6, images_per_project=2, skills=5, blogs=4, tags=3,
+            experience=2, education=1, certifications=1, contacts=2,
+        )
+        self.assertEqual(inserted['pages_project'], 6)
+        self.assertEqual(inserted['pages_projectimage'], 12)
+        self.assertEqual(inserted['pages_contact'], 2)
+        self.assertEqual(Blog.objects.count(), 4)
+        for project in Project.objects.select_related('primary_image'):
+            self.assertEqual(project.primary_image.project_id, project.pk)
+            self.assertTrue(project.primary_image.is_primary)
+            self.assertEqual(project.card_image.public_id, project.primary_image.image.public_id)
+        self.assertTrue(RelatedProject.objects.exists())
+
+        seeding.seed(projects=6, skills=5)
+        titles = list(Project.objects.order_by('pk').values_list('title', 'description'))
+        self.assertEqual(titles[:6], titles[6:])
+
+    def test_row_by_row_fallback_inserts_the_same_rows(self):
+        fields = ('title', 'date_created', 'primary_image_public_id', 'primary_image__caption')
+        seeding.seed(projects=3, skills=3, blogs=2, tags=2)
+        with mock.patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', False):
+            seeding.seed(projects=3, skills=3, blogs=2, tags=2)
+        projects = list(Project.objects.order_by('pk').values_list(*fields))
+        self.assertEqual(projects[:3], projects[3:])
+        blogs = list(Blog.objects.order_by('pk').values_list('title', 'published_date'))
+        self.assertEqual(blogs[:2], blogs[2:])
+
+    def test_seed_scale_reports_rows_per_second(self):
+        stdout = StringIO()
+        call_command(
+            'seed_scale', projects=4, images_per_project=1, skills=3, blogs=2, tags=1,
+            contacts=2, experience=1, education=1, certifications=1, stdout=stdout,
+        )
+        self.assertEqual(Contact.objects.count(), 2)
+        self.assertEqual(ProjectImage.objects.count(), 4)
+        self.assertRegex(stdout.getvalue(), r'\d+ rows in [\d.]+ s: \d+ rows/s inserting')
+
+
+class BenchViewsTests(SimpleTestCase):
+    def test_regressions_beyond_threshold(self):
+        baseline = {'1000': {'projects': {
+            'p50_ms': 10.0, 'p99_ms': 20.0, 'queries': 4, 'peak_kib': 100, 'http_rps': 50.0,
+        }}}
+        same = {'1000': {'projects': {
+            'p50_ms': 12.0, 'p99_ms': 20.5, 'queries': 4, 'peak_kib': 110, 'http_rps': 45.0,
+        }}}
+        self.assertEqual(regressions(baseline, same, 0.25, 1.0), [])
+        worse = {'1000': {'projects': {
+            'p50_ms': 14.0, 'p99_ms': 20.0, 'queries': 5, 'peak_kib': 100, 'http_rps': 30.0,
+        }}, '100000': {'projects': {'p50_ms': 99.0, 'queries': 40}}}
+        self.assertEqual(regressions(baseline, worse, 0.25, 1.0), [
+            'projects at 1000 rows: 4 -> 5 queries',
+            'projects at 1000 rows: p50_ms 10 -> 14',
+            'projects at 1000 rows: http_rps 50 -> 30',
+        ])
+
+
+@PLAIN_STATIC
+class ExportSiteTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def export(self, output):
+        stdout = StringIO()
+        call_command('export_site', output=output, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_incremental_export(self):
+        project = create_project(1, images=0)
+        with tempfile.TemporaryDirectory() as output:
+            self.assertIn('6 rendered, 0 unchanged', self.export(output))
+            self.assertTrue(os.path.exists(os.path.join(output, f'project/{project.pk}/index.html')))
+            self.assertIn('0 rendered, 6 unchanged', self.export(output))
+
+            with self.captureOnCommitCallbacks(execute=True):
+                Blog.objects.create(**blog_fields('new'))
+            # Homepage, about and the blog list depend on blogs
+            self.assertIn('3 rendered, 3 unchanged', self.export(output))
+
+            with self.captureOnCommitCallbacks(execute=True):
+                project.delete()
+            self.assertIn('1 removed', self.export(output))
+            self.assertFalse(os.path.exists(os.path.join(output, f'project/{project.pk}/index.html')))
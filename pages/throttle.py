@@ -0,0 +1,41 @@
+"""
+Per-client rate limiting backed by the default cache.
+
+A token bucket per (name, client): it holds up to ``capacity`` tokens,
+refills at ``rate`` tokens per ``period`` seconds and every request takes
+one. The bucket is read and written back without a lock, so two requests
+racing on one key can both get the last token; that is acceptable for
+keeping spam bursts away from the database.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def client_ip(request):
+    """The client address from ``settings.CLIENT_IP_HEADER`` (REMOTE_ADDR by default)"""
+    value = request.META.get(settings.CLIENT_IP_HEADER) or request.META.get('REMOTE_ADDR', '')
+    # X-Forwarded-For style headers list the original client first
+    return value.split(',')[0].strip()
+
+
+class TokenBucket:
+    def __init__(self, name, capacity, rate, period=3600):
+        self.name = name
+        self.capacity = capacity
+        self.per_second = rate / period
+        # After this long a bucket is full again and needn't be stored
+        self.timeout = max(int(capacity / self.per_second) + 1, 1)
+
+    def take(self, key, now=None):
+        """``(allowed, retry_after_seconds)`` for one request by ``key``"""
+        now = time.time() if now is None else now
+        cache_key = f'pages:throttle:{self.name}:{key}'
+        tokens, updated = cache.get(cache_key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - updated) * self.per_second)
+        if tokens < 1:
+            cache.set(cache_key, (tokens, now), self.timeout)
+            return False, int((1 - tokens) / self.per_second) + 1
+        cache.set(cache_key, (tokens - 1, now), self.timeout)
+        return True, 0
@@ -1,14 +1,21 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path
-from pages import views
+from pages import api, async_views, views
+
+public = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
-    path('', views.index, name="home"),
-    path('about/', views.about, name="about"),
+    path('', public.index, name="home"),
+    path('about/', public.about, name="about"),
     path('services/', views.services, name="services"),
-    path('projects/', views.projects, name="projects"),
-    path('project/<int:project_id>/', views.project_detail, name="project_detail"),
-    path('blogs/', views.blogs, name="blogs"),
+    path('projects/', public.projects, name="projects"),
+    path('project/<int:project_id>/', public.project_detail, name="project_detail"),
+    path('blogs/', public.blogs, name="blogs"),
+    path('search/', views.search, name="search"),
     path('contact/', views.contact, name="contact"),
+    path('csrf/', views.csrf, name="csrf"),
+    path('api/v1/', api.api_root, name="api_root"),
+    path('api/v1/<str:name>/', api.api, name="api"),
     path('sync-medium-blogs/', views.sync_medium_blogs, name="sync_medium_blogs"),
 ]
\ No newline at end of file
@@ -1,82 +1,209 @@
-import requests
+import hashlib
+import time
 import xml.etree.ElementTree as ET
-from datetime import datetime
 from django.conf import settings
-from .models import Blog
-import re
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from . import search
+from .cache import bump_content_generation
+from .feeds import FeedTooLarge, iter_feed_entries, iter_response_chunks
+from .models import Blog, Tag, tag_slug
+
+
+# Fields owned by the Medium feed; admin-only fields such as is_featured and
+# image are never touched by a sync.
+MEDIUM_SYNC_FIELDS = [
+    'title', 'description', 'url', 'published_date', 'content_hash', 'updated_at'
+]
+
+
+def blog_content_hash(entry):
+    """Stable hash of the feed-owned fields of a blog entry"""
+    payload = '\x1f'.join([
+        entry['title'],
+        entry['description'],
+        entry['url'],
+        entry['published_date'].isoformat(),
+        # Same string the old comma-separated column held, so hashes of
+        # unchanged posts stay valid
+        ', '.join(entry['tags'])[:500],
+    ])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def medium_entry(feed_entry):
+    """Map a parsed feed entry onto Blog field values"""
+    link = feed_entry['link']
+    if not feed_entry['title'] or not link or feed_entry['published'] is None:
+        raise ValueError(f"Incomplete feed item: {feed_entry['guid'] or link}")
+
+    entry = {
+        'title': feed_entry['title'][:300],
+        'description': feed_entry['summary'],
+        'url': link,
+        'published_date': feed_entry['published'],
+        'tags': feed_entry['categories'],
+        # Extract Medium post ID from link
+        'medium_post_id': link.split('/')[-1] if '/' in link else '',
+    }
+    entry['content_hash'] = blog_content_hash(entry)
+    return entry
+
+
+def upsert_medium_blogs(entries):
+    """
+    Apply parsed feed entries to the Blog table in one transaction.
+
+    Known posts and their content hashes are loaded with a single query; new
+    posts go through bulk_create and edited ones through bulk_update. The
+    unique index on medium_post_id turns a concurrent insert of the same
+    post into a skipped row instead of a duplicate (see insert_new_blogs).
+
+    Returns a dict with 'inserted', 'updated' and 'unchanged' counts;
+    'inserted' counts only the rows this call stored.
+    """
+    by_post_id = {}
+    for entry in entries:
+        if entry['medium_post_id']:
+            by_post_id[entry['medium_post_id']] = entry
+
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+    if not by_post_id:
+        return counts
+
+    with transaction.atomic():
+        known = {
+            medium_post_id: (pk, content_hash)
+            for pk, medium_post_id, content_hash in Blog.objects.filter(
+                medium_post_id__in=list(by_post_id)
+            ).values_list('pk', 'medium_post_id', 'content_hash')
+        }
+
+        now = timezone.now()
+        to_create = []
+        to_update = []
+        for medium_post_id, entry in by_post_id.items():
+            fields = {key: value for key, value in entry.items() if key != 'tags'}
+            if medium_post_id not in known:
+                to_create.append(Blog(is_featured=False, **fields))
+                continue
+            pk, content_hash = known[medium_post_id]
+            if content_hash == entry['content_hash']:
+                counts['unchanged'] += 1
+            else:
+                to_update.append(Blog(pk=pk, updated_at=now, **fields))
+
+        inserted = insert_new_blogs(to_create)
+        if to_update:
+            Blog.objects.bulk_update(to_update, MEDIUM_SYNC_FIELDS)
+        if inserted or to_update:
+            changed = {blog.medium_post_id for blog in inserted + to_update}
+            blog_ids = dict(
+                Blog.objects.filter(medium_post_id__in=changed).values_list('medium_post_id', 'pk')
+            )
+            # Feed order, so the first spelling of a tag name wins predictably
+            set_blog_tags({
+                blog_ids[blog.medium_post_id]: by_post_id[blog.medium_post_id]['tags']
+                for blog in inserted + to_update if blog.medium_post_id in blog_ids
+            })
+            # Bulk writes send no model signals, so invalidate and index by hand
+            search.reindex('blog', blog_ids.values())
+            transaction.on_commit(bump_content_generation)
+
+    counts['inserted'] = len(inserted)
+    counts['updated'] = len(to_update)
+    return counts
+
+
+def insert_new_blogs(blogs):
+    """
+    Insert ``blogs`` and return the ones actually stored. Another sync may
+    have inserted some of the same posts first; then the rows are retried
+    one at a time and the ones that already exist are skipped.
+    """
+    if not blogs:
+        return []
+    try:
+        with transaction.atomic():
+            Blog.objects.bulk_create(blogs)
+        return blogs
+    except IntegrityError:
+        pass
+    inserted = []
+    for blog in blogs:
+        try:
+            with transaction.atomic():
+                Blog.objects.bulk_create([blog])
+        except IntegrityError:
+            continue
+        inserted.append(blog)
+    return inserted
+
+
+def set_blog_tags(tags_by_blog):
+    """
+    Replace the tags of many blogs at once: ``{blog_pk: [tag names]}``.
+    Costs a fixed handful of queries however many blogs and tags there are.
+    """
+    if not tags_by_blog:
+        return
+    tags = Tag.objects.for_names(name for names in tags_by_blog.values() for name in names)
+    Through = Blog.tags.through
+    Through.objects.filter(blog_id__in=list(tags_by_blog)).delete()
+    links = {
+        (blog_id, tags[tag_slug(name)].pk)
+        for blog_id, names in tags_by_blog.items()
+        for name in names if tag_slug(name) in tags
+    }
+    Through.objects.bulk_create(
+        [Through(blog_id=blog_id, tag_id=tag_id) for blog_id, tag_id in links],
+        batch_size=500, ignore_conflicts=True,
+    )
 
 
 def fetch_medium_blogs():
     """
     Fetch blogs from Medium RSS feed and save them to database
     """
+    # Only the background sync needs requests; keep it out of cold starts
+    import requests
+
     try:
         medium_username = settings.MEDIUM_USERNAME
         if not medium_username or medium_username == '@yourusername':
             return False, "Medium username not configured"
-        
+
         # Medium RSS feed URL
         rss_url = f"https://medium.com/feed/{medium_username}"
-        
-        response = requests.get(rss_url, timeout=10)
-        response.raise_for_status()
-        
-        # Parse RSS feed
-        root = ET.fromstring(response.content)
-        
-        # Find all items (blog posts)
-        items = root.findall('.//item')
-        
-        new_blogs_count = 0
-        
-        for item in items:
-            try:
-                title = item.find('title').text
-                link = item.find('link').text
-                description = item.find('description').text
-                pub_date = item.find('pubDate').text
-                
-                # Parse publication date
-                pub_date_obj = datetime.strptime(pub_date, '%a, %d %b %Y %H:%M:%S %Z')
-                
-                # Extract Medium post ID from link
-                medium_post_id = link.split('/')[-1] if '/' in link else ''
-                
-                # Clean description (remove HTML tags)
-                clean_description = re.sub('<.*?>', '', description) if description else ''
-                clean_description = clean_description[:500] + '...' if len(clean_description) > 500 else clean_description
-                
-                # Extract tags if available
-                tags = []
-                categories = item.findall('category')
-                for cat in categories:
-                    if cat.text:
-                        tags.append(cat.text)
-                tags_str = ', '.join(tags)
-                
-                # Check if blog already exists
-                if not Blog.objects.filter(medium_post_id=medium_post_id).exists():
-                    Blog.objects.create(
-                        title=title,
-                        description=clean_description,
-                        url=link,
-                        published_date=pub_date_obj,
-                        tags=tags_str,
-                        medium_post_id=medium_post_id,
-                        is_featured=False
-                    )
-                    new_blogs_count += 1
-                    
-            except Exception as e:
-                print(f"Error processing blog item: {str(e)}")
-                continue
-        
-        return True, f"Successfully fetched {new_blogs_count} new blogs"
-        
+
+        # Stream and parse the feed item by item, capped in size
+        entries = []
+        # The feed is parsed as it streams in, so this counts as fetch time
+        start = time.perf_counter()
+        with requests.get(rss_url, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            chunks = iter_response_chunks(response, settings.MEDIUM_FEED_MAX_BYTES)
+            for feed_entry in iter_feed_entries(chunks):
+                try:
+                    entries.append(medium_entry(feed_entry))
+                except Exception as e:
+                    print(f"Error processing blog item: {str(e)}")
+                    continue
+        fetch_ms = (time.perf_counter() - start) * 1000
+
+        counts = upsert_medium_blogs(entries)
+        return True, (
+            f"Successfully synced Medium blogs: {counts['inserted']} new, "
+            f"{counts['updated']} updated, {counts['unchanged']} unchanged "
+            f"(feed fetched in {fetch_ms:.0f} ms)"
+        )
+
     except requests.RequestException as e:
         return False, f"Error fetching Medium RSS: {str(e)}"
     except ET.ParseError as e:
         return False, f"Error parsing RSS feed: {str(e)}"
+    except FeedTooLarge as e:
+        return False, str(e)
     except Exception as e:
         return False, f"Unexpected error: {str(e)}"
 
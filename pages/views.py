@@ -1,113 +1,119 @@
-from django.shortcuts import render, get_object_or_404
+from django.conf import settings
+from django.shortcuts import redirect, render, get_object_or_404
 from django.http import JsonResponse
-from django.core.paginator import Paginator
 from django.contrib import messages
-from .models import (
-    Profile, Skill, Project, Education, Experience, 
-    Certification, Blog, Contact, SiteSettings
+from django.core.cache import cache
+from django.db import transaction
+from django.middleware.csrf import get_token
+from django.views.decorators.cache import never_cache
+from . import search as search_index
+from .cache import cache_public_page, per_generation
+from .forms import ContactForm
+from .conditional import (
+    blog_list_validators, conditional_page, project_detail_validators,
+    project_list_validators, site_validators,
 )
-from .utils import auto_sync_medium_blogs
+from .models import Project, Blog, Tag, tag_slug
+from .pagination import KeysetPaginator
+from .snapshot import get_snapshot
+from .tasks import schedule_contact_notification, schedule_medium_sync
+from .throttle import TokenBucket, client_ip
 
+PROJECTS_PER_PAGE = 6
+BLOGS_PER_PAGE = 6
 
+
+def tag_counts():
+    """``[(name, slug, count)]`` for the tag cloud, cached per content generation"""
+    return per_generation('tag-counts', lambda: list(
+        Tag.objects.with_blog_counts().values_list('name', 'slug', 'blog_count')
+    ))
+
+
+@conditional_page(site_validators)
 def index(request):
     """Homepage view with limited content and featured items"""
-    try:
-        # Auto-sync Medium blogs (you might want to do this periodically instead)
-        auto_sync_medium_blogs()
-    except Exception as e:
-        print(f"Error syncing Medium blogs: {str(e)}")
-    
-    # Get profile data
-    profile = Profile.objects.first()
-    
-    # Get featured/limited content for homepage
-    featured_projects = Project.objects.filter(is_featured=True)[:3]
-    all_skills = Skill.objects.all()
-    recent_education = Education.objects.all()[:2]
-    recent_experience = Experience.objects.all()[:3]
-    recent_certifications = Certification.objects.all()[:3]
-    featured_blogs = Blog.objects.filter(is_featured=True)[:3]
-    
-    # Group skills by category
-    skills_by_category = {}
-    for skill in all_skills:
-        if skill.category not in skills_by_category:
-            skills_by_category[skill.category] = []
-        skills_by_category[skill.category].append(skill)
+    # Serve what we have; a stale Medium feed is refreshed in the background
+    schedule_medium_sync()
     
+    # Everything comes from the in-memory snapshot: no queries per request
+    snapshot = get_snapshot()
     context = {
-        'profile': profile,
-        'featured_projects': featured_projects,
-        'skills_by_category': skills_by_category,
-        'education': recent_education,
-        'experience': recent_experience,
-        'certifications': recent_certifications,
-        'featured_blogs': featured_blogs,
+        'profile': snapshot.profile,
+        'featured_projects': snapshot.featured_projects,
+        'skills_by_category': snapshot.skills_by_category,
+        'education': snapshot.education[:2],
+        'experience': snapshot.experience[:3],
+        'certifications': snapshot.certifications[:3],
+        'featured_blogs': snapshot.featured_blogs,
+        'form': ContactForm(),
     }
     return render(request, 'index.html', context)
 
 
+@conditional_page(site_validators)
+@cache_public_page
 def about(request):
     """About page with full profile information"""
-    profile = Profile.objects.first()
-    all_education = Education.objects.all()
-    all_experience = Experience.objects.all()
-    all_certifications = Certification.objects.all()
-    all_skills = Skill.objects.all()
-    
-    # Group skills by category
-    skills_by_category = {}
-    for skill in all_skills:
-        if skill.category not in skills_by_category:
-            skills_by_category[skill.category] = []
-        skills_by_category[skill.category].append(skill)
-    
+    snapshot = get_snapshot()
     context = {
-        'profile': profile,
-        'education': all_education,
-        'experience': all_experience,
-        'certifications': all_certifications,
-        'skills_by_category': skills_by_category,
+        'profile': snapshot.profile,
+        'education': snapshot.education,
+        'experience': snapshot.experience,
+        'certifications': snapshot.certifications,
+        'skills_by_category': snapshot.skills_by_category,
     }
     return render(request, 'about.html', context)
 
 
+@conditional_page(project_list_validators)
+@cache_public_page
 def projects(request):
     """Projects page with all projects"""
-    all_projects = Project.objects.all()
-    
-    # Pagination
-    paginator = Paginator(all_projects, 6)  # Show 6 projects per page
-    page_number = request.GET.get('page')
-    projects_page = paginator.get_page(page_number)
+    paginator = KeysetPaginator(Project.objects.with_card_data(), PROJECTS_PER_PAGE, 'projects')
+    projects_page = paginator.get_page(request.GET.get('after'), request.GET.get('page'))
     
     context = {
         'projects': projects_page,
-        'total_projects': all_projects.count(),
+        'total_projects': paginator.count,
     }
     return render(request, 'projects.html', context)
 
 
+@conditional_page(blog_list_validators)
+@cache_public_page
 def blogs(request):
     """Blogs page with all blog posts"""
-    all_blogs = Blog.objects.all()
+    all_blogs = Blog.objects.prefetch_related('tags')
+    count_key = 'blogs'
+    active_tag = tag_slug(request.GET.get('tag', ''))
+    if active_tag:
+        all_blogs = all_blogs.filter(tags__slug=active_tag)
+        count_key = f'blogs:tag:{active_tag}'
     
-    # Pagination
-    paginator = Paginator(all_blogs, 6)  # Show 6 blogs per page
-    page_number = request.GET.get('page')
-    blogs_page = paginator.get_page(page_number)
+    paginator = KeysetPaginator(
+        all_blogs, BLOGS_PER_PAGE, count_key, {'tag': active_tag} if active_tag else None
+    )
+    blogs_page = paginator.get_page(request.GET.get('after'), request.GET.get('page'))
     
     context = {
         'blogs': blogs_page,
-        'total_blogs': all_blogs.count(),
+        'total_blogs': paginator.count,
+        'active_tag': active_tag,
+        'tag_counts': tag_counts(),
     }
     return render(request, 'blogs.html', context)
 
 
+@conditional_page(project_detail_validators)
+@cache_public_page
 def project_detail(request, project_id):
     """Individual project detail page"""
-    project = get_object_or_404(Project, id=project_id)
-    related_projects = Project.objects.exclude(id=project_id)[:3]
+    project = get_object_or_404(Project.objects.with_card_data().with_images(), id=project_id)
+    related_projects = (
+        Project.objects.filter(similar_to__project_id=project_id)
+        .order_by('similar_to__rank').with_card_data()[:3]
+    )
     
     context = {
         'project': project,
@@ -116,40 +122,80 @@ def project_detail(request, project_id):
     return render(request, 'project_detail.html', context)
 
 
+@conditional_page(site_validators)
+@cache_public_page
+def search(request):
+    """Full-text search across projects, blogs, skills and experience"""
+    query = request.GET.get('q', '').strip()
+    context = {
+        'query': query,
+        'results': search_index.search(query) if query else [],
+    }
+    return render(request, 'search.html', context)
+
+
 def contact(request):
-    """Contact page and form handling"""
+    """Contact page and form handling; accepted messages redirect back here (PRG)"""
+    form = ContactForm()
+    status = 200
+    retry_after = 0
     if request.method == 'POST':
-        name = request.POST.get('name')
-        email = request.POST.get('email')
-        subject = request.POST.get('subject')
-        message = request.POST.get('message')
-        
-        if all([name, email, subject, message]):
-            Contact.objects.create(
-                name=name,
-                email=email,
-                subject=subject,
-                message=message
-            )
+        form = ContactForm(request.POST)
+        # Checked before validation so that junk posts use up tokens too
+        bucket = TokenBucket('contact', settings.CONTACT_THROTTLE_BURST, settings.CONTACT_THROTTLE_RATE)
+        allowed, retry_after = bucket.take(client_ip(request))
+        if not allowed:
+            form.add_error(None, 'Too many messages from your address. Please try again later.')
+            status = 429
+        elif form.is_valid():
+            save_contact(form)
             messages.success(request, 'Your message has been sent successfully!')
+            return redirect('contact')
         else:
-            messages.error(request, 'Please fill in all fields.')
-    
-    profile = Profile.objects.first()
+            status = 400
+
     context = {
-        'profile': profile,
+        'form': form,
+        'profile': get_snapshot().profile,
     }
-    return render(request, 'contact.html', context)
+    response = render(request, 'contact.html', context, status=status)
+    if retry_after:
+        response['Retry-After'] = str(retry_after)
+    return response
+
+
+@never_cache
+def csrf(request):
+    """
+    A CSRF token (and cookie) for the visitor. Pre-rendered pages (export_site)
+    carry a token baked in at build time, so their contact form fetches a
+    fresh one before it posts.
+    """
+    return JsonResponse({'token': get_token(request)})
+
+
+def save_contact(form):
+    """Store a message once per CONTACT_DEDUP_WINDOW and notify the owner off the request path"""
+    seen_key = f'pages:contact:seen:{form.content_hash()}'
+    if not cache.add(seen_key, True, settings.CONTACT_DEDUP_WINDOW):
+        return None  # a resubmission: already stored, so accept it quietly
+    try:
+        contact = form.save()
+    except Exception:
+        cache.delete(seen_key)
+        raise
+    transaction.on_commit(lambda: schedule_contact_notification(contact))
+    return contact
 
 
 def sync_medium_blogs(request):
     """Manual sync of Medium blogs (AJAX endpoint)"""
     if request.method == 'POST' and request.user.is_staff:
-        success, message = auto_sync_medium_blogs()
+        queued = schedule_medium_sync(force=True)
         return JsonResponse({
-            'success': success,
-            'message': message
-        })
+            'success': True,
+            'message': 'Medium sync queued' if queued else 'Medium sync already queued'
+        }, status=202)
     return JsonResponse({'success': False, 'message': 'Unauthorized'})
 
 
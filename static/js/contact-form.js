@@ -0,0 +1,20 @@
+// Contact form: fetch a fresh CSRF token right before posting. Pages served
+// as pre-rendered HTML carry a token from build time that the visitor's
+// cookie can't match.
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('form[data-csrf-url]').forEach((form) => {
+        form.addEventListener('submit', async (event) => {
+            if (form.dataset.tokenFresh) return;
+            event.preventDefault();
+            try {
+                const response = await fetch(form.dataset.csrfUrl, {credentials: 'same-origin'});
+                const data = await response.json();
+                form.querySelector('input[name="csrfmiddlewaretoken"]').value = data.token;
+            } catch (error) {
+                // Post with the token we have: the server's answer explains any failure
+            }
+            form.dataset.tokenFresh = '1';
+            form.requestSubmit ? form.requestSubmit() : form.submit();
+        });
+    });
+});